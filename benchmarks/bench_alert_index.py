@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark building and querying the national alert index.
+
+Generates synthetic national alert feeds of increasing size and reports
+index build time and per-query latency for state lookups and filtered
+lookups.
+
+Usage:
+    python -m benchmarks.bench_alert_index --sizes 10000 50000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Any
+
+from weather_mcp.alerts import AlertIndex
+
+STATES = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID",
+    "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS",
+    "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH", "OK",
+    "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV",
+    "WI", "WY",
+]  # fmt: skip
+EVENTS = [
+    "Heat Advisory",
+    "Winter Storm Warning",
+    "Flood Watch",
+    "Red Flag Warning",
+    "Wind Advisory",
+    "Tornado Warning",
+]
+SEVERITIES = ["Extreme", "Severe", "Moderate", "Minor", "Unknown"]
+URGENCIES = ["Immediate", "Expected", "Future", "Unknown"]
+
+
+def synthetic_alerts(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Alerts spread over states, each covering one to eight zones."""
+    rng = random.Random(seed)
+    features = []
+    for i in range(count):
+        states = rng.sample(STATES, rng.choice([1, 1, 1, 2]))
+        zones = [
+            f"{state}Z{rng.randint(1, 300):03d}"
+            for state in states
+            for _ in range(rng.randint(1, 4))
+        ]
+        features.append(
+            {
+                "id": f"urn:oid:synthetic.{i}",
+                "properties": {
+                    "event": rng.choice(EVENTS),
+                    "severity": rng.choice(SEVERITIES),
+                    "urgency": rng.choice(URGENCIES),
+                    "areaDesc": "; ".join(zones),
+                    "geocode": {"UGC": zones},
+                },
+            }
+        )
+    return features
+
+
+def time_queries(index: AlertIndex, queries: list[dict[str, str]]) -> float:
+    """Mean microseconds per query."""
+    start = time.perf_counter()
+    for query in queries:
+        index.query(**query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run(sizes: list[int], queries: int) -> None:
+    rng = random.Random(1)
+    state_queries = [{"area": rng.choice(STATES)} for _ in range(queries)]
+    filtered_queries = [
+        {
+            "area": rng.choice(STATES),
+            "severity": rng.choice(SEVERITIES),
+            "event": rng.choice(EVENTS),
+        }
+        for _ in range(queries)
+    ]
+
+    print(f"{'alerts':>8} {'build ms':>10} {'state µs':>10} {'filtered µs':>12}")
+    for size in sizes:
+        features = synthetic_alerts(size)
+        builds = []
+        for _ in range(3):
+            start = time.perf_counter()
+            index = AlertIndex(features, time.time())
+            builds.append((time.perf_counter() - start) * 1000)
+        print(
+            f"{size:>8} {statistics.median(builds):>10.1f} "
+            f"{time_queries(index, state_queries):>10.1f} "
+            f"{time_queries(index, filtered_queries):>12.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000, 100_000]
+    )
+    parser.add_argument("--queries", type=int, default=2_000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
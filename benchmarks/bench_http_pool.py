@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request HTTP clients against the shared connection pool.
+
+Starts a local stand-in for api.weather.gov and times sequential requests
+made the old way (a new ``httpx.AsyncClient`` per call) and through
+``make_nws_request`` with the pooled client. The shared rate limiter is
+off by default so the run measures connection reuse, not the 10 req/s
+token bucket; pass ``--rate-limit`` to include it.
+
+Usage:
+    python -m benchmarks.bench_http_pool --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from weather_mcp import nws_api
+from weather_mcp.nws_api import (
+    USER_AGENT,
+    close_http_client,
+    make_nws_request,
+)
+from weather_mcp.ratelimit import RateLimiter
+
+ALERTS_BODY = {
+    "features": [
+        {
+            "properties": {
+                "event": "Heat Advisory",
+                "areaDesc": f"County {i}",
+                "severity": "Moderate",
+                "description": "Hot conditions expected. " * 10,
+                "instruction": "Drink plenty of fluids.",
+            }
+        }
+        for i in range(20)
+    ]
+}
+
+
+ALERTS_PAYLOAD = json.dumps(ALERTS_BODY).encode()
+ALERTS_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/geo+json\r\n"
+    b"Content-Length: " + str(len(ALERTS_PAYLOAD)).encode() + b"\r\n"
+    b"\r\n" + ALERTS_PAYLOAD
+)
+
+
+async def _serve_connection(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Answer every GET on a keep-alive connection with the alerts body."""
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(ALERTS_RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+class StandInServer:
+    """Local NWS stand-in served from its own event loop in a thread."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._port = 0
+
+    def _serve(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(
+            asyncio.start_server(_serve_connection, "127.0.0.1", 0)
+        )
+        self._port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self.loop.run_forever()
+
+        # Close the listener and any keep-alive connections before the loop.
+        server.close()
+        pending = asyncio.all_tasks(self.loop)
+        for task in pending:
+            task.cancel()
+        self.loop.run_until_complete(
+            asyncio.gather(server.wait_closed(), *pending, return_exceptions=True)
+        )
+        self.loop.close()
+
+    def start(self) -> str:
+        self._thread.start()
+        self._ready.wait()
+        return f"http://127.0.0.1:{self._port}"
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+async def fresh_client_request(url: str) -> None:
+    """The pre-pool behaviour: one client, and one connection, per call."""
+    headers = {"User-Agent": USER_AGENT, "Accept": "application/geo+json"}
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url, headers=headers, timeout=30.0)
+        response.raise_for_status()
+        response.json()
+
+
+async def pooled_request(url: str) -> None:
+    await make_nws_request(url)
+
+
+async def time_requests(
+    fetch: Callable[[str], Awaitable[None]], url: str, count: int
+) -> list[float]:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await fetch(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(
+        f"{label:<22} mean={statistics.mean(ordered):7.3f} ms  "
+        f"p50={statistics.median(ordered):7.3f} ms  p99={p99:7.3f} ms"
+    )
+
+
+async def run(count: int, rate_limit: float) -> None:
+    nws_api.rate_limiter = RateLimiter(rate=rate_limit)
+    server = StandInServer()
+    url = f"{server.start()}/alerts/active/area/CA"
+    try:
+        # Warm up both paths so imports and the first connect are excluded.
+        await fresh_client_request(url)
+        await pooled_request(url)
+
+        fresh = await time_requests(fresh_client_request, url, count)
+        pooled = await time_requests(pooled_request, url, count)
+    finally:
+        await close_http_client()
+        server.stop()
+
+    report("client per request", fresh)
+    report("shared pool", pooled)
+    speedup = statistics.mean(fresh) / statistics.mean(pooled)
+    print(f"per-request latency reduced {speedup:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", "-n", type=int, default=300)
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="requests/s for the shared rate limiter (0 disables it)",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rate_limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark nearest-station lookups against the station KD-tree.
+
+Generates synthetic stations scattered over the continental US and reports
+index build time and nearest-station queries per second, next to a
+vectorized linear scan over the same arrays.
+
+Usage:
+    python -m benchmarks.bench_nearest_station --sizes 5000 50000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from weather_mcp.stations import StationIndex, unit_vectors
+
+LON_RANGE = (-124.0, -67.0)
+LAT_RANGE = (25.0, 49.0)
+
+
+def synthetic_index(count: int, seed: int = 0) -> StationIndex:
+    rng = np.random.default_rng(seed)
+    coordinates = np.column_stack(
+        (rng.uniform(*LAT_RANGE, count), rng.uniform(*LON_RANGE, count))
+    )
+    identifiers = [f"S{i:05d}" for i in range(count)]
+    return StationIndex(identifiers, [None] * count, coordinates)
+
+
+def run(sizes: list[int], queries: int) -> None:
+    rng = random.Random(1)
+    points = [
+        (rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)) for _ in range(queries)
+    ]
+
+    print(
+        f"{'stations':>8} {'build ms':>10} {'tree µs':>10} "
+        f"{'scan µs':>10} {'queries/s':>10}"
+    )
+    for size in sizes:
+        builds = []
+        for seed in range(3):
+            start = time.perf_counter()
+            index = synthetic_index(size, seed)
+            builds.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        for latitude, longitude in points:
+            index.nearest(latitude, longitude)
+        per_query = (time.perf_counter() - start) / len(points)
+
+        vectors = index.tree.points
+        start = time.perf_counter()
+        for latitude, longitude in points:
+            target = unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+            np.argmin(((vectors - target) ** 2).sum(axis=1))
+        per_scan = (time.perf_counter() - start) / len(points)
+        print(
+            f"{size:>8} {statistics.median(builds):>10.1f} "
+            f"{per_query * 1e6:>10.1f} {per_scan * 1e6:>10.1f} "
+            f"{1 / per_query:>10.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5_000, 50_000])
+    parser.add_argument("--queries", type=int, default=5_000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark point-in-alert lookups against the alert spatial index.
+
+Generates synthetic alert polygons scattered over the continental US and
+reports spatial index build time and point queries per second.
+
+Usage:
+    python -m benchmarks.bench_point_alerts --sizes 1000 10000
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+from typing import Any
+
+from weather_mcp.alerts import AlertIndex
+
+LON_RANGE = (-124.0, -67.0)
+LAT_RANGE = (25.0, 49.0)
+
+
+def synthetic_polygon(rng: random.Random) -> dict[str, Any]:
+    """An irregular 12-32 vertex polygon roughly 0.2-1.5 degrees across."""
+    lon = rng.uniform(*LON_RANGE)
+    lat = rng.uniform(*LAT_RANGE)
+    radius = rng.uniform(0.1, 0.75)
+    vertices = rng.randint(12, 32)
+    ring = [
+        [
+            lon + radius * rng.uniform(0.6, 1.0) * math.cos(2 * math.pi * k / vertices),
+            lat + radius * rng.uniform(0.6, 1.0) * math.sin(2 * math.pi * k / vertices),
+        ]
+        for k in range(vertices)
+    ]
+    ring.append(ring[0])
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def synthetic_alerts(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"urn:oid:synthetic.{i}",
+            "geometry": synthetic_polygon(rng),
+            "properties": {"event": "Flood Warning"},
+        }
+        for i in range(count)
+    ]
+
+
+def run(sizes: list[int], queries: int) -> None:
+    rng = random.Random(1)
+    points = [
+        (rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)) for _ in range(queries)
+    ]
+
+    print(f"{'alerts':>8} {'build ms':>10} {'query µs':>10} {'queries/s':>10}")
+    for size in sizes:
+        index = AlertIndex(synthetic_alerts(size), time.time())
+        builds = []
+        for _ in range(3):
+            start = time.perf_counter()
+            index.build_spatial({})
+            builds.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        for latitude, longitude in points:
+            index.query_point(latitude, longitude)
+        per_query = (time.perf_counter() - start) / len(points)
+        print(
+            f"{size:>8} {statistics.median(builds):>10.1f} "
+            f"{per_query * 1e6:>10.1f} {1 / per_query:>10.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--queries", type=int, default=5_000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark expanding raw gridpoint data into hourly arrays.
+
+Builds synthetic ``/gridpoints`` responses with 7 days of mixed 1-6 hour
+intervals and compares the batched NumPy expansion against a per-value
+Python loop over the same data.
+
+Usage:
+    python -m benchmarks.bench_timeseries --grids 10 100 500
+"""
+
+import argparse
+import math
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from weather_mcp.timeseries import DEFAULT_LAYERS, gridpoint_series, parse_valid_time
+
+HOURS = 168
+
+
+def synthetic_grid(start: float, rng: random.Random) -> dict[str, Any]:
+    properties = {}
+    for name in DEFAULT_LAYERS:
+        values = []
+        hour = 0
+        while hour < HOURS:
+            length = rng.choice([1, 1, 2, 3, 6])
+            moment = datetime.fromtimestamp(start + hour * 3600, timezone.utc)
+            values.append(
+                {
+                    "validTime": f"{moment.isoformat()}/PT{length}H",
+                    "value": round(rng.uniform(0, 30), 1),
+                }
+            )
+            hour += length
+        properties[name] = {"uom": "wmoUnit:degC", "values": values}
+    return {"properties": properties}
+
+
+def python_loop(grids: list[dict[str, Any]], start: float) -> dict[str, list]:
+    """Reference implementation: fill per-hour lists value by value."""
+    result = {}
+    for name in DEFAULT_LAYERS:
+        rows = []
+        for grid in grids:
+            row = [math.nan] * HOURS
+            for entry in grid["properties"][name]["values"]:
+                begin, length = parse_valid_time(entry["validTime"])
+                first = int((begin - start) // 3600)
+                for hour in range(first, first + length):
+                    if 0 <= hour < HOURS:
+                        row[hour] = entry["value"] * 1.8 + 32
+            rows.append(row)
+        result[name] = rows
+    return result
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def run(sizes: list[int]) -> None:
+    rng = random.Random(0)
+    start = float(int(time.time()) // 3600 * 3600)
+    print(f"{'grids':>6} {'numpy ms':>10} {'loop ms':>10} {'speedup':>8}")
+    for size in sizes:
+        grids = [synthetic_grid(start, rng) for _ in range(size)]
+        layers = list(DEFAULT_LAYERS)
+        batched = gridpoint_series(grids, layers, start, HOURS)
+        looped = python_loop(grids, start)
+        np.testing.assert_allclose(
+            batched["temperature"][0], looped["temperature"], equal_nan=True
+        )
+        vectorized = best_of(lambda: gridpoint_series(grids, layers, start, HOURS))
+        naive = best_of(lambda: python_loop(grids, start))
+        print(
+            f"{size:>6} {vectorized:>10.1f} {naive:>10.1f} "
+            f"{naive / vectorized:>7.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--grids", type=int, nargs="+", default=[10, 100, 500])
+    args = parser.parse_args()
+    run(args.grids)
+
+
+if __name__ == "__main__":
+    main()
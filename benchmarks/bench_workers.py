@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmark get_alerts throughput of the HTTP server across worker counts.
+
+Seeds a shared SQLite response cache with fresh state alert feeds, starts
+``python -m weather_mcp.server --transport streamable-http`` with each
+worker count in turn and drives it with concurrent ``tools/call`` requests.
+Every worker is served from the shared cache, so the run needs no
+network access and makes no requests to api.weather.gov.
+
+Usage:
+    python -m benchmarks.bench_workers --workers 1 2 4 --clients 32
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.bench_alert_index import STATES, synthetic_alerts
+from weather_mcp.cache import CacheEntry
+from weather_mcp.disk_cache import SQLiteCache
+from weather_mcp.nws_api import NWS_API_BASE
+
+HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+}
+
+
+def seed_cache(path: Path, alerts_per_state: int) -> None:
+    """Store a fresh alert feed for every state, valid for a day."""
+    cache = SQLiteCache(path)
+    expires = time.time() + 24 * 3600
+    for i, state in enumerate(STATES):
+        features = synthetic_alerts(alerts_per_state, seed=i)
+        cache.put(
+            f"{NWS_API_BASE}/alerts/active/area/{state}",
+            CacheEntry({"features": features}, 0, expires),
+        )
+    cache.close()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+async def wait_until_up(client: httpx.AsyncClient, url: str) -> None:
+    for _ in range(200):
+        try:
+            await client.get(f"{url}/metrics")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+async def open_session(client: httpx.AsyncClient, url: str) -> dict[str, str]:
+    """Initialize an MCP session; stateless servers return no session id."""
+    response = await client.post(
+        f"{url}/mcp",
+        json={
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-03-26",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_workers", "version": "1.0"},
+            },
+        },
+        headers=HEADERS,
+    )
+    response.raise_for_status()
+    headers = dict(HEADERS)
+    session = response.headers.get("mcp-session-id")
+    if session:
+        headers["mcp-session-id"] = session
+    await client.post(
+        f"{url}/mcp",
+        json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+        headers=headers,
+    )
+    return headers
+
+
+async def drive(url: str, clients: int, duration: float) -> list[float]:
+    """Call get_alerts from ``clients`` loops for ``duration`` seconds."""
+    latencies: list[float] = []
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        await wait_until_up(client, url)
+        deadline = time.perf_counter() + duration
+
+        async def loop(worker: int) -> None:
+            headers = await open_session(client, url)
+            n = worker
+            while time.perf_counter() < deadline:
+                body = {
+                    "jsonrpc": "2.0",
+                    "id": n,
+                    "method": "tools/call",
+                    "params": {
+                        "name": "get_alerts",
+                        "arguments": {"state": STATES[n % len(STATES)]},
+                    },
+                }
+                start = time.perf_counter()
+                response = await client.post(f"{url}/mcp", json=body, headers=headers)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+                n += clients
+
+        await asyncio.gather(*(loop(i) for i in range(clients)))
+    return latencies
+
+
+def run(worker_counts: list[int], clients: int, duration: float, alerts: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "responses.sqlite"
+        seed_cache(cache_path, alerts)
+        env = dict(
+            os.environ,
+            WEATHER_MCP_DISK_CACHE=str(cache_path),
+            WEATHER_MCP_ALERT_SNAPSHOT="",
+            WEATHER_MCP_STATION_CATALOG="",
+        )
+
+        print(f"{'workers':>8} {'calls/s':>10} {'p50 ms':>8} {'p95 ms':>8}")
+        for workers in worker_counts:
+            port = free_port()
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "weather_mcp.server",
+                    "--transport",
+                    "streamable-http",
+                    "--host",
+                    "127.0.0.1",
+                    "--port",
+                    str(port),
+                    "--workers",
+                    str(workers),
+                ],
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                latencies = asyncio.run(
+                    drive(f"http://127.0.0.1:{port}", clients, duration)
+                )
+            finally:
+                server.terminate()
+                server.wait()
+
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95)]
+            print(
+                f"{workers:>8} {len(latencies) / duration:>10.0f} "
+                f"{statistics.median(latencies) * 1000:>8.1f} {p95 * 1000:>8.1f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--alerts", type=int, default=20)
+    args = parser.parse_args()
+    run(args.workers, args.clients, args.duration, args.alerts)
+
+
+if __name__ == "__main__":
+    main()
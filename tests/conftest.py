@@ -20,6 +20,22 @@ def event_loop():
     loop.close()
 
 
+class FakeClock:
+    """Manually advanced clock for expiry and timing tests."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fixture providing a clock that only moves when a test advances it."""
+    return FakeClock()
+
+
 @pytest.fixture
 def mock_nws_response():
     """Fixture providing a mock NWS API response with alerts."""
@@ -102,3 +118,64 @@ def sample_alert_feature():
             "instruction": "Turn around, don't drown. Find alternate route.",
         }
     }
+
+
+@pytest.fixture(autouse=True)
+def reset_nws_client():
+    """Give every test a fresh NWS client, empty caches and closed breakers."""
+    from weather_mcp import nws_api
+    from weather_mcp.alert_changes import alert_change_log
+    from weather_mcp.alerts import alert_snapshot
+    from weather_mcp.gridpoints import gridpoint_index
+    from weather_mcp.ratelimit import RateLimiter
+    from weather_mcp.resilience import RetryPolicy
+    from weather_mcp.stations import station_catalog
+    from weather_mcp.subscriptions import alert_subscriptions
+    from weather_mcp.tools import render_cache
+    from weather_mcp.warmup import warmup
+
+    nws_api._client = None
+    nws_api._client_users = 0
+    nws_api.response_cache.clear()
+    nws_api.request_stats.reset()
+    nws_api._inflight.clear()
+    nws_api._breakers.clear()
+    nws_api.retry_policy = RetryPolicy(base_delay=0.0)
+    nws_api.rate_limiter = RateLimiter(rate=0)
+    nws_api.persistent_cache = None
+    nws_api.max_stale = 0.0
+    nws_api.lease_poll_interval = 0.05
+    gridpoint_index.clear()
+    alert_change_log.clear()
+    render_cache.clear()
+    alert_snapshot.enabled = False
+    alert_snapshot.index = None
+    alert_snapshot.zone_shapes.clear()
+    alert_snapshot.zone_failures.clear()
+    station_catalog.enabled = False
+    station_catalog.clear()
+    warmup.reset()
+    yield
+    nws_api._client = None
+    nws_api._client_users = 0
+    nws_api._client_config = nws_api.HTTPClientConfig()
+    nws_api.response_cache.clear()
+    nws_api._breakers.clear()
+    alert_snapshot.enabled = False
+    alert_snapshot.index = None
+    station_catalog.enabled = False
+    station_catalog.clear()
+    alert_subscriptions.close()
+    alert_subscriptions.interval = 60.0
+
+
+@pytest.fixture
+def use_transport():
+    """Route the shared NWS client through an in-memory request handler."""
+    import httpx
+    from weather_mcp import nws_api
+
+    def install(handler):
+        nws_api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    return install
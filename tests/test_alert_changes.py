@@ -0,0 +1,188 @@
+"""
+Tests for the alert change log and the get_alert_changes tool.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from weather_mcp.alert_changes import ADDED, EXPIRED, UPDATED, AlertChangeLog
+from weather_mcp.nws_api import NWSHTTPError
+from weather_mcp.records import alert_records
+from weather_mcp.tools import get_alert_changes
+
+
+def make_alert(alert_id, sent="2025-01-01T00:00:00Z", references=(), event="Wind"):
+    return {
+        "id": alert_id,
+        "properties": {
+            "id": alert_id,
+            "event": event,
+            "areaDesc": "Somewhere",
+            "sent": sent,
+            "references": [{"@id": ref} for ref in references],
+        },
+    }
+
+
+class TestAlertChangeLog:
+    """Test cases for diffing alert sets into a change log."""
+
+    def test_first_record_is_baseline(self):
+        """Test that the first sighting of a scope records no changes."""
+        log = AlertChangeLog()
+        log.record("CA", alert_records([make_alert("a")]))
+
+        result = log.changes_since("CA", None)
+        assert result.reset
+        assert [(c.kind, c.alert_id) for c in result.changes] == [(ADDED, "a")]
+        assert log.changes_since("CA", result.cursor).changes == []
+
+    def test_added_updated_and_expired(self):
+        """Test that each kind of change is detected."""
+        log = AlertChangeLog()
+        log.record(
+            "CA", alert_records([make_alert("a"), make_alert("b"), make_alert("c")])
+        )
+        cursor = log.cursor("CA")
+
+        log.record(
+            "CA",
+            alert_records(
+                [
+                    make_alert("a", sent="2025-01-01T01:00:00Z"),
+                    make_alert("b2", references=["b"]),
+                    make_alert("d"),
+                ]
+            ),
+        )
+
+        changes = log.changes_since("CA", cursor).changes
+        assert [(c.kind, c.alert_id) for c in changes] == [
+            (UPDATED, "a"),
+            (UPDATED, "b2"),
+            (ADDED, "d"),
+            (EXPIRED, "c"),
+        ]
+
+    def test_unchanged_alerts_not_repeated(self):
+        """Test that re-recording the same alerts adds nothing."""
+        log = AlertChangeLog()
+        log.record("CA", alert_records([make_alert("a")]))
+        cursor = log.cursor("CA")
+        log.record("CA", alert_records([make_alert("a")]))
+
+        assert log.changes_since("CA", cursor).changes == []
+        assert log.cursor("CA") == cursor
+
+    def test_changes_are_scoped(self):
+        """Test that a cursor only sees changes for the requested scope."""
+        log = AlertChangeLog()
+        log.record("CA", [])
+        log.record("TX", [])
+        cursor = log.cursor("TX")
+        log.record("CA", alert_records([make_alert("a")]))
+        log.record("TX", alert_records([make_alert("b")]))
+
+        changes = log.changes_since("TX", cursor).changes
+        assert [c.alert_id for c in changes] == ["b"]
+
+    def test_cursor_from_other_scope_resets(self):
+        """Test that a cursor for one state cannot skip another's baseline."""
+        log = AlertChangeLog()
+        log.record("CA", [])
+        cursor = log.cursor("CA")
+        log.record("TX", alert_records([make_alert("b")]))
+
+        result = log.changes_since("TX", cursor)
+        assert result.reset
+        assert [c.alert_id for c in result.changes] == ["b"]
+        assert not log.changes_since("TX", result.cursor).reset
+
+    def test_cursor_older_than_retention_resets(self, clock):
+        """Test that trimmed history forces a full refresh."""
+        log = AlertChangeLog(max_entries=100, max_age=60.0, clock=clock)
+        log.record("CA", [])
+        cursor = log.cursor("CA")
+        log.record("CA", alert_records([make_alert("a")]))
+        clock.now += 120
+        log.record("CA", alert_records([make_alert("a"), make_alert("b")]))
+
+        result = log.changes_since("CA", cursor)
+        assert result.reset
+        assert {c.alert_id for c in result.changes} == {"a", "b"}
+
+    def test_max_entries_bounds_log(self):
+        """Test that the log keeps at most max_entries changes."""
+        log = AlertChangeLog(max_entries=2)
+        log.record("CA", [])
+        log.record("CA", alert_records([make_alert(str(i)) for i in range(5)]))
+
+        assert len(log._entries) == 2
+
+    @pytest.mark.parametrize("cursor", ["garbage", "!!", ""])
+    def test_invalid_cursor_resets(self, cursor):
+        """Test that unreadable cursors fall back to a full refresh."""
+        log = AlertChangeLog()
+        log.record("CA", alert_records([make_alert("a")]))
+
+        assert log.changes_since("CA", cursor).reset
+
+    def test_cursor_from_other_epoch_resets(self):
+        """Test that cursors do not carry over a restart."""
+        old = AlertChangeLog()
+        old.record("CA", [])
+        new = AlertChangeLog()
+        new.record("CA", [])
+
+        assert new.changes_since("CA", old.cursor("CA")).reset
+
+
+class TestGetAlertChanges:
+    """Test cases for the get_alert_changes tool."""
+
+    @pytest.mark.asyncio
+    async def test_polling_returns_only_changes(self):
+        """Test that a second poll returns just the delta and a new cursor."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = {
+                "features": [make_alert("a", event="Heat Advisory")]
+            }
+            first = await get_alert_changes("ca")
+            cursor = first.splitlines()[0].removeprefix("Cursor: ")
+
+            mock_fetch.return_value = {
+                "features": [make_alert("b", event="Flood Warning")]
+            }
+            second = await get_alert_changes("CA", cursor)
+
+        assert "Full refresh: 1 active alerts." in first
+        assert "Heat Advisory" in first
+        assert "Added:" in second
+        assert "Flood Warning" in second
+        assert "Expired: Heat Advisory (Somewhere)" in second
+        assert second.splitlines()[0] != f"Cursor: {cursor}"
+
+    @pytest.mark.asyncio
+    async def test_no_changes(self):
+        """Test the message when nothing changed since the cursor."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = {"features": [make_alert("a")]}
+            first = await get_alert_changes("CA")
+            cursor = first.splitlines()[0].removeprefix("Cursor: ")
+            second = await get_alert_changes("CA", cursor)
+
+        assert second == f"Cursor: {cursor}\nNo alert changes since cursor."
+
+    @pytest.mark.asyncio
+    async def test_fetch_failure(self):
+        """Test that upstream errors are reported without a cursor."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = NWSHTTPError(503)
+            result = await get_alert_changes("CA")
+
+        assert result == "Unable to fetch alerts: NWS API returned HTTP 503"
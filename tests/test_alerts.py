@@ -0,0 +1,334 @@
+"""
+Tests for the national alert snapshot index.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from weather_mcp.alerts import (
+    NATIONAL_ALERTS_URL,
+    AlertFilters,
+    AlertIndex,
+    AlertSnapshot,
+)
+from weather_mcp.nws_api import NWSHTTPError
+from weather_mcp.ratelimit import Priority
+from weather_mcp.records import AlertRecord
+from weather_mcp.spatial import polygons_from_geometry
+
+
+def make_alert(alert_id, zones, event="Heat Advisory", severity="Minor"):
+    return {
+        "id": alert_id,
+        "properties": {
+            "id": alert_id,
+            "event": event,
+            "severity": severity,
+            "urgency": "Expected",
+            "areaDesc": "Somewhere",
+            "geocode": {"UGC": zones},
+        },
+    }
+
+
+FEATURES = [
+    make_alert("a", ["CAZ041", "CAZ042"], "Winter Storm Warning", "Severe"),
+    make_alert("b", ["TXC201"]),
+    make_alert("c", ["CAZ041", "NVZ002"], "Heat Advisory", "Severe"),
+    make_alert("d", ["PZZ650"], "Small Craft Advisory", "Minor"),
+    {"id": "e", "properties": {"event": "Test Message"}},
+]
+
+
+class TestAlertIndex:
+    """Test cases for querying the alert index."""
+
+    def test_query_by_state(self):
+        """Test that alerts are found under each state they touch."""
+        index = AlertIndex(FEATURES, 0)
+
+        assert [f.id for f in index.query(area="CA")] == ["a", "c"]
+        assert [f.id for f in index.query(area="NV")] == ["c"]
+        assert [f.id for f in index.query(area="PZ")] == ["d"]
+        assert index.query(area="NY") == []
+
+    def test_alert_listed_once_per_state(self):
+        """Test that several zones in one state do not duplicate an alert."""
+        index = AlertIndex(FEATURES, 0)
+
+        assert index.by_area["CA"].count(0) == 1
+
+    def test_query_by_zone_and_attributes(self):
+        """Test zone, severity, urgency and event lookups."""
+        index = AlertIndex(FEATURES, 0)
+
+        assert [f.id for f in index.query(zone="CAZ041")] == ["a", "c"]
+        assert [f.id for f in index.query(severity="Severe")] == ["a", "c"]
+        assert [f.id for f in index.query(event="Heat Advisory")] == ["b", "c"]
+        assert len(index.query(urgency="Expected")) == 4
+
+    def test_combined_criteria_intersect(self):
+        """Test that several criteria must all match."""
+        index = AlertIndex(FEATURES, 0)
+
+        result = index.query(area="CA", event="Heat Advisory", severity="Severe")
+
+        assert [f.id for f in result] == ["c"]
+        assert index.query(area="TX", severity="Severe") == []
+
+    def test_no_criteria_returns_everything(self):
+        """Test that an empty query lists the whole snapshot."""
+        index = AlertIndex(FEATURES, 0)
+
+        assert len(index.query()) == len(index) == 5
+
+
+def square(x0, y0, size):
+    return [
+        [x0, y0],
+        [x0 + size, y0],
+        [x0 + size, y0 + size],
+        [x0, y0 + size],
+        [x0, y0],
+    ]
+
+
+ZONE_URL = "https://api.weather.gov/zones/forecast/CAZ041"
+
+
+def spatial_features():
+    polygon_alert = make_alert("p", ["CAZ041"], "Flash Flood Warning", "Severe")
+    polygon_alert["geometry"] = {
+        "type": "Polygon",
+        "coordinates": [square(-119.0, 34.0, 1.0)],
+    }
+    zone_alert = make_alert("z", ["CAZ041"])
+    zone_alert["geometry"] = None
+    zone_alert["properties"]["affectedZones"] = [ZONE_URL]
+    return [polygon_alert, zone_alert]
+
+
+class TestAlertSpatialIndex:
+    """Test cases for point lookups against alert areas."""
+
+    def test_polygons_and_zone_shapes(self):
+        """Test that alerts without polygons use their zones' shapes."""
+        index = AlertIndex(spatial_features(), 0.0)
+        zone = {"type": "Polygon", "coordinates": [square(-118.6, 34.2, 2.0)]}
+
+        index.build_spatial({})
+        assert not index.spatial_complete
+        assert [f.id for f in index.query_point(34.5, -118.5)] == ["p"]
+
+        index.build_spatial({ZONE_URL: polygons_from_geometry(zone)})
+        assert index.spatial_complete
+        assert [f.id for f in index.query_point(34.5, -118.5)] == ["p", "z"]
+        assert [f.id for f in index.query_point(35.5, -117.0)] == ["z"]
+        assert index.query_point(40.0, -100.0) == []
+
+    def test_missing_zone_shape_limits_coverage(self):
+        """Test that only points near an unresolved alert are not covered."""
+        index = AlertIndex(spatial_features(), 0.0)
+        index.build_spatial({})
+
+        # CA's known extent is the polygon alert's square, plus a margin.
+        assert not index.covers(34.5, -118.5)
+        assert not index.covers(35.8, -117.2)
+        assert index.covers(40.0, -100.0)
+
+        features = spatial_features()
+        features[1]["properties"]["affectedZones"] = [
+            "https://api.weather.gov/zones/forecast/NVZ001"
+        ]
+        index = AlertIndex(features, 0.0)
+        index.build_spatial({})
+        assert not index.covers(40.0, -100.0)  # nothing known about NV
+
+
+class TestAlertFilters:
+    """Test cases for alert filter parsing and matching."""
+
+    def test_parse_normalizes_and_sorts(self):
+        """Test that equivalent filters produce identical query parameters."""
+        first = AlertFilters.parse(severity="severe, extreme", message_type="Alert")
+        second = AlertFilters.parse(severity="Extreme,Severe", message_type="alert")
+
+        assert first == second
+        assert first.query_params() == [
+            ("severity", "Extreme,Severe"),
+            ("message_type", "alert"),
+        ]
+
+    def test_empty_filters_are_falsy(self):
+        """Test that no filter values means no filtering."""
+        assert not AlertFilters.parse(severity="", event=None)
+        assert AlertFilters.parse(status="actual")
+
+    def test_matches(self):
+        """Test matching against alert properties, including messageType."""
+        feature = AlertRecord.from_feature(
+            {
+                "properties": {
+                    "severity": "Severe",
+                    "event": "Winter Storm Warning",
+                    "messageType": "Update",
+                }
+            }
+        )
+
+        assert AlertFilters.parse(severity="severe,minor").matches(feature)
+        assert AlertFilters.parse(message_type="update").matches(feature)
+        assert not AlertFilters.parse(event="Heat Advisory").matches(feature)
+        assert not AlertFilters.parse(status="Actual").matches(feature)
+        feature.status = "Actual"
+        assert AlertFilters.parse(status="actual").matches(feature)
+
+    def test_apply_uses_index(self):
+        """Test filtering a state's alerts from the index."""
+        index = AlertIndex(FEATURES, 0.0)
+
+        severe = AlertFilters.parse(severity="Severe").apply(index, "CA")
+        either = AlertFilters.parse(event="heat advisory,winter storm warning")
+
+        assert [f.id for f in severe] == ["a", "c"]
+        assert [f.id for f in either.apply(index, "NV")] == ["c"]
+
+
+class TestAlertSnapshot:
+    """Test cases for the periodically refreshed snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_uses_background_lane(self):
+        """Test that the national feed is fetched as background traffic."""
+        snapshot = AlertSnapshot(enabled=True)
+        with patch(
+            "weather_mcp.alerts.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = {"features": FEATURES}
+
+            index = await snapshot.refresh()
+
+        mock_fetch.assert_called_once_with(NATIONAL_ALERTS_URL, Priority.BACKGROUND)
+        assert len(index) == 5
+        assert snapshot.current() is index
+
+    @pytest.mark.asyncio
+    async def test_refresh_loads_missing_zone_shapes(self):
+        """Test that zone shapes are fetched once and reused across refreshes."""
+        snapshot = AlertSnapshot(enabled=True)
+        zone = {"geometry": {"type": "Polygon", "coordinates": [square(-119, 34, 2)]}}
+
+        async def fetch(url, priority):
+            assert priority == Priority.BACKGROUND
+            return zone if url == ZONE_URL else {"features": spatial_features()}
+
+        with patch("weather_mcp.alerts.fetch_nws_json", side_effect=fetch) as mock:
+            index = await snapshot.refresh()
+            await snapshot.refresh()
+
+        assert index.spatial_complete
+        assert [call.args[0] for call in mock.call_args_list].count(ZONE_URL) == 1
+        assert len(index.query_point(35.5, -117.5)) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_zone_shape_is_retried_with_backoff(self):
+        """Test that a zone that fails to load is not refetched every refresh."""
+        now = [1000.0]
+        snapshot = AlertSnapshot(enabled=True, clock=lambda: now[0])
+        snapshot.zone_retry = 100.0
+        zone = {"geometry": {"type": "Polygon", "coordinates": [square(-119, 34, 2)]}}
+        zone_calls = []
+
+        async def fetch(url, priority):
+            if url != ZONE_URL:
+                return {"features": spatial_features()}
+            zone_calls.append(now[0])
+            if len(zone_calls) <= 2:
+                raise NWSHTTPError(500)
+            return zone
+
+        with patch("weather_mcp.alerts.fetch_nws_json", side_effect=fetch):
+            await snapshot.refresh()
+            now[0] += 60
+            await snapshot.refresh()
+            assert zone_calls == [1000.0]
+
+            now[0] += 60
+            await snapshot.refresh()
+            assert snapshot.zone_failures[ZONE_URL] == (2, 1320.0)
+
+            now[0] += 200
+            index = await snapshot.refresh()
+
+        assert zone_calls == [1000.0, 1120.0, 1320.0]
+        assert index.spatial_complete
+        assert snapshot.zone_failures == {}
+
+    def test_current_requires_enabled_and_recent(self):
+        """Test that disabled or outdated snapshots are not served."""
+        now = [1000.0]
+        snapshot = AlertSnapshot(enabled=True, interval=60, clock=lambda: now[0])
+        snapshot.index = AlertIndex(FEATURES, 1000.0)
+
+        assert snapshot.current() is snapshot.index
+        now[0] += 121
+        assert snapshot.current() is None
+
+        snapshot.enabled = False
+        now[0] = 1000.0
+        assert snapshot.current() is None
+
+    @pytest.mark.asyncio
+    async def test_running_polls_until_last_holder_exits(self):
+        """Test the poller lifecycle and that failures do not stop it."""
+        snapshot = AlertSnapshot(enabled=True, interval=0.01)
+        with patch(
+            "weather_mcp.alerts.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = [NWSHTTPError(503)] + [{"features": FEATURES}] * 50
+
+            async with snapshot.running():
+                async with snapshot.running():
+                    await asyncio.sleep(0.05)
+                assert snapshot._task is not None
+
+            assert snapshot._task is None
+            assert snapshot.index is not None
+            calls = mock_fetch.call_count
+            await asyncio.sleep(0.03)
+            assert mock_fetch.call_count == calls
+
+    @pytest.mark.asyncio
+    async def test_poller_survives_malformed_feed(self):
+        """Test that an unexpected error is logged and polling continues."""
+        snapshot = AlertSnapshot(enabled=True, interval=0.01)
+        with patch(
+            "weather_mcp.alerts.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = [ValueError("ragged polygon")] + [
+                {"features": FEATURES}
+            ] * 50
+
+            async with snapshot.running():
+                await asyncio.sleep(0.05)
+
+        assert snapshot.index is not None
+
+    @pytest.mark.asyncio
+    async def test_running_is_noop_when_disabled(self):
+        """Test that no poller starts unless snapshot mode is on."""
+        snapshot = AlertSnapshot(enabled=False)
+
+        async with snapshot.running():
+            assert snapshot._task is None
+
+    def test_from_env(self, monkeypatch):
+        """Test enabling snapshot mode from the environment."""
+        monkeypatch.setenv("WEATHER_MCP_ALERT_SNAPSHOT", "true")
+        monkeypatch.setenv("WEATHER_MCP_ALERT_SNAPSHOT_INTERVAL", "30")
+
+        snapshot = AlertSnapshot.from_env()
+
+        assert snapshot.enabled
+        assert snapshot.interval == 30
+        assert snapshot.max_age == 60
@@ -0,0 +1,232 @@
+"""
+Tests for the NWS response cache.
+"""
+
+from weather_mcp.cache import (
+    CacheEntry,
+    RenderCache,
+    ResponseCache,
+    freshness_lifetime,
+)
+
+
+class TestFreshnessLifetime:
+    """Test cases for reading freshness from response headers."""
+
+    def test_max_age(self):
+        """Test that max-age sets the lifetime."""
+        assert freshness_lifetime({"cache-control": "public, max-age=300"}, 0) == 300
+
+    def test_max_age_minus_age(self):
+        """Test that time already spent in upstream caches is subtracted."""
+        headers = {"cache-control": "max-age=300", "age": "120"}
+        assert freshness_lifetime(headers, 0) == 180
+
+    def test_no_store_and_no_cache(self):
+        """Test that no-store and no-cache disable caching."""
+        assert freshness_lifetime({"cache-control": "no-store"}, 0) == 0
+        assert freshness_lifetime({"cache-control": "no-cache, max-age=60"}, 0) == 0
+
+    def test_expires_relative_to_date(self):
+        """Test that Expires is measured against the server's Date header."""
+        headers = {
+            "expires": "Wed, 21 Oct 2026 07:30:00 GMT",
+            "date": "Wed, 21 Oct 2026 07:28:00 GMT",
+        }
+        assert freshness_lifetime(headers, 0) == 120
+
+    def test_max_age_overrides_expires(self):
+        """Test that max-age takes precedence over Expires."""
+        headers = {
+            "cache-control": "max-age=10",
+            "expires": "Wed, 21 Oct 2026 07:30:00 GMT",
+        }
+        assert freshness_lifetime(headers, 0) == 10
+
+    def test_missing_or_invalid_headers(self):
+        """Test that responses without usable headers are not cached."""
+        assert freshness_lifetime({}, 0) == 0
+        assert freshness_lifetime({"cache-control": "max-age=soon"}, 0) == 0
+        assert freshness_lifetime({"expires": "0"}, 0) == 0
+
+
+class TestResponseCache:
+    """Test cases for the LRU response cache."""
+
+    def test_hit_and_miss_counters(self, clock):
+        """Test that lookups are counted as hits or misses."""
+        cache = ResponseCache(clock=clock)
+        cache.put("a", CacheEntry({"x": 1}, 10, clock.now + 60))
+
+        assert cache.get("a").data == {"x": 1}
+        assert cache.get("b") is None
+
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.entries == 1
+        assert stats.bytes == 10
+
+    def test_expired_entry_is_a_miss(self, clock):
+        """Test that entries are only served while fresh."""
+        cache = ResponseCache(clock=clock)
+        cache.put("a", CacheEntry({}, 10, clock.now + 60))
+
+        clock.now += 61
+
+        assert cache.get("a") is None
+        assert cache.stats().misses == 1
+
+    def test_lru_eviction_by_entry_count(self, clock):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResponseCache(max_entries=2, clock=clock)
+        cache.put("a", CacheEntry({}, 1, clock.now + 60))
+        cache.put("b", CacheEntry({}, 1, clock.now + 60))
+        cache.get("a")
+        cache.put("c", CacheEntry({}, 1, clock.now + 60))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats().evictions == 1
+
+    def test_eviction_by_byte_budget(self, clock):
+        """Test that total size is kept within max_bytes."""
+        cache = ResponseCache(max_bytes=100, clock=clock)
+        cache.put("a", CacheEntry({}, 60, clock.now + 60))
+        cache.put("b", CacheEntry({}, 60, clock.now + 60))
+
+        assert len(cache) == 1
+        assert cache.stats().bytes == 60
+        assert cache.get("b") is not None
+
+    def test_oversized_entry_not_stored(self):
+        """Test that an entry larger than the whole budget is skipped."""
+        cache = ResponseCache(max_bytes=10)
+        cache.put("a", CacheEntry({}, 11, cache.clock() + 60))
+
+        assert len(cache) == 0
+
+    def test_replace_entry_updates_size(self, clock):
+        """Test that re-storing a key replaces its size accounting."""
+        cache = ResponseCache(clock=clock)
+        cache.put("a", CacheEntry({}, 10, clock.now + 60))
+        cache.put("a", CacheEntry({}, 25, clock.now + 60))
+
+        assert cache.stats().bytes == 25
+        assert len(cache) == 1
+
+    def test_clear(self):
+        """Test that clear drops entries and counters."""
+        cache = ResponseCache()
+        cache.put("a", CacheEntry({}, 10, cache.clock() + 60))
+        cache.get("a")
+        cache.clear()
+
+        assert cache.stats() == cache.stats().__class__(0, 0, 0, 0, 0, 0, 0)
+
+    def test_peek_returns_stale_entry_without_counting(self, clock):
+        """Test that peek sees expired entries and leaves counters alone."""
+        cache = ResponseCache(clock=clock)
+        cache.put("a", CacheEntry({}, 10, clock.now - 1, etag='"v1"'))
+
+        entry = cache.peek("a")
+
+        assert entry is not None
+        assert entry.etag == '"v1"'
+        assert cache.stats().misses == 0
+
+    def test_refresh_extends_freshness(self, clock):
+        """Test that a revalidated entry becomes fresh again."""
+        cache = ResponseCache(clock=clock)
+        cache.put("a", CacheEntry({"x": 1}, 10, clock.now - 1, etag='"v1"'))
+
+        cache.refresh("a", clock.now + 60, etag='"v2"')
+
+        entry = cache.get("a")
+        assert entry.data == {"x": 1}
+        assert entry.etag == '"v2"'
+        assert cache.stats().revalidations == 1
+        assert cache.refresh("missing", clock.now + 60) is None
+
+    def test_conditional_headers(self):
+        """Test the validators sent when revalidating an entry."""
+        entry = CacheEntry(
+            {}, 1, 0, etag='"abc"', last_modified="Wed, 21 Oct 2026 07:28:00 GMT"
+        )
+
+        assert entry.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 21 Oct 2026 07:28:00 GMT",
+        }
+        assert CacheEntry({}, 1, 0).conditional_headers() == {}
+
+    def test_max_stale_returns_recently_expired_entry(self, clock):
+        """Test that max_stale admits entries expired within the window."""
+        cache = ResponseCache(clock=clock)
+        cache.put("a", CacheEntry({"x": 1}, 10, clock.now - 5))
+
+        assert cache.get("a") is None
+        entry = cache.get("a", max_stale=10)
+        assert entry is not None
+        assert not entry.is_fresh(clock.now)
+        assert cache.get("a", max_stale=4) is None
+
+        stats = cache.stats()
+        assert stats.stale_hits == 1
+        assert stats.misses == 2
+
+
+class TestRenderCache:
+    """Test cases for the rendered-output cache."""
+
+    def test_same_version_is_rendered_once(self):
+        """Test that repeat lookups reuse the first rendering."""
+        cache = RenderCache()
+        calls = []
+
+        def render():
+            calls.append(1)
+            return "text"
+
+        assert cache.render("alert", "a", 1, "text", render) == "text"
+        assert cache.render("alert", "a", 1, "text", render) == "text"
+
+        assert len(calls) == 1
+        assert cache.stats().hits == 1
+
+    def test_new_version_replaces_entry(self):
+        """Test that an updated record is re-rendered and the old text dropped."""
+        cache = RenderCache()
+        cache.render("alert", "a", 1, "text", lambda: "old")
+
+        assert cache.render("alert", "a", 2, "text", lambda: "new") == "new"
+        assert cache.render("alert", "a", 2, "text", lambda: "unused") == "new"
+
+        stats = cache.stats()
+        assert stats.invalidations == 1
+        assert stats.entries == 1
+        assert stats.bytes == 3
+
+    def test_modes_are_cached_separately(self):
+        """Test that text and JSON renderings of one record coexist."""
+        cache = RenderCache()
+        cache.render("alert", "a", 1, "text", lambda: "text")
+
+        assert cache.render("alert", "a", 1, "json", lambda: "{}") == "{}"
+        assert len(cache) == 2
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        """Test that least recently used renderings are evicted to fit."""
+        cache = RenderCache(max_entries=2, max_bytes=10)
+        cache.render("alert", "a", 1, "text", lambda: "aaaa")
+        cache.render("alert", "b", 1, "text", lambda: "bbbb")
+        cache.render("alert", "a", 1, "text", lambda: "unused")
+        cache.render("alert", "c", 1, "text", lambda: "cccc")
+
+        assert cache.render("alert", "a", 1, "text", lambda: "miss") == "aaaa"
+        assert cache.render("alert", "b", 1, "text", lambda: "miss") == "miss"
+        assert cache.stats().evictions >= 1
+
+        cache.render("alert", "big", 1, "text", lambda: "x" * 11)
+        assert cache.stats().bytes <= 10
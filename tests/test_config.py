@@ -0,0 +1,30 @@
+"""
+Tests for reading settings from the environment.
+"""
+
+import pytest
+from weather_mcp.config import env_flag
+
+
+class TestEnvFlag:
+    """Test cases for boolean environment flags."""
+
+    @pytest.mark.parametrize("value", ["1", "true", "YES"])
+    def test_true_values(self, monkeypatch, value):
+        """Test the accepted spellings of an enabled flag."""
+        monkeypatch.setenv("WEATHER_MCP_TEST_FLAG", value)
+
+        assert env_flag("WEATHER_MCP_TEST_FLAG")
+
+    def test_other_values_are_false(self, monkeypatch):
+        """Test that a set variable overrides the default."""
+        monkeypatch.setenv("WEATHER_MCP_TEST_FLAG", "0")
+
+        assert not env_flag("WEATHER_MCP_TEST_FLAG", default=True)
+
+    def test_unset_uses_default(self, monkeypatch):
+        """Test the default for an unset variable."""
+        monkeypatch.delenv("WEATHER_MCP_TEST_FLAG", raising=False)
+
+        assert not env_flag("WEATHER_MCP_TEST_FLAG")
+        assert env_flag("WEATHER_MCP_TEST_FLAG", default=True)
@@ -0,0 +1,160 @@
+"""
+Tests for the SQLite persistent response cache.
+"""
+
+import multiprocessing
+import secrets
+from weather_mcp.cache import CacheEntry
+from weather_mcp.disk_cache import SQLiteCache
+
+
+def _write_entries(path, worker, count):
+    cache = SQLiteCache(path)
+    for i in range(count):
+        cache.put(f"{worker}-{i}", CacheEntry({"worker": worker, "i": i}, 10, 1e12))
+    cache.close()
+
+
+class TestSQLiteCache:
+    """Test cases for the SQLite cache backend."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that an entry is stored and read back with its validators."""
+        cache = SQLiteCache(tmp_path / "cache.db")
+        entry = CacheEntry(
+            {"features": [{"id": "a"}]}, 123, 2e9, etag='"v1"', last_modified="lm"
+        )
+
+        cache.put("url", entry)
+
+        assert cache.get("url") == entry
+        assert cache.get("other") is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_survives_reopen(self, tmp_path):
+        """Test that a new cache instance sees entries from an earlier one."""
+        path = tmp_path / "cache.db"
+        first = SQLiteCache(path)
+        first.put("url", CacheEntry({"x": 1}, 5, 2e9))
+        first.close()
+
+        assert SQLiteCache(path).get("url").data == {"x": 1}
+
+    def test_bodies_are_compressed(self, tmp_path):
+        """Test that repetitive payloads are stored compactly."""
+        cache = SQLiteCache(tmp_path / "cache.db")
+        data = {"description": "Heavy snow expected. " * 500}
+
+        cache.put("url", CacheEntry(data, 10_500, 2e9))
+
+        assert cache.stats()["bytes"] < 1_000
+
+    def test_compaction_drops_long_expired_entries(self, tmp_path, clock):
+        """Test that entries past the stale retention are removed."""
+        cache = SQLiteCache(tmp_path / "cache.db", stale_retention=60, clock=clock)
+        cache.put("old", CacheEntry({}, 1, clock.now - 120))
+        cache.put("stale", CacheEntry({}, 1, clock.now - 30))
+        cache.put("fresh", CacheEntry({}, 1, clock.now + 30))
+
+        cache.compact()
+
+        assert cache.get("old") is None
+        assert cache.get("stale") is not None
+        assert cache.get("fresh") is not None
+
+    def test_compaction_enforces_size_budget(self, tmp_path, clock):
+        """Test that least recently used rows go first when over budget."""
+        cache = SQLiteCache(tmp_path / "cache.db", max_bytes=20_000, clock=clock)
+        for i in range(10):
+            clock.now += 1
+            body = secrets.token_hex(5_000)  # incompressible beyond hex
+            cache.put(f"k{i}", CacheEntry({"body": body}, 10_000, 2e9))
+        clock.now += 1
+        cache.get("k0")
+
+        cache.compact()
+
+        assert cache.stats()["bytes"] <= 20_000
+        assert cache.get("k0") is not None
+        assert cache.get("k1") is None
+        assert cache.get("k9") is not None
+
+    def test_discard(self, tmp_path):
+        """Test removing an entry."""
+        cache = SQLiteCache(tmp_path / "cache.db")
+        cache.put("url", CacheEntry({}, 1, 2e9))
+
+        cache.discard("url")
+
+        assert cache.get("url") is None
+
+    def test_lease_held_by_one_process(self, tmp_path, clock):
+        """Test that a live lease from another process blocks a claim."""
+        cache = SQLiteCache(tmp_path / "cache.db", clock=clock)
+        assert cache.claim("url", 10)
+        assert cache.claim("url", 10)  # the holder may renew
+
+        cache._connection().execute("UPDATE leases SET owner = owner + 1")
+        assert not cache.claim("url", 10)
+        cache.release("url")  # not ours to release
+        assert not cache.claim("url", 10)
+
+        clock.now += 11
+        assert cache.claim("url", 10)
+        cache.release("url")
+        assert (
+            cache._connection().execute("SELECT COUNT(*) FROM leases").fetchone()[0]
+            == 0
+        )
+
+    def test_polling_probes(self, tmp_path, clock):
+        """Test that expiry and lease probes do not touch hit counts or LRU."""
+        cache = SQLiteCache(tmp_path / "cache.db", clock=clock)
+        assert cache.expires_at("url") is None
+        cache.put("url", CacheEntry({}, 1, 2e9))
+        stored_at = clock.now
+        clock.now += 5
+
+        assert cache.expires_at("url") == 2e9
+        assert (cache.hits, cache.misses) == (0, 0)
+        (accessed_at,) = (
+            cache._connection().execute("SELECT accessed_at FROM responses").fetchone()
+        )
+        assert accessed_at == stored_at
+
+        assert cache.claim("url", 10)
+        assert not cache.leased("url")  # our own lease
+        cache._connection().execute("UPDATE leases SET owner = owner + 1")
+        assert cache.leased("url")
+        clock.now += 11
+        assert not cache.leased("url")
+
+    def test_concurrent_processes(self, tmp_path):
+        """Test that several processes can write to one database at once."""
+        path = tmp_path / "cache.db"
+        SQLiteCache(path).stats()  # create the schema up front
+        ctx = multiprocessing.get_context("spawn")
+        workers = [
+            ctx.Process(target=_write_entries, args=(path, worker, 50))
+            for worker in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+
+        assert all(process.exitcode == 0 for process in workers)
+        assert SQLiteCache(path).stats()["entries"] == 200
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        """Test that the backend is only enabled when a path is configured."""
+        monkeypatch.delenv("WEATHER_MCP_DISK_CACHE", raising=False)
+        assert SQLiteCache.from_env() is None
+
+        monkeypatch.setenv("WEATHER_MCP_DISK_CACHE", str(tmp_path / "c.db"))
+        monkeypatch.setenv("WEATHER_MCP_DISK_CACHE_MAX_BYTES", "1000")
+        cache = SQLiteCache.from_env()
+        assert cache.max_bytes == 1000
@@ -0,0 +1,171 @@
+"""
+Tests for the gridpoint resolution cache.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+from weather_mcp.gridpoints import (
+    GridPoint,
+    GridpointIndex,
+    format_coordinate,
+    normalize_coordinates,
+)
+
+POINTS_RESPONSE = {
+    "properties": {
+        "gridId": "LOX",
+        "gridX": 155,
+        "gridY": 45,
+        "forecast": "https://api.weather.gov/gridpoints/LOX/155,45/forecast",
+        "forecastHourly": (
+            "https://api.weather.gov/gridpoints/LOX/155,45/forecast/hourly"
+        ),
+        "forecastGridData": "https://api.weather.gov/gridpoints/LOX/155,45",
+    }
+}
+
+
+class TestCoordinates:
+    """Test cases for coordinate normalization."""
+
+    def test_normalize_to_four_decimals(self):
+        """Test that extra precision is rounded away."""
+        assert normalize_coordinates(34.052235, -118.243683) == (34.0522, -118.2437)
+
+    def test_format_coordinate(self):
+        """Test the canonical NWS coordinate spelling."""
+        assert format_coordinate(34.0522) == "34.0522"
+        assert format_coordinate(40.5) == "40.5"
+        assert format_coordinate(40.0) == "40"
+        assert format_coordinate(-97.08924) == "-97.0892"
+
+
+class TestGridPoint:
+    """Test cases for parsing points responses."""
+
+    def test_from_points(self):
+        """Test that office, grid and forecast URLs are extracted."""
+        grid = GridPoint.from_points(POINTS_RESPONSE)
+
+        assert grid.grid_key == ("LOX", 155, 45)
+        assert grid.forecast_url.endswith("/LOX/155,45/forecast")
+        assert grid.forecast_hourly_url.endswith("/forecast/hourly")
+        assert grid.grid_data_url.endswith("/LOX/155,45")
+
+
+class TestGridpointIndex:
+    """Test cases for the gridpoint index."""
+
+    def test_hit_after_put(self):
+        """Test that a stored resolution is returned for the same location."""
+        index = GridpointIndex()
+        grid = GridPoint.from_points(POINTS_RESPONSE)
+
+        assert index.get(34.0522, -118.2437) is None
+        index.put(34.0522, -118.2437, grid)
+
+        assert index.get(34.0522, -118.2437) == grid
+        assert index.hits == 1
+        assert index.misses == 1
+
+    def test_expiry(self, clock):
+        """Test that resolutions expire after the TTL."""
+        index = GridpointIndex(ttl=60, clock=clock)
+        index.put(34.0522, -118.2437, GridPoint.from_points(POINTS_RESPONSE))
+
+        clock.now += 61
+
+        assert index.get(34.0522, -118.2437) is None
+
+    def test_persists_to_disk(self, tmp_path):
+        """Test that a new index loads resolutions written by another."""
+        path = tmp_path / "gridpoints.json"
+        grid = GridPoint.from_points(POINTS_RESPONSE)
+        GridpointIndex(path=path).put(34.0522, -118.2437, grid)
+
+        reloaded = GridpointIndex(path=path)
+
+        assert reloaded.get(34.0522, -118.2437) == grid
+        assert "34.0522,-118.2437" in json.loads(path.read_text())["points"]
+
+    def test_expired_disk_entries_skipped(self, tmp_path, clock):
+        """Test that expired entries are dropped when loading."""
+        path = tmp_path / "gridpoints.json"
+        GridpointIndex(ttl=60, path=path, clock=clock).put(
+            1.0, 2.0, GridPoint.from_points(POINTS_RESPONSE)
+        )
+        clock.now += 61
+
+        assert len(GridpointIndex(path=path, clock=clock)) == 0
+
+    def test_unreadable_file_ignored(self, tmp_path):
+        """Test that a corrupt cache file does not prevent startup."""
+        path = tmp_path / "gridpoints.json"
+        path.write_text("{not json")
+
+        assert len(GridpointIndex(path=path)) == 0
+
+    def test_nearby_points_share_a_cell(self):
+        """Test that coordinates in one grid cell store its gridpoint once."""
+        index = GridpointIndex()
+        grid = GridPoint.from_points(POINTS_RESPONSE)
+
+        index.put(34.0522, -118.2437, grid)
+        index.put(34.0523, -118.2437, GridPoint.from_points(POINTS_RESPONSE))
+
+        assert len(index) == 2
+        assert index.cells == 1
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the index keeps at most max_entries coordinates."""
+        index = GridpointIndex(max_entries=2)
+        grid = GridPoint.from_points(POINTS_RESPONSE)
+        index.put(1.0, 1.0, grid)
+        index.put(2.0, 2.0, grid)
+        index.get(1.0, 1.0)
+
+        index.put(3.0, 3.0, grid)
+
+        assert len(index) == 2
+        assert index.get(2.0, 2.0) is None
+        assert index.get(1.0, 1.0) == grid
+
+    @pytest.mark.asyncio
+    async def test_writes_are_batched_off_loop(self, tmp_path):
+        """Test that many puts in a loop cost one write, flushed on exit."""
+        path = tmp_path / "gridpoints.json"
+        index = GridpointIndex(path=path, save_delay=0.02)
+        grid = GridPoint.from_points(POINTS_RESPONSE)
+
+        with patch.object(index, "_write", wraps=index._write) as write:
+            async with index.running():
+                for i in range(100):
+                    index.put(30.0 + i / 1000, -100.0, grid)
+                assert not path.exists()
+                await asyncio.sleep(0.1)
+                assert write.call_count == 1
+
+                index.put(40.0, -100.0, grid)
+
+        assert write.call_count == 2
+        assert len(GridpointIndex(path=path)) == 101
+
+    def test_concurrent_writers_leave_a_valid_file(self, tmp_path):
+        """Test that writers sharing a path never publish a torn file."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        path = tmp_path / "gridpoints.json"
+        grid = GridPoint.from_points(POINTS_RESPONSE)
+        indexes = [GridpointIndex(path=path) for _ in range(8)]
+
+        def write(index):
+            for i in range(20):
+                index.put(30.0 + i / 100, -100.0, grid)
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(write, indexes))
+
+        assert len(GridpointIndex(path=path)) == 20
+        assert [p.name for p in tmp_path.iterdir()] == ["gridpoints.json"]
@@ -5,6 +5,7 @@ These tests verify that components work together correctly.
 
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
+from weather_mcp.ratelimit import Priority
 from weather_mcp.tools import get_alerts, get_forecast
 from weather_mcp.nws_api import make_nws_request
 
@@ -18,12 +19,13 @@ class TestIntegration:
         with patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client:
             # Setup mock HTTP response
             mock_response = MagicMock()
+            mock_response.headers = {}
             mock_response.json.return_value = mock_nws_response
             mock_response.raise_for_status = MagicMock()
 
             mock_client_instance = AsyncMock()
             mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             # Test the complete flow
             result = await get_alerts("CA")
@@ -48,10 +50,13 @@ class TestIntegration:
         with patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client:
             # Setup mock HTTP responses
             mock_response_1 = MagicMock()
+            mock_response_1.headers = {}
             mock_response_1.json.return_value = mock_forecast_points_response
             mock_response_1.raise_for_status = MagicMock()
 
             mock_response_2 = MagicMock()
+
+            mock_response_2.headers = {}
             mock_response_2.json.return_value = mock_forecast_response
             mock_response_2.raise_for_status = MagicMock()
 
@@ -59,7 +64,7 @@ class TestIntegration:
             mock_client_instance.get = AsyncMock(
                 side_effect=[mock_response_1, mock_response_2]
             )
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             # Test the complete flow
             result = await get_forecast(34.0522, -118.2437)
@@ -79,12 +84,13 @@ class TestIntegration:
         with patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client:
             # Setup mock HTTP response
             mock_response = MagicMock()
+            mock_response.headers = {}
             mock_response.json.return_value = mock_nws_response
             mock_response.raise_for_status = MagicMock()
 
             mock_client_instance = AsyncMock()
             mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             # Test API call
             api_result = await make_nws_request(
@@ -103,7 +109,7 @@ class TestIntegration:
         from weather_mcp.server import _mcp_get_alerts_tool_impl
 
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
             mock_request.return_value = mock_nws_response
 
@@ -121,11 +127,13 @@ class TestIntegration:
             # Simulate network error
             mock_client_instance = AsyncMock()
             mock_client_instance.get = AsyncMock(side_effect=Exception("Network error"))
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             # Test that error is handled gracefully in tools
             result = await get_alerts("CA")
-            assert result == "Unable to fetch alerts or no alerts found."
+            assert result == (
+                "Unable to fetch alerts: NWS API request failed: Network error"
+            )
 
     @pytest.mark.asyncio
     async def test_different_response_formats(self):
@@ -141,7 +149,7 @@ class TestIntegration:
 
         for mock_response, expected_result in test_cases:
             with patch(
-                "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+                "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
             ) as mock_request:
                 mock_request.return_value = mock_response
 
@@ -154,11 +162,11 @@ class TestIntegration:
         test_states = ["CA", "TX", "NY", "FL", "WA"]
 
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
             mock_request.return_value = mock_nws_response
 
             for state in test_states:
                 await get_alerts(state)
                 expected_url = f"https://api.weather.gov/alerts/active/area/{state}"
-                mock_request.assert_called_with(expected_url)
+                mock_request.assert_called_with(expected_url, Priority.INTERACTIVE)
@@ -0,0 +1,69 @@
+"""
+Tests for the MCP SDK internals the server relies on.
+
+These fail when an SDK upgrade removes or changes the internals wrapped in
+weather_mcp.mcp_compat.
+"""
+
+import anyio
+import pytest
+from mcp.server.lowlevel import Server
+from mcp.server.session import ServerSession
+from mcp.types import Resource
+from weather_mcp.mcp_compat import advertise_resource_subscribe, on_session_close
+
+
+def make_server():
+    server = Server("compat")
+
+    @server.list_resources()
+    async def list_resources() -> list[Resource]:
+        return []
+
+    return server
+
+
+class TestAdvertiseResourceSubscribe:
+    """Test cases for advertising resource subscriptions."""
+
+    def test_sdk_does_not_advertise_subscribe(self):
+        """Test that the workaround is still needed."""
+        server = make_server()
+
+        options = server.create_initialization_options()
+
+        assert options.capabilities.resources is not None
+        assert not options.capabilities.resources.subscribe
+
+    def test_reports_subscribe_when_enabled(self):
+        """Test that the capability follows the callback."""
+        server = make_server()
+        enabled = True
+        advertise_resource_subscribe(server, lambda: enabled)
+
+        assert server.create_initialization_options().capabilities.resources.subscribe
+
+        enabled = False
+        capabilities = server.create_initialization_options().capabilities
+        assert not capabilities.resources.subscribe
+
+
+class TestOnSessionClose:
+    """Test cases for session close callbacks."""
+
+    @pytest.mark.asyncio
+    async def test_callback_runs_when_session_exits(self):
+        """Test that the callback runs once the session context ends."""
+        server = make_server()
+        send, receive = anyio.create_memory_object_stream(1)
+        closed = []
+
+        async with send, receive:
+            session = ServerSession(
+                receive, send, server.create_initialization_options()
+            )
+            async with session:
+                on_session_close(session, lambda: closed.append(session))
+                assert closed == []
+
+        assert closed == [session]
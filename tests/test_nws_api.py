@@ -2,10 +2,31 @@
 Tests for the National Weather Service API client.
 """
 
+import asyncio
 import pytest
 import httpx
 from unittest.mock import AsyncMock, patch, MagicMock
-from weather_mcp.nws_api import make_nws_request, USER_AGENT, NWS_API_BASE
+from weather_mcp import nws_api
+from weather_mcp.nws_api import (
+    HTTPClientConfig,
+    NWSConnectionError,
+    NWSHTTPError,
+    NWSUnavailableError,
+    NWS_API_BASE,
+    USER_AGENT,
+    configure_http_client,
+    fetch_nws_json,
+    get_circuit_breaker,
+    get_metrics,
+    get_http_client,
+    http_client_lifespan,
+    make_nws_request,
+    request_stats,
+    response_cache,
+)
+from weather_mcp.cache import CacheEntry
+from weather_mcp.disk_cache import SQLiteCache
+from weather_mcp.ratelimit import Priority, RateLimiter
 
 
 class TestNWSAPI:
@@ -28,12 +49,13 @@ class TestNWSAPI:
 
         with patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client:
             mock_response = MagicMock()
+            mock_response.headers = {}
             mock_response.json.return_value = mock_response_data
             mock_response.raise_for_status = MagicMock()
 
             mock_client_instance = AsyncMock()
             mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             result = await make_nws_request(
                 "https://api.weather.gov/alerts/active/area/CA"
@@ -51,13 +73,14 @@ class TestNWSAPI:
         """Test API request with HTTP error."""
         with patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client:
             mock_response = MagicMock()
+            mock_response.headers = {}
             mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
                 "404 Not Found", request=MagicMock(), response=MagicMock()
             )
 
             mock_client_instance = AsyncMock()
             mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             result = await make_nws_request(
                 "https://api.weather.gov/alerts/active/area/INVALID"
@@ -73,7 +96,7 @@ class TestNWSAPI:
             mock_client_instance.get = AsyncMock(
                 side_effect=httpx.TimeoutException("Timeout")
             )
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             result = await make_nws_request(
                 "https://api.weather.gov/alerts/active/area/CA"
@@ -87,7 +110,7 @@ class TestNWSAPI:
         with patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
             mock_client_instance.get = AsyncMock(side_effect=Exception("Network error"))
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
 
             result = await make_nws_request(
                 "https://api.weather.gov/alerts/active/area/CA"
@@ -99,3 +122,585 @@ class TestNWSAPI:
         """Test that constants are properly defined."""
         assert USER_AGENT == "weather-app/1.0"
         assert NWS_API_BASE == "https://api.weather.gov"
+
+
+class TestHTTPClientPool:
+    """Test cases for the shared, pooled NWS HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_requests(self):
+        """Test that consecutive requests share one client."""
+        with patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client:
+            mock_response = MagicMock()
+            mock_response.headers = {}
+            mock_response.json.return_value = {"features": []}
+            mock_client_instance = MagicMock()
+            mock_client_instance.is_closed = False
+            mock_client_instance.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value = mock_client_instance
+
+            await make_nws_request("https://api.weather.gov/alerts/active/area/CA")
+            await make_nws_request("https://api.weather.gov/alerts/active/area/TX")
+
+            assert mock_client.call_count == 1
+            assert mock_client_instance.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_client_built_from_config(self):
+        """Test that pool limits and keep-alive expiry come from the config."""
+        config = HTTPClientConfig(
+            max_connections=7, max_keepalive_connections=3, keepalive_expiry=12.5
+        )
+        with patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client:
+            mock_client.return_value.aclose = AsyncMock()
+            async with http_client_lifespan(config):
+                pass
+
+            limits = mock_client.call_args.kwargs["limits"]
+            assert limits.max_connections == 7
+            assert limits.max_keepalive_connections == 3
+            assert limits.keepalive_expiry == 12.5
+            assert mock_client.call_args.kwargs["http2"] is False
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self):
+        """Test that HTTP/2 is only enabled when the h2 package is present."""
+        configure_http_client(HTTPClientConfig(http2=True))
+        with (
+            patch("weather_mcp.nws_api.httpx.AsyncClient") as mock_client,
+            patch("weather_mcp.nws_api._http2_available", return_value=False),
+        ):
+            get_http_client()
+            assert mock_client.call_args.kwargs["http2"] is False
+
+    @pytest.mark.asyncio
+    async def test_lifespan_closes_after_last_holder(self):
+        """Test that nested lifespans share the client and close it once."""
+        async with http_client_lifespan() as outer:
+            async with http_client_lifespan() as inner:
+                assert inner is outer
+            assert not outer.is_closed
+        assert outer.is_closed
+
+    def test_config_from_env(self, monkeypatch):
+        """Test reading pool settings from the environment."""
+        monkeypatch.setenv("WEATHER_MCP_HTTP_MAX_CONNECTIONS", "50")
+        monkeypatch.setenv("WEATHER_MCP_HTTP2", "true")
+
+        config = HTTPClientConfig.from_env()
+
+        assert config.max_connections == 50
+        assert config.http2 is True
+        assert config.keepalive_expiry == 30.0
+
+
+class TestResponseCaching:
+    """Test cases for caching NWS responses by URL."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_response_served_from_cache(self, use_transport):
+        """Test that a max-age response is fetched upstream only once."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(
+                200,
+                json={"features": []},
+                headers={"Cache-Control": "public, max-age=60"},
+            )
+
+        use_transport(handler)
+        url = "https://api.weather.gov/alerts/active/area/CA"
+
+        first = await make_nws_request(url)
+        second = await make_nws_request(url)
+
+        assert first == second == {"features": []}
+        assert len(calls) == 1
+        stats = response_cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_response_not_stored(self, use_transport):
+        """Test that responses without freshness headers are refetched."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(200, json={"features": []})
+
+        use_transport(handler)
+        url = "https://api.weather.gov/alerts/active/area/CA"
+
+        await make_nws_request(url)
+        await make_nws_request(url)
+
+        assert len(calls) == 2
+        assert len(response_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_error_response_not_cached(self, use_transport):
+        """Test that failed requests are never cached."""
+        use_transport(
+            lambda request: httpx.Response(503, headers={"Cache-Control": "max-age=60"})
+        )
+
+        result = await make_nws_request("https://api.weather.gov/points/1,2")
+
+        assert result is None
+        assert len(response_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_stale_response_revalidated_with_304(self, use_transport):
+        """Test that a stale entry is revalidated instead of redownloaded."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"Cache-Control": "max-age=60"})
+            return httpx.Response(
+                200,
+                json={"features": ["alert"]},
+                headers={"ETag": '"v1"', "Cache-Control": "max-age=0"},
+            )
+
+        use_transport(handler)
+        url = "https://api.weather.gov/alerts/active/area/CA"
+
+        first = await make_nws_request(url)
+        second = await make_nws_request(url)
+        third = await make_nws_request(url)
+
+        assert first == second == third == {"features": ["alert"]}
+        assert len(requests) == 2
+        assert "If-None-Match" not in requests[0].headers
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert response_cache.stats().revalidations == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_response_replaces_stale_entry(self, use_transport):
+        """Test that a 200 on revalidation replaces the cached payload."""
+        versions = iter(["v1", "v2"])
+
+        def handler(request):
+            version = next(versions)
+            return httpx.Response(
+                200,
+                json={"version": version},
+                headers={
+                    "Last-Modified": f"{version} GMT",
+                    "Cache-Control": "max-age=0",
+                },
+            )
+
+        use_transport(handler)
+        url = "https://api.weather.gov/alerts/active/area/CA"
+
+        assert await make_nws_request(url) == {"version": "v1"}
+        assert await make_nws_request(url) == {"version": "v2"}
+        assert response_cache.peek(url).last_modified == "v2 GMT"
+
+
+class TestRequestCoalescing:
+    """Test cases for single-flight deduplication of identical requests."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_fetch(self, use_transport):
+        """Test that concurrent callers for one URL await one upstream GET."""
+        calls = []
+        release = asyncio.Event()
+
+        async def handler(request):
+            calls.append(request.url)
+            await release.wait()
+            return httpx.Response(200, json={"features": []})
+
+        use_transport(handler)
+        url = "https://api.weather.gov/alerts/active/area/TX"
+
+        waiters = [asyncio.create_task(make_nws_request(url)) for _ in range(50)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert len(calls) == 1
+        assert all(result == {"features": []} for result in results)
+        assert request_stats.requests == 50
+        assert request_stats.upstream == 1
+        assert request_stats.coalesced == 49
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_fetch(self, use_transport):
+        """Test that one caller giving up leaves the fetch for the others."""
+        release = asyncio.Event()
+
+        async def handler(request):
+            await release.wait()
+            return httpx.Response(200, json={"features": ["alert"]})
+
+        use_transport(handler)
+        url = "https://api.weather.gov/alerts/active/area/TX"
+
+        impatient = asyncio.create_task(make_nws_request(url))
+        patient = asyncio.create_task(make_nws_request(url))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await patient == {"features": ["alert"]}
+        assert impatient.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_distinct_urls_not_coalesced(self, use_transport):
+        """Test that different URLs are fetched independently."""
+        calls = []
+
+        def handler(request):
+            calls.append(str(request.url))
+            return httpx.Response(200, json={})
+
+        use_transport(handler)
+
+        await asyncio.gather(
+            make_nws_request("https://api.weather.gov/alerts/active/area/TX"),
+            make_nws_request("https://api.weather.gov/alerts/active/area/CA"),
+        )
+
+        assert len(calls) == 2
+        assert request_stats.coalesced == 0
+
+
+class TestRetriesAndCircuitBreaker:
+    """Test cases for retrying transient failures and failing fast."""
+
+    @pytest.mark.asyncio
+    async def test_transient_503_is_retried(self, use_transport):
+        """Test that a 503 followed by a 200 succeeds."""
+        responses = iter(
+            [httpx.Response(503), httpx.Response(200, json={"features": []})]
+        )
+        use_transport(lambda request: next(responses))
+
+        result = await fetch_nws_json("https://api.weather.gov/alerts/active/area/CA")
+
+        assert result == {"features": []}
+
+    @pytest.mark.asyncio
+    async def test_retry_after_header_sets_delay(self, use_transport):
+        """Test that the wait before a retry follows Retry-After."""
+        responses = iter(
+            [
+                httpx.Response(429, headers={"Retry-After": "2"}),
+                httpx.Response(200, json={}),
+            ]
+        )
+        use_transport(lambda request: next(responses))
+
+        with patch(
+            "weather_mcp.nws_api.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            await fetch_nws_json("https://api.weather.gov/points/1,2")
+
+        mock_sleep.assert_called_once_with(2.0)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_raise_reason(self, use_transport):
+        """Test that the final failure reason reaches the caller."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(502)
+
+        use_transport(handler)
+
+        with pytest.raises(NWSHTTPError, match="HTTP 502") as excinfo:
+            await fetch_nws_json("https://api.weather.gov/points/1,2")
+
+        assert excinfo.value.status_code == 502
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_not_retried(self, use_transport):
+        """Test that a 404 fails immediately without retries."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404)
+
+        use_transport(handler)
+
+        with pytest.raises(NWSHTTPError, match="HTTP 404"):
+            await fetch_nws_json("https://api.weather.gov/points/1,2")
+
+        assert len(calls) == 1
+        assert get_circuit_breaker("api.weather.gov").failures == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_reported_as_connection_error(self, use_transport):
+        """Test that timeouts surface as NWSConnectionError."""
+
+        def handler(request):
+            raise httpx.ReadTimeout("slow", request=request)
+
+        use_transport(handler)
+
+        with pytest.raises(NWSConnectionError, match="timed out"):
+            await fetch_nws_json("https://api.weather.gov/points/1,2")
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self, use_transport):
+        """Test that an unhealthy host is not contacted until it cools off."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        use_transport(handler)
+        url = "https://api.weather.gov/alerts/active/area/CA"
+        breaker = get_circuit_breaker("api.weather.gov")
+        breaker.failure_threshold = 3
+
+        with pytest.raises(NWSHTTPError):
+            await fetch_nws_json(url)
+        assert breaker.state == "open"
+
+        with pytest.raises(NWSUnavailableError, match="HTTP 503"):
+            await fetch_nws_json(url)
+
+        assert len(calls) == 3
+        assert await make_nws_request(url) is None
+
+
+class TestRateLimitedRequests:
+    """Test cases for routing NWS requests through the rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_requests_counted_by_lane(self, use_transport):
+        """Test that each upstream request takes a token from its lane."""
+        use_transport(lambda request: httpx.Response(200, json={}))
+
+        await fetch_nws_json("https://api.weather.gov/points/1,2")
+        await fetch_nws_json(
+            "https://api.weather.gov/points/3,4", priority=Priority.BACKGROUND
+        )
+
+        metrics = get_metrics()
+        assert metrics["rate_limiter"]["interactive"]["granted"] == 1
+        assert metrics["rate_limiter"]["background"]["granted"] == 1
+        assert metrics["requests"]["upstream"] == 2
+
+    @pytest.mark.asyncio
+    async def test_interactive_caller_promotes_background_fetch(self, use_transport):
+        """Test that joining a queued prefetch moves it to the interactive lane."""
+        use_transport(lambda request: httpx.Response(200, json={"ok": True}))
+        nws_api.rate_limiter = RateLimiter(rate=20.0, burst=1)
+        await nws_api.rate_limiter.acquire(Priority.BACKGROUND)
+        url = "https://api.weather.gov/alerts/active/area/CA"
+
+        prefetch = asyncio.create_task(
+            fetch_nws_json(url, priority=Priority.BACKGROUND)
+        )
+        await asyncio.sleep(0.001)
+        interactive = asyncio.create_task(fetch_nws_json(url))
+        await asyncio.sleep(0.001)
+
+        assert nws_api.rate_limiter.stats()["interactive"].queued == 1
+        assert await interactive == await prefetch == {"ok": True}
+
+    def test_metrics_include_breakers(self):
+        """Test that breaker state is part of the metrics snapshot."""
+        get_circuit_breaker("api.weather.gov").record_failure("HTTP 503")
+
+        metrics = get_metrics()
+
+        assert metrics["circuit_breakers"]["api.weather.gov"] == {
+            "state": "closed",
+            "failures": 1,
+        }
+        assert set(metrics["cache"]) >= {"hits", "misses", "entries"}
+
+
+class TestPersistentCache:
+    """Test cases for the persistent cache behind the in-process cache."""
+
+    @pytest.mark.asyncio
+    async def test_warm_restart_served_from_disk(self, use_transport, tmp_path):
+        """Test that a restarted process reuses responses from disk."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(
+                200, json={"features": []}, headers={"Cache-Control": "max-age=300"}
+            )
+
+        use_transport(handler)
+        nws_api.persistent_cache = SQLiteCache(tmp_path / "cache.db")
+        url = "https://api.weather.gov/alerts/active/area/CA"
+
+        await fetch_nws_json(url)
+        response_cache.clear()  # simulate a restart
+        result = await fetch_nws_json(url)
+
+        assert result == {"features": []}
+        assert len(calls) == 1
+        assert get_metrics()["persistent_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_disk_entry_revalidated(self, use_transport, tmp_path):
+        """Test that a stale entry from disk supplies conditional headers."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("If-None-Match"))
+            return httpx.Response(304, headers={"Cache-Control": "max-age=60"})
+
+        use_transport(handler)
+        disk = SQLiteCache(tmp_path / "cache.db")
+        url = "https://api.weather.gov/points/1,2"
+        disk.put(url, CacheEntry({"cached": True}, 10, 0.0, etag='"v1"'))
+        nws_api.persistent_cache = disk
+
+        result = await fetch_nws_json(url)
+
+        assert result == {"cached": True}
+        assert seen == ['"v1"']
+        assert disk.get(url).expires_at > response_cache.clock()
+
+    @pytest.mark.asyncio
+    async def test_waits_for_other_worker(self, use_transport, tmp_path):
+        """Test that a URL leased by another worker is read from disk, not fetched."""
+        calls = []
+        use_transport(lambda request: calls.append(request) or httpx.Response(200))
+        disk = SQLiteCache(tmp_path / "cache.db")
+        nws_api.persistent_cache = disk
+        nws_api.lease_poll_interval = 0.01
+        url = "https://api.weather.gov/alerts/active/area/CA"
+        disk._connection().execute(
+            "INSERT INTO leases VALUES (?, ?, ?)", (url, -1, 2e9)
+        )
+
+        async def other_worker():
+            await asyncio.sleep(0.05)
+            disk.put(url, CacheEntry({"features": []}, 10, 2e9))
+
+        result, _ = await asyncio.gather(fetch_nws_json(url), other_worker())
+
+        assert result == {"features": []}
+        assert calls == []
+        assert request_stats.shared == 1
+        assert disk.hits == 1  # polling loads the body only once it is fresh
+
+    @pytest.mark.asyncio
+    async def test_fetches_after_failed_lease_holder(self, use_transport, tmp_path):
+        """Test that a released lease without a response lets this worker fetch."""
+        use_transport(
+            lambda request: httpx.Response(
+                200, json={"ok": True}, headers={"Cache-Control": "max-age=60"}
+            )
+        )
+        disk = SQLiteCache(tmp_path / "cache.db")
+        nws_api.persistent_cache = disk
+        nws_api.lease_poll_interval = 0.01
+        url = "https://api.weather.gov/points/1,2"
+        disk._connection().execute(
+            "INSERT INTO leases VALUES (?, ?, ?)", (url, -1, 2e9)
+        )
+
+        async def other_worker():
+            await asyncio.sleep(0.05)
+            disk._connection().execute("DELETE FROM leases")
+
+        result, _ = await asyncio.gather(fetch_nws_json(url), other_worker())
+
+        assert result == {"ok": True}
+        assert disk.get(url).data == {"ok": True}
+        assert (
+            disk._connection().execute("SELECT COUNT(*) FROM leases").fetchone()[0] == 0
+        )
+
+    @pytest.mark.asyncio
+    async def test_disk_failure_does_not_fail_request(self, use_transport):
+        """Test that a broken backend only costs the cache, not the request."""
+        use_transport(lambda request: httpx.Response(200, json={"ok": True}))
+        broken = MagicMock()
+        broken.get.side_effect = OSError("disk full")
+        nws_api.persistent_cache = broken
+
+        assert await fetch_nws_json("https://api.weather.gov/points/1,2") == {
+            "ok": True
+        }
+
+
+class TestStaleWhileRevalidate:
+    """Test cases for serving stale entries while refreshing them."""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed(self, use_transport):
+        """Test that a just-expired entry is returned without waiting."""
+        release = asyncio.Event()
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await release.wait()
+            return httpx.Response(
+                200, json={"version": 2}, headers={"Cache-Control": "max-age=60"}
+            )
+
+        use_transport(handler)
+        nws_api.max_stale = 30.0
+        url = "https://api.weather.gov/alerts/active/area/CA"
+        now = response_cache.clock()
+        response_cache.put(url, CacheEntry({"version": 1}, 10, now - 5))
+
+        result = await asyncio.wait_for(fetch_nws_json(url), timeout=0.5)
+        assert result == {"version": 1}
+        assert request_stats.background_refreshes == 1
+
+        # A second caller during the refresh gets the stale copy too.
+        assert await fetch_nws_json(url) == {"version": 1}
+        assert request_stats.background_refreshes == 1
+
+        release.set()
+        await nws_api._inflight[url]
+        assert await fetch_nws_json(url) == {"version": 2}
+        assert len(calls) == 1
+        assert nws_api.rate_limiter.stats()["background"].granted == 1
+
+    @pytest.mark.asyncio
+    async def test_too_stale_entry_blocks(self, use_transport):
+        """Test that entries past max staleness wait for a fresh copy."""
+        use_transport(
+            lambda request: httpx.Response(
+                200, json={"version": 2}, headers={"Cache-Control": "max-age=60"}
+            )
+        )
+        nws_api.max_stale = 30.0
+        url = "https://api.weather.gov/alerts/active/area/CA"
+        now = response_cache.clock()
+        response_cache.put(url, CacheEntry({"version": 1}, 10, now - 31))
+
+        assert await fetch_nws_json(url) == {"version": 2}
+        assert request_stats.background_refreshes == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_entry(self, use_transport):
+        """Test that a failing background refresh leaves callers served."""
+        use_transport(lambda request: httpx.Response(500))
+        nws_api.max_stale = 30.0
+        url = "https://api.weather.gov/alerts/active/area/CA"
+        now = response_cache.clock()
+        response_cache.put(url, CacheEntry({"version": 1}, 10, now - 5))
+
+        assert await fetch_nws_json(url) == {"version": 1}
+        with pytest.raises(NWSHTTPError):
+            await nws_api._inflight[url]
+        assert await fetch_nws_json(url) == {"version": 1}
@@ -0,0 +1,61 @@
+"""
+Tests for formatting station observations.
+"""
+
+from weather_mcp.observations import compass_point, format_observation, measurement
+
+
+class TestObservations:
+    """Test cases for observation formatting."""
+
+    def test_measurement_converts_to_us_units(self):
+        """Test SI to US unit conversion of NWS quantities."""
+        assert measurement({"value": 0.0, "unitCode": "wmoUnit:degC"}) == (
+            32.0,
+            "°F",
+        )
+        speed, label = measurement({"value": 16.09, "unitCode": "wmoUnit:km_h-1"})
+        assert round(speed) == 10 and label == "mph"
+        assert measurement({"value": None, "unitCode": "wmoUnit:degC"}) is None
+        assert measurement(None) is None
+
+    def test_compass_point(self):
+        """Test wind direction names."""
+        assert compass_point(0) == "N"
+        assert compass_point(250) == "WSW"
+        assert compass_point(359) == "N"
+
+    def test_format_observation(self):
+        """Test that reported values are listed and missing ones skipped."""
+        result = format_observation(
+            {
+                "properties": {
+                    "timestamp": "2025-01-01T12:00:00+00:00",
+                    "textDescription": "Partly Cloudy",
+                    "temperature": {"value": 22.2, "unitCode": "wmoUnit:degC"},
+                    "windSpeed": {"value": 14.8, "unitCode": "wmoUnit:km_h-1"},
+                    "windDirection": {
+                        "value": 270,
+                        "unitCode": "wmoUnit:degree_(angle)",
+                    },
+                    "relativeHumidity": {"value": 45.3, "unitCode": "wmoUnit:percent"},
+                    "dewpoint": {"value": None, "unitCode": "wmoUnit:degC"},
+                }
+            },
+            "KLAX (Los Angeles Airport)",
+        )
+
+        assert result == (
+            "Station: KLAX (Los Angeles Airport)\n"
+            "Observed: 2025-01-01T12:00:00+00:00\n"
+            "Conditions: Partly Cloudy\n"
+            "Temperature: 72°F\n"
+            "Wind: 9 mph from W\n"
+            "Humidity: 45%"
+        )
+
+    def test_empty_observation(self):
+        """Test that an observation with no values says so."""
+        result = format_observation({"properties": {"timestamp": "2025"}}, "KLAX")
+
+        assert result == "No recent observation available."
@@ -0,0 +1,109 @@
+"""
+Tests for the NWS rate limiter.
+"""
+
+import asyncio
+import pytest
+from weather_mcp.ratelimit import Priority, RateLimiter
+
+
+class TestRateLimiter:
+    """Test cases for the token bucket with priority lanes."""
+
+    @pytest.mark.asyncio
+    async def test_burst_passes_without_waiting(self):
+        """Test that requests within the burst are granted immediately."""
+        limiter = RateLimiter(rate=1.0, burst=3)
+
+        for _ in range(3):
+            await asyncio.wait_for(limiter.acquire(), timeout=0.05)
+
+        stats = limiter.stats()["interactive"]
+        assert stats.granted == 3
+        assert stats.queued == 0
+        assert stats.max_wait == 0.0
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self):
+        """Test that an empty bucket delays the next request."""
+        limiter = RateLimiter(rate=50.0, burst=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.stats()["interactive"].queued == 1
+
+        await asyncio.wait_for(waiter, timeout=1.0)
+        assert limiter.stats()["interactive"].max_wait > 0
+
+    @pytest.mark.asyncio
+    async def test_interactive_preempts_background(self):
+        """Test that queued interactive requests are granted first."""
+        limiter = RateLimiter(rate=50.0, burst=1)
+        await limiter.acquire(Priority.BACKGROUND)
+        order = []
+
+        async def request(priority, name):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        background = asyncio.create_task(request(Priority.BACKGROUND, "prefetch"))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(request(Priority.INTERACTIVE, "user"))
+        await asyncio.wait_for(asyncio.gather(background, interactive), timeout=1.0)
+
+        assert order == ["user", "prefetch"]
+
+    @pytest.mark.asyncio
+    async def test_interactive_skips_background_queue(self):
+        """Test that a waiting background lane does not hold back a token."""
+        limiter = RateLimiter(rate=1.0, burst=2)
+        await limiter.acquire(Priority.BACKGROUND)
+        await limiter.acquire(Priority.BACKGROUND)
+        queued = asyncio.create_task(limiter.acquire(Priority.BACKGROUND))
+        await asyncio.sleep(0)
+
+        limiter._tokens = 1.0
+        await asyncio.wait_for(limiter.acquire(Priority.INTERACTIVE), timeout=0.05)
+
+        assert limiter.stats()["background"].queued == 1
+        queued.cancel()
+
+    @pytest.mark.asyncio
+    async def test_promote_moves_waiter(self):
+        """Test that promote moves a background waiter to the front lane."""
+        limiter = RateLimiter(rate=1.0, burst=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire(Priority.BACKGROUND, key="CA"))
+        await asyncio.sleep(0)
+
+        limiter.promote("CA")
+
+        stats = limiter.stats()
+        assert stats["background"].queued == 0
+        assert stats["interactive"].queued == 1
+        waiter.cancel()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        """Test that a cancelled waiter does not consume a token."""
+        limiter = RateLimiter(rate=50.0, burst=1)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(limiter.acquire(), timeout=1.0)
+
+        assert limiter.stats()["interactive"].granted == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_rate_disables_limiting(self):
+        """Test that a rate of zero never waits."""
+        limiter = RateLimiter(rate=0, burst=0)
+
+        for _ in range(100):
+            await limiter.acquire()
+
+        assert limiter.stats()["interactive"].granted == 100
@@ -0,0 +1,173 @@
+"""
+Tests for compact alert and forecast period records.
+"""
+
+import gc
+import json
+import tracemalloc
+from weather_mcp.records import (
+    AlertRecord,
+    ForecastPeriod,
+    alert_records,
+    forecast_periods,
+)
+
+EVENTS = ["Winter Storm Warning", "Heat Advisory", "Flood Watch", "Wind Advisory"]
+SEVERITIES = ["Extreme", "Severe", "Moderate", "Minor"]
+
+
+def national_payload(count):
+    """Serialized ``/alerts/active`` response shaped like the real feed."""
+    features = []
+    for i in range(count):
+        urn = f"urn:oid:2.49.0.1.840.0.{i:08x}"
+        features.append(
+            {
+                "id": urn,
+                "type": "Feature",
+                "geometry": None,
+                "properties": {
+                    "id": urn,
+                    "areaDesc": f"County {i % 50}; County {i % 50 + 1}",
+                    "geocode": {
+                        "SAME": [f"0060{i % 50:02d}"],
+                        "UGC": [f"CAZ{i % 50:03d}", f"CAZ{i % 50 + 1:03d}"],
+                    },
+                    "affectedZones": [
+                        f"https://api.weather.gov/zones/forecast/CAZ{i % 50:03d}"
+                    ],
+                    "references": [],
+                    "sent": "2025-01-01T00:00:00-08:00",
+                    "effective": "2025-01-01T00:00:00-08:00",
+                    "onset": "2025-01-01T00:00:00-08:00",
+                    "expires": "2025-01-02T00:00:00-08:00",
+                    "ends": None,
+                    "status": "Actual",
+                    "messageType": "Alert",
+                    "category": "Met",
+                    "severity": SEVERITIES[i % 4],
+                    "certainty": "Likely",
+                    "urgency": "Expected",
+                    "event": EVENTS[i % 4],
+                    "sender": "w-nws.webmaster@noaa.gov",
+                    "senderName": "NWS Los Angeles CA",
+                    "headline": f"{EVENTS[i % 4]} issued January 1",
+                    "description": "* WHAT...Heavy snow expected. " * 8,
+                    "instruction": "Travel could be very difficult. " * 3,
+                    "response": "Prepare",
+                    "parameters": {
+                        "AWIPSidentifier": ["WSWLOX"],
+                        "WMOidentifier": ["WWUS46 KLOX 010000"],
+                        "BLOCKCHANNEL": ["EAS", "NWEM", "CMAS"],
+                    },
+                },
+            }
+        )
+    return json.dumps({"features": features})
+
+
+def traced_bytes(build):
+    """Bytes still allocated after ``build()``, holding on to its result."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+class TestAlertRecord:
+    """Test cases for building alert records from GeoJSON features."""
+
+    def test_from_feature(self):
+        """Test that the used properties are copied and the rest dropped."""
+        record = AlertRecord.from_feature(
+            {
+                "id": "urn:a",
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+                },
+                "properties": {
+                    "event": "Tornado Warning",
+                    "areaDesc": "Harris",
+                    "messageType": "Update",
+                    "geocode": {"UGC": ["TXC201"]},
+                    "references": [{"@id": "urn:old", "identifier": "old"}],
+                    "parameters": {"VTEC": ["..."]},
+                },
+            }
+        )
+
+        assert record.id == "urn:a"
+        assert record.event == "Tornado Warning"
+        assert record.area == "Harris"
+        assert record.message_type == "Update"
+        assert record.zones == ("TXC201",)
+        assert record.references == ("urn:old", "old")
+        assert len(record.polygons) == 1
+        assert not hasattr(record, "__dict__")
+
+    def test_repeated_values_are_shared(self):
+        """Test that equal enumerations and areas from separate parses share memory."""
+        first, second = (
+            alert_records(json.loads(national_payload(101))["features"])[i]
+            for i in (0, 100)
+        )
+
+        assert first.severity is second.severity
+        assert first.event is second.event
+        assert first.area is second.area
+        assert first.zones[0] is second.zones[0]
+
+    def test_memory_per_10k_alerts(self):
+        """Test that 10k records take a fraction of the parsed JSON's memory."""
+        payload = national_payload(10_000)
+
+        raw = traced_bytes(lambda: json.loads(payload)["features"])
+        records = traced_bytes(lambda: alert_records(json.loads(payload)["features"]))
+
+        assert records < 16 * 1024 * 1024
+        assert records < raw * 0.4
+
+
+class TestForecastPeriod:
+    """Test cases for forecast period records."""
+
+    def test_forecast_periods(self):
+        """Test that every period of a forecast response is converted."""
+        periods = forecast_periods(
+            {
+                "properties": {
+                    "periods": [
+                        {
+                            "name": "Today",
+                            "startTime": "2025-01-01T06:00:00-08:00",
+                            "temperature": 75,
+                            "temperatureUnit": "F",
+                            "windSpeed": "10 mph",
+                            "windDirection": "SW",
+                            "probabilityOfPrecipitation": {"value": None},
+                            "shortForecast": "Sunny",
+                            "detailedForecast": "Sunny with clear skies.",
+                        },
+                        {"name": "Tonight"},
+                    ]
+                }
+            }
+        )
+
+        assert [period.name for period in periods] == ["Today", "Tonight"]
+        assert periods[0].temperature == 75
+        assert periods[0].wind_direction == "SW"
+        assert periods[0].precipitation is None
+        assert periods[1].detailed_forecast is None
+        assert isinstance(periods[0], ForecastPeriod)
+
+    def test_empty_response(self):
+        """Test that a response without periods yields no records."""
+        assert forecast_periods({}) == []
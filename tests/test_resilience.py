@@ -0,0 +1,98 @@
+"""
+Tests for the retry policy and circuit breaker.
+"""
+
+from unittest.mock import patch
+from weather_mcp.resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy:
+    """Test cases for backoff delays."""
+
+    def test_exponential_backoff_with_full_jitter(self):
+        """Test that delays are drawn up to a doubling ceiling."""
+        policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=3.0)
+
+        with patch("weather_mcp.resilience.random.uniform") as uniform:
+            uniform.side_effect = lambda low, high: high
+            assert policy.delay(1) == 1.0
+            assert policy.delay(2) == 2.0
+            assert policy.delay(3) == 3.0
+
+    def test_stops_after_max_attempts(self):
+        """Test that no delay is offered once attempts are exhausted."""
+        policy = RetryPolicy(max_attempts=2)
+
+        assert policy.delay(1) is not None
+        assert policy.delay(2) is None
+
+    def test_retry_after_is_honored(self):
+        """Test that the server's Retry-After replaces the backoff."""
+        policy = RetryPolicy(max_attempts=3, max_delay=10.0)
+
+        assert policy.delay(1, retry_after=4.0) == 4.0
+        assert policy.delay(1, retry_after=60.0) is None
+
+    def test_parse_retry_after(self):
+        """Test Retry-After in seconds and as an HTTP date."""
+        assert parse_retry_after("7", 0) == 7.0
+        assert parse_retry_after(None, 0) is None
+        assert parse_retry_after("soon", 0) is None
+
+        now = 1_792_567_680.0  # Wed, 21 Oct 2026 07:28:00 GMT
+        assert parse_retry_after("Wed, 21 Oct 2026 07:28:30 GMT", now) == 30.0
+
+
+class TestCircuitBreaker:
+    """Test cases for the per-host circuit breaker."""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+        breaker.record_failure("HTTP 503")
+        assert breaker.allow()
+        breaker.record_failure("HTTP 503")
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.last_error == "HTTP 503"
+
+    def test_success_resets_failures(self):
+        """Test that a success clears the failure count."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure("timeout")
+        breaker.record_success()
+        breaker.record_failure("timeout")
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self, clock):
+        """Test that one probe is let through after the cool-off."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure("timeout")
+
+        assert breaker.retry_in() == 30
+        clock.now += 30
+
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self, clock):
+        """Test that a failing probe opens the breaker again."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+        for _ in range(3):
+            breaker.record_failure("HTTP 502")
+        clock.now += 10
+
+        assert breaker.allow()
+        breaker.record_failure("HTTP 502")
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
@@ -2,9 +2,26 @@
 Tests for the Weather MCP server.
 """
 
+import os
 import pytest
-from unittest.mock import AsyncMock, patch
-from weather_mcp.server import mcp, _mcp_get_alerts_tool_impl, get_forecast_tool
+from unittest.mock import AsyncMock, MagicMock, patch
+from weather_mcp.server import (
+    mcp,
+    http_app,
+    main,
+    parse_args,
+    _mcp_get_alerts_tool_impl,
+    get_alerts_batch_tool,
+    get_alerts_for_point_tool,
+    get_forecast_batch_tool,
+    get_gridpoint_timeseries_tool,
+    get_alert_changes_tool,
+    get_conditions_tool,
+    get_current_observations_tool,
+    get_forecast_tool,
+    metrics_route,
+    ready_route,
+)
 
 
 class TestWeatherMCPServer:
@@ -30,6 +47,103 @@ class TestWeatherMCPServer:
             mock_tool.assert_called_once_with("CA")
             assert result == mock_result
 
+    @pytest.mark.asyncio
+    async def test_get_alerts_tool_passes_filters(self):
+        """Test that only the filters given are passed to get_alerts."""
+        with patch(
+            "weather_mcp.server.get_alerts_tool", new_callable=AsyncMock
+        ) as mock_tool:
+            await _mcp_get_alerts_tool_impl("CA", severity="Severe", urgency=None)
+
+            mock_tool.assert_called_once_with("CA", severity="Severe")
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_batch_tool_impl(self):
+        """Test that the batch tool forwards the state list."""
+        with patch(
+            "weather_mcp.server.get_alerts_batch", new_callable=AsyncMock
+        ) as mock_batch:
+            mock_batch.return_value = "batch"
+
+            assert await get_alerts_batch_tool(["CA", "NV"]) == "batch"
+            mock_batch.assert_called_once_with(["CA", "NV"])
+
+    @pytest.mark.asyncio
+    async def test_get_forecast_batch_tool_streams_progress(self):
+        """Test that each grid result is reported as progress."""
+        from weather_mcp.tools import ForecastBatchItem
+
+        ctx = MagicMock()
+        ctx.report_progress = AsyncMock()
+
+        async def fake_batch(points, on_result):
+            await on_result(ForecastBatchItem((0, 1), "\nToday: sunny"))
+            await on_result(ForecastBatchItem((2,), "Unable to fetch"))
+            return "done"
+
+        with patch("weather_mcp.server.get_forecast_batch", side_effect=fake_batch):
+            result = await get_forecast_batch_tool(
+                [(34.05, -118.24), (34.06, -118.24), (40.71, -74.0)], ctx
+            )
+
+        assert result == "done"
+        progress = [call.args for call in ctx.report_progress.await_args_list]
+        assert [args[:2] for args in progress] == [(2, 3), (3, 3)]
+        assert progress[0][2].startswith("Location 34.05,-118.24:\nToday")
+        assert progress[1][2] == "Location 40.71,-74: Unable to fetch"
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_for_point_tool_impl(self):
+        """Test that the point tool forwards its coordinates."""
+        with patch(
+            "weather_mcp.server.get_alerts_for_point", new_callable=AsyncMock
+        ) as mock_point:
+            mock_point.return_value = "alerts"
+
+            assert await get_alerts_for_point_tool(34.05, -118.24) == "alerts"
+            mock_point.assert_called_once_with(34.05, -118.24)
+
+    @pytest.mark.asyncio
+    async def test_get_gridpoint_timeseries_tool_impl(self):
+        """Test that the time series tool forwards its options."""
+        with patch(
+            "weather_mcp.server.get_gridpoint_timeseries", new_callable=AsyncMock
+        ) as mock_series:
+            mock_series.return_value = "table"
+
+            result = await get_gridpoint_timeseries_tool(
+                [(34.05, -118.24)], hours=48, step=3, units="si"
+            )
+
+            assert result == "table"
+            mock_series.assert_called_once_with([(34.05, -118.24)], 48, 3, "si", None)
+
+    @pytest.mark.asyncio
+    async def test_get_conditions_tool_impl(self):
+        """Test the get_conditions MCP tool implementation."""
+        with patch(
+            "weather_mcp.server.get_conditions", new_callable=AsyncMock
+        ) as mock_conditions:
+            mock_conditions.return_value = "conditions"
+
+            result = await get_conditions_tool(34.0522, -118.2437)
+
+            assert result == "conditions"
+            mock_conditions.assert_called_once_with(34.0522, -118.2437)
+
+    @pytest.mark.asyncio
+    async def test_get_current_observations_tool_impl(self):
+        """Test the get_current_observations MCP tool implementation."""
+        with patch(
+            "weather_mcp.server.get_current_observations", new_callable=AsyncMock
+        ) as mock_observations:
+            mock_observations.return_value = "observation"
+
+            result = await get_current_observations_tool(34.0522, -118.2437)
+
+            assert result == "observation"
+            mock_observations.assert_called_once_with(34.0522, -118.2437)
+
     @pytest.mark.asyncio
     async def test_get_forecast_tool_impl(self):
         """Test the get_forecast MCP tool implementation."""
@@ -108,6 +222,20 @@ class TestWeatherMCPServer:
         # Test that the tool functions are callable
         assert callable(_mcp_get_alerts_tool_impl)
         assert callable(get_forecast_tool)
+        assert callable(get_alert_changes_tool)
+
+    @pytest.mark.asyncio
+    async def test_get_alert_changes_tool_impl(self):
+        """Test that the change feed tool passes the cursor through."""
+        with patch(
+            "weather_mcp.server.get_alert_changes", new_callable=AsyncMock
+        ) as mock_changes:
+            mock_changes.return_value = "Cursor: abc"
+
+            result = await get_alert_changes_tool("CA", "xyz")
+
+            assert result == "Cursor: abc"
+            mock_changes.assert_called_once_with("CA", "xyz")
 
     def test_main_block_logic(self):
         """Test the main block execution logic."""
@@ -165,3 +293,386 @@ class TestWeatherMCPServer:
         if transport == "sse":
             weather_mcp.server.mcp.run(transport="sse")
             mock_run.assert_called_with(transport="sse")
+
+    @pytest.mark.asyncio
+    async def test_server_lifespan_owns_http_client(self):
+        """Test that the server lifespan opens and closes the shared client."""
+        from weather_mcp import nws_api
+        from weather_mcp.server import server_lifespan
+
+        async with server_lifespan(mcp):
+            client = nws_api.get_http_client()
+            assert not client.is_closed
+        assert client.is_closed
+        assert nws_api._client is None
+
+    @pytest.mark.asyncio
+    async def test_metrics_route(self):
+        """Test that the metrics route returns the NWS client counters."""
+        import json
+
+        response = await metrics_route(MagicMock())
+
+        body = json.loads(response.body)
+        assert set(body) == {
+            "requests",
+            "cache",
+            "persistent_cache",
+            "rate_limiter",
+            "circuit_breakers",
+            "subscriptions",
+            "render_cache",
+        }
+        assert body["rate_limiter"]["interactive"]["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_ready_route_waits_for_warmup(self):
+        """Test that readiness is reported only after the warm-up finishes."""
+        import json
+        from weather_mcp.warmup import warmup
+
+        response = await ready_route(MagicMock())
+        assert response.status_code == 503
+
+        await warmup.run()
+        response = await ready_route(MagicMock())
+
+        assert response.status_code == 200
+        body = json.loads(response.body)
+        assert body["ready"] and body["complete"]
+
+    @pytest.mark.asyncio
+    async def test_alert_subscription_pushes_resource_updates(self):
+        """Test that a subscribed session is notified when alerts change."""
+        import asyncio
+        import mcp.types as types
+        from mcp.shared.memory import create_connected_server_and_client_session
+        from pydantic import AnyUrl
+        from weather_mcp.subscriptions import alert_subscriptions
+
+        updates = []
+
+        async def handler(message):
+            if isinstance(message, types.ServerNotification):
+                updates.append(message.root)
+
+        alert_subscriptions.interval = 0.01
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = {"features": []}
+            async with create_connected_server_and_client_session(
+                mcp._mcp_server, message_handler=handler
+            ) as client:
+                capabilities = client.get_server_capabilities()
+                assert capabilities.resources.subscribe
+
+                await client.subscribe_resource(AnyUrl("alerts://CA"))
+                await asyncio.sleep(0.05)
+                mock_fetch.return_value = {
+                    "features": [{"id": "a", "properties": {"id": "a"}}]
+                }
+                for _ in range(100):
+                    if updates:
+                        break
+                    await asyncio.sleep(0.01)
+
+        assert isinstance(updates[0], types.ResourceUpdatedNotification)
+        assert str(updates[0].params.uri) == "alerts://CA"
+
+    @pytest.mark.asyncio
+    async def test_session_end_removes_alert_subscriptions(self):
+        """Test that a finished session stops polling for its states."""
+        from mcp.shared.memory import create_connected_server_and_client_session
+        from pydantic import AnyUrl
+        from weather_mcp.subscriptions import alert_subscriptions
+
+        with patch("weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock):
+            # Stands in for the HTTP app's lifespan, which outlives sessions.
+            async with alert_subscriptions.running():
+                async with create_connected_server_and_client_session(
+                    mcp._mcp_server
+                ) as client:
+                    await client.subscribe_resource(AnyUrl("alerts://CA"))
+                    await client.subscribe_resource(AnyUrl("alerts://TX"))
+                    assert alert_subscriptions.stats().pollers == 2
+
+                assert alert_subscriptions.stats().subscribers == 0
+                assert alert_subscriptions.stats().pollers == 0
+
+    @pytest.mark.asyncio
+    async def test_stateless_server_refuses_subscriptions(self, fresh_http_app):
+        """Test that subscriptions are neither advertised nor accepted."""
+        from mcp.shared.exceptions import McpError
+        from mcp.shared.memory import create_connected_server_and_client_session
+        from pydantic import AnyUrl
+        from weather_mcp.subscriptions import alert_subscriptions
+
+        mcp.settings.stateless_http = True
+        async with create_connected_server_and_client_session(
+            mcp._mcp_server
+        ) as client:
+            assert not client.get_server_capabilities().resources.subscribe
+            with pytest.raises(McpError):
+                await client.subscribe_resource(AnyUrl("alerts://CA"))
+
+        assert alert_subscriptions.stats().pollers == 0
+
+
+@pytest.fixture
+def fresh_http_app():
+    """Let each test build its own streamable HTTP session manager."""
+    stateless = mcp.settings.stateless_http
+    json_response = mcp.settings.json_response
+    mcp._session_manager = None
+    yield
+    mcp._session_manager = None
+    mcp.settings.stateless_http = stateless
+    mcp.settings.json_response = json_response
+
+
+class TestCommandLine:
+    """Test cases for transport and worker selection."""
+
+    def test_defaults_from_environment(self, monkeypatch):
+        """Test that options fall back to WEATHER_MCP_* variables."""
+        monkeypatch.setenv("WEATHER_MCP_TRANSPORT", "streamable-http")
+        monkeypatch.setenv("WEATHER_MCP_WORKERS", "3")
+
+        args = parse_args([])
+
+        assert args.transport == "streamable-http"
+        assert args.workers == 3
+        assert parse_args(["--transport", "stdio", "--workers", "1"]).workers == 1
+
+    def test_default_transport_is_sse(self, monkeypatch):
+        """Test that the previous hard-coded transport stays the default."""
+        monkeypatch.delenv("WEATHER_MCP_TRANSPORT", raising=False)
+        monkeypatch.delenv("WEATHER_MCP_WORKERS", raising=False)
+
+        args = parse_args([])
+
+        assert (args.transport, args.workers) == ("sse", 1)
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--transport", "sse", "--workers", "2"],
+            ["--transport", "stdio", "--workers", "2"],
+            ["--transport", "streamable-http", "--workers", "0"],
+            ["--transport", "websocket"],
+        ],
+    )
+    def test_rejected_combinations(self, argv):
+        """Test that session-bound transports cannot run several workers."""
+        with pytest.raises(SystemExit):
+            parse_args(argv)
+
+    def test_multi_worker_shares_disk_cache(self):
+        """Test that workers are started from the factory with a shared cache."""
+        with (
+            patch.dict(os.environ),
+            patch("uvicorn.run") as mock_run,
+        ):
+            os.environ.pop("WEATHER_MCP_DISK_CACHE", None)
+
+            main(["--transport", "streamable-http", "--workers", "4", "--port", "9100"])
+
+            assert os.environ["WEATHER_MCP_DISK_CACHE"].endswith(
+                "weather-mcp-9100.sqlite"
+            )
+            assert os.environ["WEATHER_MCP_TRANSPORT"] == "streamable-http"
+            assert os.environ["WEATHER_MCP_WORKERS"] == "4"
+
+        mock_run.assert_called_once()
+        args, kwargs = mock_run.call_args
+        assert args == ("weather_mcp.server:worker_app",)
+        assert kwargs["factory"] is True
+        assert kwargs["workers"] == 4
+        assert kwargs["port"] == 9100
+
+    def test_configured_disk_cache_is_kept(self):
+        """Test that an explicit WEATHER_MCP_DISK_CACHE is not replaced."""
+        with (
+            patch.dict(os.environ, {"WEATHER_MCP_DISK_CACHE": "/srv/cache.db"}),
+            patch("uvicorn.run"),
+        ):
+            main(["--transport", "streamable-http", "--workers", "2"])
+
+            assert os.environ["WEATHER_MCP_DISK_CACHE"] == "/srv/cache.db"
+
+    def test_worker_app_is_stateless(self, fresh_http_app):
+        """Test that worker processes run the transport without sessions."""
+        from weather_mcp.server import worker_app
+
+        with patch.dict(os.environ, {"WEATHER_MCP_TRANSPORT": "streamable-http"}):
+            worker_app()
+
+        assert mcp.settings.stateless_http
+        assert mcp._session_manager.stateless
+
+    def test_workers_split_the_rate_limit(self, fresh_http_app):
+        """Test that N workers together stay within the configured rate."""
+        from weather_mcp import nws_api
+        from weather_mcp.server import worker_app
+
+        env = {
+            "WEATHER_MCP_TRANSPORT": "streamable-http",
+            "WEATHER_MCP_WORKERS": "4",
+            "WEATHER_MCP_RATE_LIMIT": "10",
+            "WEATHER_MCP_RATE_BURST": "10",
+        }
+        with patch.dict(os.environ, env):
+            worker_app()
+
+        assert nws_api.rate_limiter.rate == 2.5
+        assert nws_api.rate_limiter.burst == 2
+
+    def test_http_app_holds_shared_client(self, fresh_http_app):
+        """Test that the HTTP app keeps the pooled client for its lifetime."""
+        from starlette.testclient import TestClient
+        from weather_mcp import nws_api
+
+        with TestClient(http_app("streamable-http")) as client:
+            assert nws_api._client_users == 1
+            assert client.get("/metrics").status_code == 200
+
+        assert nws_api._client_users == 0
+
+
+def large_alert_feed(count=40):
+    return {
+        "features": [
+            {
+                "id": f"urn:alert:{i}",
+                "properties": {
+                    "id": f"urn:alert:{i}",
+                    "event": "Winter Storm Warning",
+                    "areaDesc": f"County {i}",
+                    "severity": "Severe",
+                    "sent": "2025-01-01T00:00:00-08:00",
+                    "description": "* WHAT...Heavy snow expected. " * 20,
+                    "instruction": "Travel could be very difficult. " * 5,
+                },
+            }
+            for i in range(count)
+        ]
+    }
+
+
+class TestStreamableHTTP:
+    """Test cases for the stateless streamable HTTP transport."""
+
+    def call_get_alerts(self, client, **headers):
+        return client.post(
+            "/mcp",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/call",
+                "params": {"name": "get_alerts", "arguments": {"state": "CA"}},
+            },
+            headers={
+                "Accept": "application/json, text/event-stream",
+                **headers,
+            },
+        )
+
+    def test_stateless_json_calls_are_compressed(self, fresh_http_app):
+        """Test that a large get_alerts result comes back gzip-encoded."""
+        from starlette.testclient import TestClient
+
+        mcp.settings.stateless_http = True
+        mcp.settings.json_response = True
+        with (
+            patch(
+                "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+            ) as mock_fetch,
+            TestClient(http_app("streamable-http")) as client,
+        ):
+            mock_fetch.return_value = large_alert_feed()
+
+            compressed = self.call_get_alerts(client)
+            plain = self.call_get_alerts(client, **{"Accept-Encoding": "identity"})
+
+        assert compressed.status_code == 200
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert compressed.json() == plain.json()
+        text = compressed.json()["result"]["content"][0]["text"]
+        assert text.count("Winter Storm Warning") == 40
+        assert int(compressed.headers["content-length"]) * 5 < len(plain.content)
+
+    def test_compression_can_be_disabled(self, fresh_http_app):
+        """Test that a zero threshold leaves responses unencoded."""
+        from starlette.testclient import TestClient
+
+        mcp.settings.stateless_http = True
+        mcp.settings.json_response = True
+        with (
+            patch(
+                "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+            ) as mock_fetch,
+            TestClient(http_app("streamable-http", compress_min_bytes=0)) as client,
+        ):
+            mock_fetch.return_value = large_alert_feed()
+
+            response = self.call_get_alerts(client)
+
+        assert "content-encoding" not in response.headers
+
+    def test_stateless_options(self, monkeypatch):
+        """Test the stateless and JSON response switches and their defaults."""
+        monkeypatch.setenv("WEATHER_MCP_STATELESS_HTTP", "true")
+        monkeypatch.delenv("WEATHER_MCP_JSON_RESPONSE", raising=False)
+        monkeypatch.delenv("WEATHER_MCP_WORKERS", raising=False)
+
+        args = parse_args(["--transport", "streamable-http", "--json-response"])
+        assert args.stateless and args.json_response
+        assert args.compress_min_bytes == 1024
+
+        args = parse_args(["--transport", "streamable-http", "--no-stateless"])
+        assert not args.stateless
+
+        args = parse_args(
+            ["--transport", "streamable-http", "--no-stateless", "--workers", "2"]
+        )
+        assert args.stateless
+
+    def test_compression_defaults_to_json_responses(self, monkeypatch):
+        """Test that compressible JSON replies are the default."""
+        monkeypatch.delenv("WEATHER_MCP_JSON_RESPONSE", raising=False)
+        monkeypatch.delenv("WEATHER_MCP_COMPRESS_MIN_BYTES", raising=False)
+
+        assert parse_args(["--transport", "streamable-http"]).json_response
+        assert not parse_args(["--compress-min-bytes", "0"]).json_response
+        assert not parse_args(["--no-json-response"]).json_response
+
+        monkeypatch.setenv("WEATHER_MCP_JSON_RESPONSE", "0")
+        assert not parse_args(["--transport", "streamable-http"]).json_response
+
+    def test_uncompressed_event_streams_warn(self, fresh_http_app, capsys):
+        """Test the warning when compression cannot apply to replies."""
+        with patch("uvicorn.run"):
+            main(["--transport", "streamable-http", "--no-json-response"])
+
+        assert "not compressed" in capsys.readouterr().err
+
+    def test_single_worker_applies_settings(self, fresh_http_app):
+        """Test that the options reach FastMCP before the app is built."""
+        with patch("uvicorn.run") as mock_run:
+            main(
+                [
+                    "--transport",
+                    "streamable-http",
+                    "--workers",
+                    "1",
+                    "--stateless",
+                    "--json-response",
+                ]
+            )
+
+        assert mcp.settings.stateless_http
+        assert mcp.settings.json_response
+        assert mcp._session_manager.stateless
+        assert mock_run.call_args.kwargs["port"] == mcp.settings.port
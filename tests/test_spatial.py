@@ -0,0 +1,120 @@
+"""
+Tests for the spatial index and point-in-polygon helpers.
+"""
+
+import numpy as np
+from weather_mcp.spatial import (
+    SpatialIndex,
+    points_in_polygons,
+    points_in_ring,
+    polygons_from_geometry,
+)
+
+
+def square(x0, y0, size):
+    return [
+        [x0, y0],
+        [x0 + size, y0],
+        [x0 + size, y0 + size],
+        [x0, y0 + size],
+        [x0, y0],
+    ]
+
+
+class TestPointInPolygon:
+    """Test cases for the vectorized point-in-polygon tests."""
+
+    def test_points_in_ring(self):
+        """Test many points against one ring at once."""
+        ring = np.array(square(0, 0, 2), dtype=float)
+        lons = np.array([1.0, 3.0, -0.5, 1.9])
+        lats = np.array([1.0, 1.0, 1.0, 0.1])
+
+        assert points_in_ring(ring, lons, lats).tolist() == [True, False, False, True]
+
+    def test_concave_ring(self):
+        """Test a U-shaped ring where the notch is outside."""
+        ring = np.array(
+            [[0, 0], [3, 0], [3, 3], [2, 3], [2, 1], [1, 1], [1, 3], [0, 3], [0, 0]],
+            dtype=float,
+        )
+        lons = np.array([0.5, 1.5, 2.5])
+        lats = np.array([2.0, 2.0, 2.0])
+
+        assert points_in_ring(ring, lons, lats).tolist() == [True, False, True]
+
+    def test_holes_are_excluded(self):
+        """Test that a point inside a hole is outside the polygon."""
+        polygons = polygons_from_geometry(
+            {"type": "Polygon", "coordinates": [square(0, 0, 4), square(1, 1, 2)]}
+        )
+
+        result = points_in_polygons(
+            polygons, np.array([0.5, 2.0]), np.array([0.5, 2.0])
+        )
+        assert result.tolist() == [True, False]
+
+
+class TestPolygonsFromGeometry:
+    """Test cases for converting GeoJSON geometries."""
+
+    def test_multipolygon_and_collection(self):
+        """Test that every polygon part is kept."""
+        multi = {
+            "type": "MultiPolygon",
+            "coordinates": [[square(0, 0, 1)], [square(5, 5, 1)]],
+        }
+        collection = {"type": "GeometryCollection", "geometries": [multi]}
+
+        assert len(polygons_from_geometry(multi)) == 2
+        assert len(polygons_from_geometry(collection)) == 2
+
+    def test_open_rings_are_closed(self):
+        """Test that a ring missing its closing vertex is closed."""
+        open_square = square(0, 0, 1)[:-1]
+        (polygon,) = polygons_from_geometry(
+            {"type": "Polygon", "coordinates": [open_square]}
+        )
+
+        assert len(polygon[0]) == 5
+        assert points_in_ring(polygon[0], np.array([0.5]), np.array([0.99]))[0]
+
+    def test_unsupported_geometries(self):
+        """Test that missing or non-area geometries give no polygons."""
+        assert polygons_from_geometry(None) == []
+        assert polygons_from_geometry({"type": "Point", "coordinates": [0, 0]}) == []
+
+
+class TestSpatialIndex:
+    """Test cases for the grid-bucketed bounding-box index."""
+
+    def test_query_returns_containing_shapes(self):
+        """Test lookups across overlapping and distant shapes."""
+        shapes = [
+            polygons_from_geometry(
+                {"type": "Polygon", "coordinates": [square(-120, 34, 3)]}
+            ),
+            polygons_from_geometry(
+                {"type": "Polygon", "coordinates": [square(-119, 35, 0.5)]}
+            ),
+            polygons_from_geometry(
+                {"type": "Polygon", "coordinates": [square(-75, 40, 1)]}
+            ),
+        ]
+        index = SpatialIndex(shapes)
+
+        assert index.query(-118.8, 35.2) == [0, 1]
+        assert index.query(-117.5, 36.5) == [0]
+        assert index.query(-74.5, 40.5) == [2]
+        assert index.query(-100.0, 40.0) == []
+
+    def test_bounding_box_is_not_enough(self):
+        """Test that points in the bounding box but outside the shape miss."""
+        triangle = {
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [4, 0], [0, 4], [0, 0]]],
+        }
+        index = SpatialIndex([polygons_from_geometry(triangle)])
+
+        assert index.query(1, 1) == [0]
+        assert index.query(3.5, 3.5) == []
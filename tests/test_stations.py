@@ -0,0 +1,238 @@
+"""
+Tests for the observation station catalog and nearest-station index.
+"""
+
+import asyncio
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+from weather_mcp.nws_api import NWSHTTPError
+from weather_mcp.ratelimit import Priority
+from weather_mcp.stations import (
+    STATIONS_URL,
+    KDTree,
+    StationCatalog,
+    StationIndex,
+    unit_vectors,
+)
+
+
+def station(identifier, latitude, longitude, name=None):
+    return {
+        "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+        "properties": {"stationIdentifier": identifier, "name": name},
+    }
+
+
+def page(features, next_url=None):
+    data = {"features": features}
+    if next_url:
+        data["pagination"] = {"next": next_url}
+    return data
+
+
+PAGE_2 = "https://api.weather.gov/stations?cursor=2"
+PAGE_3 = "https://api.weather.gov/stations?cursor=3"
+
+
+class TestKDTree:
+    """Test cases for the array-backed KD-tree."""
+
+    def test_matches_brute_force(self):
+        """Test that every query finds the same point as a linear scan."""
+        rng = np.random.default_rng(7)
+        points = unit_vectors(rng.uniform(-90, 90, 2000), rng.uniform(-180, 180, 2000))
+        targets = unit_vectors(rng.uniform(-90, 90, 200), rng.uniform(-180, 180, 200))
+        tree = KDTree(points)
+
+        for target in targets:
+            position, distance = tree.nearest(target)
+            expected = ((points - target) ** 2).sum(axis=1)
+            assert position == int(np.argmin(expected))
+            assert distance == pytest.approx(expected.min())
+
+    def test_empty_tree(self):
+        """Test that an empty tree reports no match."""
+        tree = KDTree(np.empty((0, 3)))
+
+        assert len(tree) == 0
+        assert tree.nearest(np.array([1.0, 0.0, 0.0]))[0] == -1
+
+
+class TestStationIndex:
+    """Test cases for nearest-station queries."""
+
+    def test_nearest_across_antimeridian(self):
+        """Test distances on the sphere rather than in raw degrees."""
+        index = StationIndex(
+            ["PADK", "PAFA"],
+            ["Adak", "Fairbanks"],
+            np.array([[51.88, -176.65], [64.80, -147.88]]),
+        )
+
+        nearest = index.nearest(51.9, 179.9)
+
+        assert nearest is not None
+        assert nearest.identifier == "PADK"
+        assert 200 < nearest.distance_km < 250
+        assert nearest.label.startswith("PADK (Adak), ")
+
+    def test_empty_index(self):
+        """Test that an empty index has no nearest station."""
+        index = StationIndex([], [], np.empty((0, 2)))
+
+        assert index.nearest(34.0, -118.0) is None
+
+
+class TestStationCatalog:
+    """Test cases for the incrementally refreshed station catalog."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_follows_pages(self):
+        """Test that pages load in background and an empty page ends a sweep."""
+        catalog = StationCatalog(enabled=True)
+        pages = {
+            STATIONS_URL: page([station("KLAX", 33.94, -118.41, "LAX")], PAGE_2),
+            PAGE_2: page([station("KSFO", 37.62, -122.37)], PAGE_3),
+            PAGE_3: page([]),
+        }
+
+        async def fetch(url, priority):
+            assert priority == Priority.BACKGROUND
+            return pages[url]
+
+        with patch("weather_mcp.stations.fetch_nws_json", side_effect=fetch):
+            await catalog.refresh()
+
+            index = catalog.current()
+            assert catalog.complete
+            assert index is not None and len(index) == 2
+            assert index.nearest(37.0, -122.0).identifier == "KSFO"
+
+            pages[PAGE_2] = page([], PAGE_3)
+            await catalog.refresh()
+
+        assert catalog.index.identifiers == ["KLAX"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_incremental(self):
+        """Test that an unchanged sweep keeps the index and changes are merged."""
+        catalog = StationCatalog(enabled=True)
+        pages = {
+            STATIONS_URL: page([station("KLAX", 33.94, -118.41)], PAGE_2),
+            PAGE_2: page([station("KSFO", 37.62, -122.37)]),
+        }
+
+        async def fetch(url, priority):
+            return pages[url]
+
+        with patch("weather_mcp.stations.fetch_nws_json", side_effect=fetch):
+            await catalog.refresh()
+            first = catalog.index
+            await catalog.refresh()
+            assert catalog.index is first
+
+            pages[PAGE_2] = page([station("KOAK", 37.72, -122.22)])
+            await catalog.refresh()
+
+        assert catalog.index is not first
+        assert sorted(catalog.index.identifiers) == ["KLAX", "KOAK"]
+
+    @pytest.mark.asyncio
+    async def test_failed_sweep_keeps_stations(self):
+        """Test that a sweep cut short by an error removes nothing."""
+        catalog = StationCatalog(enabled=True)
+        catalog.upsert([station("KLAX", 33.94, -118.41), station("KSFO", 37.6, -122.4)])
+        catalog.rebuild()
+
+        with patch(
+            "weather_mcp.stations.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = [
+                page([station("KLAX", 33.94, -118.41)], PAGE_2),
+                NWSHTTPError(503),
+            ]
+            with pytest.raises(NWSHTTPError):
+                await catalog.refresh()
+
+        assert len(catalog) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_sweep_rebuilds_changed_stations(self):
+        """Test that stations changed before an error reach the index."""
+        catalog = StationCatalog(enabled=True)
+        catalog.upsert([station("KLAX", 33.94, -118.41)])
+        catalog.rebuild()
+        catalog.complete = True
+
+        with patch(
+            "weather_mcp.stations.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = [
+                page(
+                    [station("KLAX", 33.94, -118.41), station("KSFO", 37.6, -122.4)],
+                    PAGE_2,
+                ),
+                NWSHTTPError(503),
+            ]
+            with pytest.raises(NWSHTTPError):
+                await catalog.refresh()
+
+        assert sorted(catalog.index.identifiers) == ["KLAX", "KSFO"]
+        assert not catalog._changed
+
+    def test_current_requires_enabled_and_stations(self):
+        """Test that a disabled or empty catalog is not served."""
+        catalog = StationCatalog(enabled=True)
+        assert catalog.current() is None
+
+        catalog.upsert([station("KLAX", 33.94, -118.41)])
+        catalog.rebuild()
+        assert catalog.current() is catalog.index
+
+        catalog.enabled = False
+        assert catalog.current() is None
+
+    @pytest.mark.asyncio
+    async def test_running_polls_until_last_holder_exits(self):
+        """Test the refresher lifecycle and that failures do not stop it."""
+        catalog = StationCatalog(enabled=True, interval=0.01)
+        with patch(
+            "weather_mcp.stations.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = [NWSHTTPError(503)] + [
+                page([station("KLAX", 33.94, -118.41)])
+            ] * 50
+
+            async with catalog.running():
+                await asyncio.sleep(0.05)
+                assert catalog._task is not None
+
+            assert catalog._task is None
+            assert catalog.current() is not None
+
+    @pytest.mark.asyncio
+    async def test_poller_survives_unexpected_errors(self):
+        """Test that an unexpected error is logged and polling continues."""
+        catalog = StationCatalog(enabled=True, interval=0.01)
+        with patch(
+            "weather_mcp.stations.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = [KeyError("features")] + [
+                page([station("KLAX", 33.94, -118.41)])
+            ] * 50
+
+            async with catalog.running():
+                await asyncio.sleep(0.05)
+
+        assert catalog.current() is not None
+
+    def test_from_env(self, monkeypatch):
+        """Test enabling the catalog from the environment."""
+        monkeypatch.setenv("WEATHER_MCP_STATION_CATALOG", "1")
+        monkeypatch.setenv("WEATHER_MCP_STATION_CATALOG_INTERVAL", "3600")
+
+        catalog = StationCatalog.from_env()
+
+        assert catalog.enabled
+        assert catalog.interval == 3600
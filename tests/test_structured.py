@@ -0,0 +1,146 @@
+"""
+Tests for compact JSON output with byte budgets and continuation tokens.
+"""
+
+import json
+from weather_mcp.records import AlertRecord, ForecastPeriod
+from weather_mcp.structured import (
+    alert_record,
+    decode_cursor,
+    dumps,
+    encode_cursor,
+    paginate,
+    period_record,
+    rank_alerts,
+    truncate,
+)
+
+
+def alert(severity, urgency="Expected", event="Alert", description="Details."):
+    return AlertRecord.from_feature(
+        {
+            "id": f"urn:{event}:{severity}:{urgency}",
+            "properties": {
+                "event": event,
+                "severity": severity,
+                "urgency": urgency,
+                "areaDesc": "Somewhere",
+                "description": description,
+            },
+        }
+    )
+
+
+class TestRecords:
+    """Test cases for compact alert and period records."""
+
+    def test_truncate_collapses_whitespace(self):
+        """Test that long text is cut at the limit with an ellipsis."""
+        assert truncate("a  b\n\nc", 10) == "a b c"
+        assert truncate("x" * 20, 10) == "x" * 9 + "…"
+        assert truncate(None, 10) is None
+
+    def test_alert_record_drops_missing_fields(self):
+        """Test that absent properties do not appear as nulls."""
+        record = alert_record(alert("Severe", description="y" * 1000))
+
+        assert record["severity"] == "Severe"
+        assert "instruction" not in record
+        assert len(record["description"]) == 280
+
+    def test_rank_alerts_by_severity_then_urgency(self):
+        """Test that the most severe and urgent alerts come first."""
+        features = [
+            alert("Minor"),
+            alert("Unknown"),
+            alert("Severe", "Future"),
+            alert("Extreme"),
+            alert("Severe", "Immediate"),
+        ]
+
+        ranked = rank_alerts(features)
+
+        assert [(f.severity, f.urgency) for f in ranked] == [
+            ("Extreme", "Expected"),
+            ("Severe", "Immediate"),
+            ("Severe", "Future"),
+            ("Minor", "Expected"),
+            ("Unknown", "Expected"),
+        ]
+
+    def test_period_record(self):
+        """Test that wind and precipitation are flattened."""
+        record = period_record(
+            ForecastPeriod.from_dict(
+                {
+                    "name": "Today",
+                    "temperature": 75,
+                    "temperatureUnit": "F",
+                    "windSpeed": "10 mph",
+                    "windDirection": "SW",
+                    "probabilityOfPrecipitation": {"value": 20},
+                    "shortForecast": "Sunny",
+                    "detailedForecast": "Sunny.",
+                }
+            )
+        )
+
+        assert record == {
+            "name": "Today",
+            "temperature": 75,
+            "unit": "F",
+            "wind": "10 mph SW",
+            "precipitation": 20,
+            "summary": "Sunny",
+            "detail": "Sunny.",
+        }
+
+
+class TestPaginate:
+    """Test cases for byte-budgeted pages."""
+
+    def items(self, count):
+        items = [dumps({"n": n, "description": "z" * 100}) for n in range(count)]
+        return items, [str(n) for n in range(count)]
+
+    def test_pages_fit_budget_and_cover_every_item(self):
+        """Test that following cursors returns each item once within budget."""
+        items, keys = self.items(20)
+        seen = []
+        cursor = None
+        while True:
+            page = paginate({}, "items", items, keys, max_bytes=500, cursor=cursor)
+            assert len(page.encode()) <= 500
+            data = json.loads(page)
+            seen.extend(item["n"] for item in data["items"])
+            cursor = data["next"]
+            if cursor is None:
+                break
+
+        assert seen == list(range(20))
+        assert data["total"] == 20
+
+    def test_oversized_item_loses_long_text(self):
+        """Test that a page always makes progress even on a tiny budget."""
+        items, keys = self.items(2)
+
+        data = json.loads(paginate({}, "items", items, keys, max_bytes=10))
+
+        assert data["items"] == [{"n": 0}]
+        assert data["next"] is not None
+
+    def test_stale_cursor_restarts(self):
+        """Test that a cursor for a different item list starts over."""
+        items, keys = self.items(5)
+        cursor = encode_cursor(3, ["other"])
+
+        data = json.loads(paginate({}, "items", items, keys, cursor=cursor))
+
+        assert data["restarted"] is True
+        assert data["items"][0]["n"] == 0
+
+    def test_decode_cursor_rejects_garbage(self):
+        """Test that unreadable cursors decode to None."""
+        assert decode_cursor("not-a-cursor", ["a"]) is None
+        assert decode_cursor(None, ["a"]) == 0
+        assert decode_cursor(encode_cursor(1, ["a"]), ["a"]) == 1
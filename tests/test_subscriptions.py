@@ -0,0 +1,181 @@
+"""
+Tests for shared-poller alert subscriptions.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from weather_mcp.alert_changes import alert_change_log
+from weather_mcp.nws_api import NWSHTTPError
+from weather_mcp.ratelimit import Priority
+from weather_mcp.subscriptions import AlertSubscriptions, Subscriber
+
+
+def make_alert(alert_id):
+    return {"id": alert_id, "properties": {"id": alert_id, "event": "Wind"}}
+
+
+class Recorder:
+    def __init__(self):
+        self.sent = []
+
+    async def __call__(self, uri):
+        self.sent.append(uri)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestSubscriber:
+    """Test cases for a subscriber's bounded notification queue."""
+
+    @pytest.mark.asyncio
+    async def test_pending_uri_is_coalesced(self):
+        """Test that a state already queued is not queued again."""
+        subscriber = Subscriber(Recorder(), max_pending=4)
+        subscriber.offer("CA")
+        subscriber.offer("CA")
+
+        assert subscriber._queue.qsize() == 1
+        assert subscriber.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        """Test that a slow consumer loses its oldest notification."""
+        subscriber = Subscriber(Recorder(), max_pending=2)
+        for state in ("CA", "TX", "NY"):
+            subscriber.offer(state)
+
+        assert subscriber.dropped == 1
+        assert [subscriber._queue.get_nowait() for _ in range(2)] == ["TX", "NY"]
+
+
+class TestAlertSubscriptions:
+    """Test cases for polling and fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_one_poll_fans_out_to_every_subscriber(self):
+        """Test that many subscribers to a state share one upstream poll."""
+        subscriptions = AlertSubscriptions(interval=3600)
+        recorders = [Recorder() for _ in range(50)]
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = {"features": [make_alert("a")]}
+            for number, recorder in enumerate(recorders):
+                subscriptions.subscribe(number, "ca", recorder)
+            await settle()
+
+            mock_fetch.return_value = {"features": [make_alert("b")]}
+            cursor = await subscriptions.poll_once("CA", alert_change_log.cursor("CA"))
+            await settle()
+
+            assert mock_fetch.await_count == 2
+            assert mock_fetch.await_args.args[1] == Priority.BACKGROUND
+            assert cursor
+            assert all(r.sent == ["alerts://CA"] for r in recorders)
+            assert subscriptions.stats().pollers == 1
+        subscriptions.close()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_alerts_do_not_notify(self):
+        """Test that a poll with no changes sends nothing."""
+        subscriptions = AlertSubscriptions(interval=3600)
+        recorder = Recorder()
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = {"features": [make_alert("a")]}
+            subscriptions.subscribe("s", "CA", recorder)
+            await settle()
+            await subscriptions.poll_once("CA", alert_change_log.cursor("CA"))
+            await settle()
+
+        assert recorder.sent == []
+        subscriptions.close()
+
+    @pytest.mark.asyncio
+    async def test_poll_failure_keeps_subscription(self):
+        """Test that an upstream error is logged and polling continues."""
+        subscriptions = AlertSubscriptions(interval=3600)
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = NWSHTTPError(503)
+            subscriptions.subscribe("s", "CA", Recorder())
+            await settle()
+
+        assert subscriptions.stats().pollers == 1
+        subscriptions.close()
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_keeps_polling(self):
+        """Test that a malformed payload does not end the state's poller."""
+        subscriptions = AlertSubscriptions(interval=0.01)
+        recorder = Recorder()
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = [
+                {"features": [make_alert("a")]},
+                ValueError("bad payload"),
+            ] + [{"features": [make_alert("b")]}] * 50
+            subscriptions.subscribe("s", "CA", recorder)
+            await asyncio.sleep(0.1)
+
+            assert not subscriptions._pollers["CA"].done()
+        assert recorder.sent == ["alerts://CA"]
+        subscriptions.close()
+
+    @pytest.mark.asyncio
+    async def test_last_unsubscribe_stops_poller(self):
+        """Test that the poller and sender stop with the last subscriber."""
+        subscriptions = AlertSubscriptions(interval=3600)
+        with patch("weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock):
+            subscriptions.subscribe("s1", "CA", Recorder())
+            subscriptions.subscribe("s2", "CA", Recorder())
+            poller = subscriptions._pollers["CA"]
+
+            subscriptions.unsubscribe("s1", "CA")
+            assert not poller.cancelled()
+            subscriptions.unsubscribe("s2", "CA")
+            await settle()
+
+        assert poller.cancelled()
+        assert subscriptions.stats().subscribers == 0
+        assert subscriptions.stats().pollers == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_send_removes_subscriber(self):
+        """Test that a closed session is dropped from every state."""
+        subscriptions = AlertSubscriptions(interval=3600)
+
+        async def broken(uri):
+            raise RuntimeError("stream closed")
+
+        with patch("weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock):
+            subscriptions.subscribe("s", "CA", broken)
+            subscriptions.subscribe("s", "TX", broken)
+            subscriptions.publish("CA")
+            await settle()
+
+        assert subscriptions.stats().subscribers == 0
+        assert subscriptions.stats().pollers == 0
+
+    @pytest.mark.asyncio
+    async def test_running_closes_after_last_holder(self):
+        """Test that pollers are stopped once the last lifespan exits."""
+        subscriptions = AlertSubscriptions(interval=3600)
+        with patch("weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock):
+            async with subscriptions.running():
+                async with subscriptions.running():
+                    subscriptions.subscribe("s", "CA", Recorder())
+                    poller = subscriptions._pollers["CA"]
+                assert "s" in subscriptions
+                assert not poller.done()
+
+        assert poller.cancelled()
+        assert "s" not in subscriptions
+        assert subscriptions.stats().pollers == 0
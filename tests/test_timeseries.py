@@ -0,0 +1,164 @@
+"""
+Tests for expanding raw gridpoint data into hourly arrays.
+"""
+
+import numpy as np
+import pytest
+from datetime import datetime, timezone
+from weather_mcp.timeseries import (
+    convert,
+    expand_hourly,
+    gridpoint_series,
+    parse_valid_time,
+    resample,
+)
+
+START = datetime(2025, 1, 1, 6, tzinfo=timezone.utc).timestamp()
+
+
+def value(valid_time, amount):
+    return {"validTime": valid_time, "value": amount}
+
+
+class TestParseValidTime:
+    """Test cases for ISO-8601 interval parsing."""
+
+    @pytest.mark.parametrize(
+        "duration, hours",
+        [("PT1H", 1), ("PT3H", 3), ("P1D", 24), ("P1DT6H", 30), ("PT30M", 1)],
+    )
+    def test_durations(self, duration, hours):
+        """Test common NWS interval lengths."""
+        begin, length = parse_valid_time(f"2025-01-01T06:00:00+00:00/{duration}")
+
+        assert begin == START
+        assert length == hours
+
+    def test_rejects_unknown_duration(self):
+        """Test that malformed intervals raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_valid_time("2025-01-01T06:00:00+00:00/1H")
+
+
+class TestExpandHourly:
+    """Test cases for the batched interval expansion."""
+
+    def test_intervals_fill_their_hours(self):
+        """Test that each interval's value covers every hour it spans."""
+        series = [
+            [
+                value("2025-01-01T06:00:00+00:00/PT2H", 10.0),
+                value("2025-01-01T08:00:00+00:00/PT1H", 12.0),
+            ],
+            [value("2025-01-01T07:00:00+00:00/PT3H", 5.0)],
+        ]
+
+        out = expand_hourly(series, START, 4)
+
+        np.testing.assert_array_equal(
+            out, [[10.0, 10.0, 12.0, np.nan], [np.nan, 5.0, 5.0, 5.0]]
+        )
+
+    def test_accumulated_values_are_spread(self):
+        """Test that totals are divided evenly over their interval."""
+        series = [[value("2025-01-01T06:00:00+00:00/PT6H", 6.0)]]
+
+        out = expand_hourly(series, START, 6, accumulated=True)
+
+        np.testing.assert_array_equal(out, [[1.0] * 6])
+
+    def test_clips_to_window_and_skips_nulls(self):
+        """Test intervals starting before or ending after the window."""
+        series = [
+            [
+                value("2025-01-01T04:00:00+00:00/PT3H", 1.0),
+                value("2025-01-01T07:00:00+00:00/PT1H", None),
+                value("2025-01-01T08:00:00+00:00/P1D", 2.0),
+            ]
+        ]
+
+        out = expand_hourly(series, START, 3)
+
+        np.testing.assert_array_equal(out, [[1.0, np.nan, 2.0]])
+
+    def test_no_values(self):
+        """Test that empty layers give all-NaN rows."""
+        assert np.isnan(expand_hourly([[], []], START, 3)).all()
+
+
+class TestResampleAndConvert:
+    """Test cases for resampling and unit conversion."""
+
+    def test_resample_aggregates(self):
+        """Test mean, max and sum buckets, dropping a partial bucket."""
+        hourly = np.array([[1.0, 3.0, 2.0, np.nan, np.nan, 7.0, 9.0]])
+
+        np.testing.assert_array_equal(resample(hourly, 3, "mean"), [[2.0, 7.0]])
+        np.testing.assert_array_equal(resample(hourly, 3, "max"), [[3.0, 7.0]])
+        np.testing.assert_array_equal(resample(hourly, 3, "sum"), [[6.0, 7.0]])
+
+    def test_resample_keeps_empty_buckets_nan(self):
+        """Test that a bucket without data is NaN rather than zero."""
+        hourly = np.array([[np.nan, np.nan, 1.0, 1.0]])
+
+        result = resample(hourly, 2, "sum")
+
+        assert np.isnan(result[0, 0])
+        assert result[0, 1] == 2.0
+
+    def test_convert(self):
+        """Test NWS units to US and SI units."""
+        celsius = np.array([0.0, 100.0])
+
+        fahrenheit, label = convert(celsius, "wmoUnit:degC", "us")
+        assert label == "°F"
+        np.testing.assert_allclose(fahrenheit, [32.0, 212.0])
+
+        inches, label = convert(np.array([25.4]), "wmoUnit:mm", "us")
+        assert label == "in"
+        np.testing.assert_allclose(inches, [1.0])
+
+        same, label = convert(celsius, "wmoUnit:degC", "si")
+        assert label == "°C"
+        np.testing.assert_array_equal(same, celsius)
+
+        unknown, label = convert(celsius, "wmoUnit:Pa", "us")
+        assert label == "Pa"
+
+
+class TestGridpointSeries:
+    """Test cases for building every layer for many gridpoints at once."""
+
+    def test_layers_for_many_gridpoints(self):
+        """Test that each layer becomes one (gridpoints, columns) array."""
+
+        def grid(temperature, qpf):
+            return {
+                "properties": {
+                    "temperature": {
+                        "uom": "wmoUnit:degC",
+                        "values": [
+                            value("2025-01-01T06:00:00+00:00/PT4H", temperature)
+                        ],
+                    },
+                    "quantitativePrecipitation": {
+                        "uom": "wmoUnit:mm",
+                        "values": [value("2025-01-01T06:00:00+00:00/PT4H", qpf)],
+                    },
+                }
+            }
+
+        series = gridpoint_series(
+            [grid(0.0, 25.4), grid(10.0, 0.0)],
+            ["temperature", "quantitativePrecipitation"],
+            START,
+            4,
+            step=2,
+        )
+
+        temperature, label = series["temperature"]
+        assert label == "°F"
+        np.testing.assert_allclose(temperature, [[32.0, 32.0], [50.0, 50.0]])
+        qpf, label = series["quantitativePrecipitation"]
+        assert label == "in"
+        np.testing.assert_allclose(qpf, [[0.5, 0.5], [0.0, 0.0]])
@@ -2,9 +2,23 @@
 Tests for weather tools functionality.
 """
 
+import httpx
+import json
 import pytest
 from unittest.mock import AsyncMock, patch
-from weather_mcp.tools import format_alert, get_alerts, get_forecast
+from weather_mcp.nws_api import NWSHTTPError, NWSUnavailableError
+from weather_mcp.ratelimit import Priority
+from weather_mcp.tools import (
+    format_alert,
+    get_alerts,
+    get_alerts_batch,
+    get_alerts_for_point,
+    get_conditions,
+    get_current_observations,
+    get_forecast,
+    get_forecast_batch,
+    get_gridpoint_timeseries,
+)
 
 
 class TestTools:
@@ -72,7 +86,7 @@ class TestTools:
     async def test_get_alerts_success_with_alerts(self, mock_nws_response):
         """Test successful alert retrieval with active alerts."""
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
             mock_request.return_value = mock_nws_response
 
@@ -80,7 +94,8 @@ class TestTools:
 
             # Verify the request was made with correct URL
             mock_request.assert_called_once_with(
-                "https://api.weather.gov/alerts/active/area/CA"
+                "https://api.weather.gov/alerts/active/area/CA",
+                Priority.INTERACTIVE,
             )
 
             # Verify the result contains both alerts separated by ---
@@ -93,7 +108,7 @@ class TestTools:
     async def test_get_alerts_no_alerts(self, mock_empty_nws_response):
         """Test alert retrieval when no alerts are active."""
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
             mock_request.return_value = mock_empty_nws_response
 
@@ -105,13 +120,13 @@ class TestTools:
     async def test_get_alerts_api_failure(self):
         """Test alert retrieval when API request fails."""
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
-            mock_request.return_value = None
+            mock_request.side_effect = NWSHTTPError(503)
 
             result = await get_alerts("CA")
 
-            assert result == "Unable to fetch alerts or no alerts found."
+            assert result == "Unable to fetch alerts: NWS API returned HTTP 503"
 
     @pytest.mark.asyncio
     async def test_get_alerts_malformed_response(self):
@@ -122,7 +137,7 @@ class TestTools:
         }
 
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
             mock_request.return_value = mock_data
 
@@ -136,7 +151,7 @@ class TestTools:
     ):
         """Test successful forecast retrieval."""
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
             # First call returns points data, second call returns forecast data
             mock_request.side_effect = [
@@ -149,7 +164,8 @@ class TestTools:
             # Verify both API calls were made
             assert mock_request.call_count == 2
             mock_request.assert_any_call(
-                "https://api.weather.gov/points/34.0522,-118.2437"
+                "https://api.weather.gov/points/34.0522,-118.2437",
+                Priority.INTERACTIVE,
             )
             mock_request.assert_any_call(
                 "https://api.weather.gov/gridpoints/LOX/123,456/forecast"
@@ -161,30 +177,168 @@ class TestTools:
             assert "75°F" in result
             assert "Sunny with clear skies" in result
 
+    @pytest.mark.asyncio
+    async def test_get_forecast_json(
+        self, mock_forecast_points_response, mock_forecast_response
+    ):
+        """Test the compact JSON forecast output."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.side_effect = [
+                mock_forecast_points_response,
+                mock_forecast_response,
+            ]
+
+            result = await get_forecast(34.0522, -118.2437, output="json")
+
+        data = json.loads(result)
+        assert data["total"] == 2
+        assert data["next"] is None
+        assert data["periods"][0] == {
+            "name": "Today",
+            "temperature": 75,
+            "unit": "F",
+            "wind": "10 mph SW",
+            "detail": "Sunny with clear skies.",
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_json_ranks_by_severity(self, mock_nws_response):
+        """Test that JSON alerts are ranked most severe first."""
+        mock_nws_response["features"].reverse()
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = mock_nws_response
+
+            result = await get_alerts("CA", output="json")
+
+        data = json.loads(result)
+        assert data["state"] == "CA"
+        assert [alert["severity"] for alert in data["alerts"]] == ["Severe", "Minor"]
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_json_is_smaller_than_text(self):
+        """Test that summarized JSON is much smaller for full-length alerts."""
+        paragraph = "* WHAT...Heavy snow. Total accumulations of 8 to 14 inches. " * 20
+        features = [
+            {
+                "id": f"urn:alert:{n}",
+                "properties": {
+                    "event": "Winter Storm Warning",
+                    "severity": "Severe",
+                    "areaDesc": "Mono County",
+                    "description": paragraph,
+                    "instruction": "If you must travel, keep an extra flashlight. " * 5,
+                },
+            }
+            for n in range(3)
+        ]
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = {"features": features}
+            text = await get_alerts("CA")
+            result = await get_alerts("CA", output="json")
+
+        assert len(json.loads(result)["alerts"]) == 3
+        assert len(result.encode()) < len(text.encode()) / 2
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_json_pages_with_cursor(self):
+        """Test that a small budget splits alerts across cursor pages."""
+        features = [
+            {
+                "id": f"urn:alert:{n}",
+                "properties": {
+                    "event": "Flood Warning",
+                    "severity": "Moderate",
+                    "areaDesc": f"County {n}",
+                    "description": "Flooding. " * 40,
+                },
+            }
+            for n in range(6)
+        ]
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = {"features": features}
+            pages = [json.loads(await get_alerts("CA", output="json", max_bytes=800))]
+            while pages[-1]["next"]:
+                pages.append(
+                    json.loads(
+                        await get_alerts(
+                            "CA", output="json", max_bytes=800, cursor=pages[-1]["next"]
+                        )
+                    )
+                )
+
+        assert len(pages) > 1
+        assert [alert["id"] for page in pages for alert in page["alerts"]] == [
+            f"urn:alert:{n}" for n in range(6)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_json_error(self):
+        """Test that failures are reported as a JSON error object."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.side_effect = NWSHTTPError(503)
+
+            result = await get_alerts("CA", output="json")
+
+        assert json.loads(result) == {
+            "error": "Unable to fetch alerts: NWS API returned HTTP 503"
+        }
+
+    @pytest.mark.asyncio
+    async def test_unknown_output_rejected(self):
+        """Test that an unsupported output format is refused before fetching."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            assert await get_alerts("CA", output="xml") == (
+                'Output must be "text" or "json".'
+            )
+            assert await get_forecast(1.0, 2.0, output="xml") == (
+                'Output must be "text" or "json".'
+            )
+            mock_request.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_get_forecast_points_failure(self):
         """Test forecast retrieval when points API fails."""
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
-            mock_request.return_value = None
+            mock_request.side_effect = NWSUnavailableError("api.weather.gov is down")
 
             result = await get_forecast(34.0522, -118.2437)
 
-            assert result == "Unable to fetch forecast data for this location."
+            assert result == (
+                "Unable to fetch forecast data for this location: "
+                "api.weather.gov is down"
+            )
 
     @pytest.mark.asyncio
     async def test_get_forecast_forecast_failure(self, mock_forecast_points_response):
         """Test forecast retrieval when forecast API fails."""
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
             # First call succeeds, second call fails
-            mock_request.side_effect = [mock_forecast_points_response, None]
+            mock_request.side_effect = [
+                mock_forecast_points_response,
+                NWSHTTPError(500),
+            ]
 
             result = await get_forecast(34.0522, -118.2437)
 
-            assert result == "Unable to fetch detailed forecast."
+            assert result == (
+                "Unable to fetch detailed forecast: NWS API returned HTTP 500"
+            )
 
     @pytest.mark.asyncio
     async def test_get_alerts_different_states(self):
@@ -192,17 +346,724 @@ class TestTools:
         mock_data = {"features": []}
 
         with patch(
-            "weather_mcp.tools.make_nws_request", new_callable=AsyncMock
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
         ) as mock_request:
             mock_request.return_value = mock_data
 
             # Test different state codes
             await get_alerts("TX")
             mock_request.assert_called_with(
-                "https://api.weather.gov/alerts/active/area/TX"
+                "https://api.weather.gov/alerts/active/area/TX",
+                Priority.INTERACTIVE,
             )
 
             await get_alerts("NY")
             mock_request.assert_called_with(
-                "https://api.weather.gov/alerts/active/area/NY"
+                "https://api.weather.gov/alerts/active/area/NY",
+                Priority.INTERACTIVE,
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_forecast_reuses_gridpoint(
+        self, mock_forecast_points_response, mock_forecast_response
+    ):
+        """Test that a repeat location skips the /points lookup."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.side_effect = [
+                mock_forecast_points_response,
+                mock_forecast_response,
+                mock_forecast_response,
+            ]
+
+            await get_forecast(34.0522, -118.2437)
+            await get_forecast(34.05221, -118.24369)
+
+            urls = [call.args[0] for call in mock_request.call_args_list]
+            assert urls == [
+                "https://api.weather.gov/points/34.0522,-118.2437",
+                "https://api.weather.gov/gridpoints/LOX/123,456/forecast",
+                "https://api.weather.gov/gridpoints/LOX/123,456/forecast",
+            ]
+
+    @pytest.mark.asyncio
+    async def test_nearby_points_share_forecast_fetch(self, use_transport):
+        """Test that two locations in one grid cell fetch the forecast once."""
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            if request.url.path.startswith("/points/"):
+                return httpx.Response(
+                    200,
+                    json={
+                        "properties": {
+                            "gridId": "LOX",
+                            "gridX": 155,
+                            "gridY": 45,
+                            "forecast": (
+                                "https://api.weather.gov/gridpoints/LOX/155,45/forecast"
+                            ),
+                        }
+                    },
+                )
+            return httpx.Response(
+                200,
+                json={"properties": {"periods": []}},
+                headers={"Cache-Control": "max-age=600"},
+            )
+
+        use_transport(handler)
+
+        await get_forecast(34.0522, -118.2437)
+        await get_forecast(34.0601, -118.2401)
+
+        assert requests == [
+            "/points/34.0522,-118.2437",
+            "/gridpoints/LOX/155,45/forecast",
+            "/points/34.0601,-118.2401",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_served_from_snapshot(self, mock_nws_response):
+        """Test that snapshot mode answers without a per-state request."""
+        from weather_mcp.alerts import AlertIndex, alert_snapshot
+
+        features = mock_nws_response["features"]
+        features[0]["properties"]["geocode"] = {"UGC": ["CAZ041"]}
+        features[1]["properties"]["geocode"] = {"UGC": ["TXZ100"]}
+        alert_snapshot.enabled = True
+        alert_snapshot.index = AlertIndex(features, alert_snapshot.clock())
+
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            result = await get_alerts("ca")
+            empty = await get_alerts("NY")
+
+        mock_request.assert_not_called()
+        assert "Winter Storm Warning" in result
+        assert "Heat Advisory" not in result
+        assert empty == "No active alerts for this state."
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_filters_pushed_to_nws(self, mock_nws_response):
+        """Test that filters become query parameters on /alerts/active."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = mock_nws_response
+
+            await get_alerts("ca", severity="severe,extreme", message_type="alert")
+
+            mock_request.assert_called_once_with(
+                "https://api.weather.gov/alerts/active"
+                "?area=CA&severity=Extreme%2CSevere&message_type=alert",
+                Priority.INTERACTIVE,
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_status_filter_is_lowercase(self, mock_nws_response):
+        """Test that status is sent in the lowercase spelling NWS accepts."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = mock_nws_response
+
+            await get_alerts("ca", status="Actual,EXERCISE")
+
+            mock_request.assert_called_once_with(
+                "https://api.weather.gov/alerts/active"
+                "?area=CA&status=actual%2Cexercise",
+                Priority.INTERACTIVE,
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_filters_are_part_of_cache_key(self, use_transport):
+        """Test that each distinct filter set is cached separately."""
+        requests = []
+
+        def handler(request):
+            requests.append(str(request.url.query, "ascii"))
+            return httpx.Response(
+                200, json={"features": []}, headers={"Cache-Control": "max-age=60"}
+            )
+
+        use_transport(handler)
+
+        await get_alerts("CA", severity="Severe")
+        await get_alerts("CA", severity="severe")
+        await get_alerts("CA", severity="Minor")
+        result = await get_alerts("CA", severity="Minor")
+
+        assert requests == ["area=CA&severity=Severe", "area=CA&severity=Minor"]
+        assert result == "No active alerts for this state match the filters."
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_filters_snapshot(self, mock_nws_response):
+        """Test that filters apply to snapshot-served alerts."""
+        from weather_mcp.alerts import AlertIndex, alert_snapshot
+
+        features = mock_nws_response["features"]
+        for feature in features:
+            feature["properties"]["geocode"] = {"UGC": ["CAZ041"]}
+        alert_snapshot.enabled = True
+        alert_snapshot.index = AlertIndex(features, alert_snapshot.clock())
+
+        result = await get_alerts("CA", severity="Minor")
+
+        assert "Heat Advisory" in result
+        assert "Winter Storm Warning" not in result
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_batch_dedups_shared_alerts(self):
+        """Test that an alert spanning states is listed once with both states."""
+        shared = {
+            "id": "urn:shared",
+            "properties": {"event": "Heat Advisory", "areaDesc": "Border"},
+        }
+        only_ca = {
+            "id": "urn:ca",
+            "properties": {"event": "Winter Storm Warning", "areaDesc": "Sierra"},
+        }
+        responses = {
+            "CA": {"features": [only_ca, shared]},
+            "NV": {"features": [shared]},
+            "OR": {"features": []},
+        }
+
+        async def fetch(url, priority):
+            return responses[url.rsplit("/", 1)[1]]
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch):
+            result = await get_alerts_batch(["ca", "NV", "OR", "CA"])
+
+        assert result.count("Heat Advisory") == 1
+        assert "States: CA, NV" in result
+        assert "States: CA\n" in result
+        assert result.endswith("No active alerts: OR")
+
+    @pytest.mark.asyncio
+    async def test_rendered_alerts_reused_until_reissued(self):
+        """Test that an alert is formatted once across queries until updated."""
+        alert = {
+            "id": "urn:shared",
+            "properties": {
+                "event": "Heat Advisory",
+                "areaDesc": "Border",
+                "sent": "2025-07-01T10:00:00-07:00",
+            },
+        }
+        responses = {"CA": {"features": [alert]}, "NV": {"features": [alert]}}
+
+        async def fetch(url, priority):
+            return responses[url.rsplit("/", 1)[1]]
+
+        with (
+            patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch),
+            patch("weather_mcp.tools.format_alert", wraps=format_alert) as formatter,
+        ):
+            await get_alerts("CA")
+            await get_alerts("NV")
+            await get_alerts_batch(["CA", "NV"])
+            assert formatter.call_count == 1
+
+            updated = {
+                "id": "urn:shared",
+                "properties": {
+                    "event": "Excessive Heat Warning",
+                    "areaDesc": "Border",
+                    "sent": "2025-07-01T14:00:00-07:00",
+                },
+            }
+            responses["CA"] = {"features": [updated]}
+            result = await get_alerts("CA")
+
+        assert formatter.call_count == 2
+        assert "Excessive Heat Warning" in result
+
+    @pytest.mark.asyncio
+    async def test_rendered_forecast_reused_for_same_update(
+        self, mock_forecast_points_response, mock_forecast_response
+    ):
+        """Test that forecast text is formatted once per forecast update."""
+        from weather_mcp.tools import format_forecast
+
+        mock_forecast_response["properties"]["updateTime"] = "2025-07-01T10:00:00"
+
+        async def fetch(url, priority=None):
+            if "/points/" in url:
+                return mock_forecast_points_response
+            return mock_forecast_response
+
+        with (
+            patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch),
+            patch(
+                "weather_mcp.tools.format_forecast", wraps=format_forecast
+            ) as formatter,
+        ):
+            first = await get_forecast(34.0522, -118.2437)
+            second = await get_forecast(34.0523, -118.2437)
+
+        assert first == second
+        assert formatter.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_batch_reports_failures(self):
+        """Test that one failing state does not fail the batch."""
+
+        async def fetch(url, priority):
+            if url.endswith("/TX"):
+                raise NWSHTTPError(503)
+            return {"features": [{"id": "a", "properties": {"event": "Fog"}}]}
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch):
+            result = await get_alerts_batch(["CA", "TX"])
+
+        assert "Fog" in result
+        assert "Unable to fetch alerts: TX (NWS API returned HTTP 503)" in result
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_batch_bounds_concurrency(self, monkeypatch):
+        """Test that no more than batch_concurrency states are fetched at once."""
+        import asyncio
+        from weather_mcp import tools
+
+        monkeypatch.setattr(tools, "batch_concurrency", 2)
+        active = 0
+        peak = 0
+
+        async def fetch(url, priority):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"features": []}
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch):
+            result = await get_alerts_batch(["CA", "NV", "OR", "WA", "AZ"])
+
+        assert peak == 2
+        assert result == "No active alerts: CA, NV, OR, WA, AZ"
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_batch_empty(self):
+        """Test the message for an empty state list."""
+        assert await get_alerts_batch([" ", ""]) == "No states given."
+
+    @pytest.mark.asyncio
+    async def test_get_forecast_batch_fetches_each_grid_once(self, use_transport):
+        """Test that points sharing a grid cell share one forecast request."""
+        requests = []
+        grids = {
+            "/points/34.0522,-118.2437": ("LOX", 155, 45),
+            "/points/34.0601,-118.2401": ("LOX", 155, 45),
+            "/points/40.7128,-74.006": ("OKX", 33, 35),
+        }
+
+        def handler(request):
+            requests.append(request.url.path)
+            if request.url.path in grids:
+                office, x, y = grids[request.url.path]
+                return httpx.Response(
+                    200,
+                    json={
+                        "properties": {
+                            "gridId": office,
+                            "gridX": x,
+                            "gridY": y,
+                            "forecast": (
+                                f"https://api.weather.gov/gridpoints/"
+                                f"{office}/{x},{y}/forecast"
+                            ),
+                        }
+                    },
+                )
+            if request.url.path.startswith("/points/"):
+                return httpx.Response(404)
+            return httpx.Response(
+                200,
+                json={
+                    "properties": {
+                        "periods": [
+                            {
+                                "name": request.url.path.split("/")[2],
+                                "temperature": 70,
+                                "temperatureUnit": "F",
+                                "windSpeed": "5 mph",
+                                "windDirection": "N",
+                                "detailedForecast": "Fine.",
+                            }
+                        ]
+                    }
+                },
             )
+
+        use_transport(handler)
+        streamed = []
+
+        async def on_result(item):
+            streamed.append(item.indices)
+
+        points = [
+            (34.0522, -118.2437),
+            (40.7128, -74.0060),
+            (34.0601, -118.2401),
+            (0.0, 0.0),
+        ]
+        result = await get_forecast_batch(points, on_result=on_result)
+
+        forecast_requests = [path for path in requests if "/forecast" in path]
+        assert sorted(forecast_requests) == [
+            "/gridpoints/LOX/155,45/forecast",
+            "/gridpoints/OKX/33,35/forecast",
+        ]
+        assert sorted(streamed) == [(0, 2), (1,), (3,)]
+        blocks = result.split("\n===\n")
+        assert blocks[0].startswith("Location 34.0522,-118.2437:")
+        assert "LOX:" in blocks[0] and "LOX:" in blocks[2]
+        assert "OKX:" in blocks[1]
+        assert blocks[3].startswith(
+            "Location 0,0: Unable to fetch forecast data for this location:"
+        )
+        assert "4 points from 2 grid forecasts" in blocks[4]
+        assert blocks[4].endswith("points/s)")
+
+    @pytest.mark.asyncio
+    async def test_get_forecast_batch_empty(self):
+        """Test the message for an empty point list."""
+        assert await get_forecast_batch([]) == "No points given."
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_for_point_from_snapshot(self):
+        """Test that point lookups are answered from the spatial index."""
+        from weather_mcp.alerts import AlertIndex, alert_snapshot
+
+        feature = {
+            "id": "a",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [[-119, 34], [-118, 34], [-118, 35], [-119, 35], [-119, 34]]
+                ],
+            },
+            "properties": {"event": "Flash Flood Warning", "areaDesc": "Ventura"},
+        }
+        alert_snapshot.enabled = True
+        alert_snapshot.index = AlertIndex([feature], alert_snapshot.clock())
+        alert_snapshot.index.build_spatial({})
+
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            inside = await get_alerts_for_point(34.5, -118.5)
+            outside = await get_alerts_for_point(36.0, -118.5)
+
+        mock_request.assert_not_called()
+        assert "Flash Flood Warning" in inside
+        assert outside == "No active alerts for this location."
+
+    @pytest.mark.asyncio
+    async def test_get_alerts_for_point_falls_back_to_point_query(
+        self, mock_nws_response
+    ):
+        """Test the upstream point query without a complete snapshot."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = mock_nws_response
+
+            result = await get_alerts_for_point(34.05223, -118.24368)
+
+        mock_request.assert_called_once_with(
+            "https://api.weather.gov/alerts/active?point=34.0522,-118.2437"
+        )
+        assert "Winter Storm Warning" in result
+
+    @pytest.mark.asyncio
+    async def test_get_gridpoint_timeseries(self, use_transport):
+        """Test hourly tables for points, fetching shared grid data once."""
+        import time
+        from datetime import datetime, timezone
+
+        start = int(time.time()) // 3600 * 3600
+        valid_from = datetime.fromtimestamp(start, timezone.utc).isoformat()
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            if request.url.path.startswith("/points/"):
+                return httpx.Response(
+                    200,
+                    json={
+                        "properties": {
+                            "gridId": "LOX",
+                            "gridX": 155,
+                            "gridY": 45,
+                            "forecast": "https://api.weather.gov/gridpoints/LOX/155,45/forecast",
+                            "forecastGridData": "https://api.weather.gov/gridpoints/LOX/155,45",
+                        }
+                    },
+                )
+            return httpx.Response(
+                200,
+                json={
+                    "properties": {
+                        "temperature": {
+                            "uom": "wmoUnit:degC",
+                            "values": [
+                                {"validTime": f"{valid_from}/PT2H", "value": 20.0}
+                            ],
+                        },
+                        "quantitativePrecipitation": {
+                            "uom": "wmoUnit:mm",
+                            "values": [
+                                {"validTime": f"{valid_from}/PT4H", "value": 10.16}
+                            ],
+                        },
+                    }
+                },
+            )
+
+        use_transport(handler)
+
+        result = await get_gridpoint_timeseries(
+            [(34.0522, -118.2437), (34.0601, -118.2401)],
+            hours=4,
+            step=2,
+            layers=["temperature", "quantitativePrecipitation"],
+        )
+
+        assert requests.count("/gridpoints/LOX/155,45") == 1
+        first, second = result.split("\n===\n")
+        lines = first.splitlines()
+        assert lines[0] == "Location 34.0522,-118.2437:"
+        assert lines[1] == "LOX 155,45"
+        assert lines[2] == "time,temperature (°F),quantitativePrecipitation (in)"
+        assert lines[3].endswith(",68.0,0.20")
+        assert lines[4].endswith(",,0.20")
+        assert len(lines) == 5
+        assert second.splitlines()[1:] == lines[1:]
+
+    @pytest.mark.asyncio
+    async def test_get_gridpoint_timeseries_validates_arguments(self):
+        """Test errors for unknown layers and unit systems."""
+        unknown = await get_gridpoint_timeseries([(1.0, 2.0)], layers=["humidex"])
+        units = await get_gridpoint_timeseries([(1.0, 2.0)], units="metric")
+
+        assert unknown.startswith("Unknown layers: humidex.")
+        assert units == 'Units must be "us" or "si".'
+
+
+POINTS_RESPONSE = {
+    "properties": {
+        "gridId": "LOX",
+        "gridX": 123,
+        "gridY": 456,
+        "forecast": "https://api.weather.gov/gridpoints/LOX/123,456/forecast",
+        "observationStations": "https://api.weather.gov/gridpoints/LOX/123,456/stations",
+    }
+}
+STATIONS_RESPONSE = {
+    "features": [
+        {"properties": {"stationIdentifier": "KLAX", "name": "Los Angeles Airport"}}
+    ]
+}
+OBSERVATION_RESPONSE = {
+    "properties": {
+        "timestamp": "2025-01-01T12:00:00+00:00",
+        "textDescription": "Clear",
+        "temperature": {"value": 20.0, "unitCode": "wmoUnit:degC"},
+    }
+}
+
+
+class TestGetConditions:
+    """Test cases for the combined conditions tool."""
+
+    def responses(self, forecast_response):
+        return {
+            "https://api.weather.gov/points/34.0522,-118.2437": POINTS_RESPONSE,
+            "https://api.weather.gov/gridpoints/LOX/123,456/forecast": (
+                forecast_response
+            ),
+            "https://api.weather.gov/gridpoints/LOX/123,456/stations": (
+                STATIONS_RESPONSE
+            ),
+            "https://api.weather.gov/stations/KLAX/observations/latest": (
+                OBSERVATION_RESPONSE
+            ),
+            "https://api.weather.gov/alerts/active?point=34.0522,-118.2437": {
+                "features": []
+            },
+        }
+
+    @pytest.mark.asyncio
+    async def test_all_parts(self, mock_forecast_response):
+        """Test that alerts, observation and forecast are combined."""
+        responses = self.responses(mock_forecast_response)
+
+        async def fetch(url, priority=None):
+            return responses[url]
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch) as mock:
+            result = await get_conditions(34.0522, -118.2437)
+
+        assert mock.call_count == 5
+        assert "Alerts:\nNo active alerts for this location." in result
+        assert "Station: KLAX (Los Angeles Airport)" in result
+        assert "Temperature: 68°F" in result
+        assert "Sunny with clear skies." in result
+
+    @pytest.mark.asyncio
+    async def test_parts_run_concurrently(self, mock_forecast_response):
+        """Test that the slow parts overlap instead of running in sequence."""
+        import asyncio
+        import time
+
+        responses = self.responses(mock_forecast_response)
+
+        async def fetch(url, priority=None):
+            if "/points/" not in url:
+                await asyncio.sleep(0.1)
+            return responses[url]
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch):
+            started = time.perf_counter()
+            await get_conditions(34.0522, -118.2437)
+            elapsed = time.perf_counter() - started
+
+        # Sequentially the four non-points requests would take 0.4s.
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_slow_part_times_out(self, mock_forecast_response, monkeypatch):
+        """Test that one slow part is reported without holding up the rest."""
+        import asyncio
+        from weather_mcp import tools
+
+        monkeypatch.setattr(tools, "conditions_timeout", 0.05)
+        responses = self.responses(mock_forecast_response)
+
+        async def fetch(url, priority=None):
+            if "observations" in url:
+                await asyncio.sleep(5)
+            return responses[url]
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch):
+            result = await get_conditions(34.0522, -118.2437)
+
+        assert "Current conditions:\nTimed out after 0.05s." in result
+        assert "Sunny with clear skies." in result
+
+    @pytest.mark.asyncio
+    async def test_failed_part_is_reported(self, mock_forecast_response):
+        """Test that an upstream error in one part leaves the others intact."""
+        responses = self.responses(mock_forecast_response)
+
+        async def fetch(url, priority=None):
+            if "stations" in url:
+                raise NWSHTTPError(503)
+            return responses[url]
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch):
+            result = await get_conditions(34.0522, -118.2437)
+
+        assert "Unable to fetch observations: NWS API returned HTTP 503" in result
+        assert "Sunny with clear skies." in result
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_location(self):
+        """Test that a failed point lookup fails the whole call."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = None
+
+            result = await get_conditions(0.0, 0.0)
+
+        assert result == "Unable to fetch forecast data for this location."
+
+
+class TestGetCurrentObservations:
+    """Test cases for the nearest-station observation tool."""
+
+    def load_catalog(self):
+        import numpy as np
+        from weather_mcp.stations import StationIndex, station_catalog
+
+        station_catalog.enabled = True
+        station_catalog.index = StationIndex(
+            ["KLAX", "KSFO"],
+            ["Los Angeles Airport", None],
+            np.array([[33.94, -118.41], [37.62, -122.37]]),
+        )
+
+    @pytest.mark.asyncio
+    async def test_catalog_skips_point_lookup(self):
+        """Test that a loaded catalog leaves only the observation request."""
+        self.load_catalog()
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = OBSERVATION_RESPONSE
+
+            result = await get_current_observations(34.0522, -118.2437)
+
+        mock_request.assert_called_once_with(
+            "https://api.weather.gov/stations/KLAX/observations/latest"
+        )
+        assert "Station: KLAX (Los Angeles Airport), 12 mi away" in result
+        assert "Temperature: 68°F" in result
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_gridpoint_stations(self):
+        """Test that without a catalog the gridpoint's station list is used."""
+        responses = {
+            "https://api.weather.gov/points/34.0522,-118.2437": POINTS_RESPONSE,
+            "https://api.weather.gov/gridpoints/LOX/123,456/stations": (
+                STATIONS_RESPONSE
+            ),
+            "https://api.weather.gov/stations/KLAX/observations/latest": (
+                OBSERVATION_RESPONSE
+            ),
+        }
+
+        async def fetch(url, priority=None):
+            return responses[url]
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch) as mock:
+            result = await get_current_observations(34.0522, -118.2437)
+
+        assert mock.call_count == 3
+        assert "Station: KLAX (Los Angeles Airport)" in result
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_location(self):
+        """Test a location with neither a catalog station nor a gridpoint."""
+        with patch(
+            "weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = None
+
+            result = await get_current_observations(0.0, 0.0)
+
+        assert result == "No observation stations for this location."
+
+    @pytest.mark.asyncio
+    async def test_conditions_use_catalog(self, mock_forecast_response):
+        """Test that get_conditions skips the station list with a catalog."""
+        self.load_catalog()
+        responses = TestGetConditions().responses(mock_forecast_response)
+
+        async def fetch(url, priority=None):
+            return responses[url]
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch) as mock:
+            result = await get_conditions(34.0522, -118.2437)
+
+        urls = [call.args[0] for call in mock.call_args_list]
+        assert not any(url.endswith("/stations") for url in urls)
+        assert "Station: KLAX (Los Angeles Airport), 12 mi away" in result
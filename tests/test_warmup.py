@@ -0,0 +1,175 @@
+"""
+Tests for the startup warm-up.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from weather_mcp.alerts import alert_snapshot
+from weather_mcp.nws_api import NWSHTTPError
+from weather_mcp.ratelimit import Priority
+from weather_mcp.warmup import Warmup, parse_points
+
+POINTS_RESPONSE = {
+    "properties": {
+        "gridId": "LOX",
+        "gridX": 123,
+        "gridY": 456,
+        "forecast": "https://api.weather.gov/gridpoints/LOX/123,456/forecast",
+    }
+}
+
+
+def responses():
+    return {
+        "https://api.weather.gov/alerts/active/area/CA": {"features": []},
+        "https://api.weather.gov/alerts/active/area/TX": {"features": []},
+        "https://api.weather.gov/points/34.05,-118.24": POINTS_RESPONSE,
+        "https://api.weather.gov/gridpoints/LOX/123,456/forecast": {"properties": {}},
+    }
+
+
+class TestWarmup:
+    """Test cases for prefetching hot data at startup."""
+
+    @pytest.mark.asyncio
+    async def test_prefetches_states_and_points(self):
+        """Test that state alerts, points and forecasts are fetched in background."""
+        warmup = Warmup(states=("CA", "TX"), points=((34.05, -118.24),))
+        calls = {}
+        data = responses()
+
+        async def fetch(url, priority=Priority.INTERACTIVE):
+            calls[url] = priority
+            return data[url]
+
+        with (
+            patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch),
+            patch("weather_mcp.warmup.fetch_nws_json", side_effect=fetch),
+        ):
+            stats = await warmup.run()
+
+        assert set(calls) == set(data)
+        assert set(calls.values()) == {Priority.BACKGROUND}
+        assert stats.ready and stats.complete
+        assert (stats.fetched, stats.failed) == (3, 0)
+
+    @pytest.mark.asyncio
+    async def test_failures_do_not_stop_warmup(self):
+        """Test that a failed prefetch is counted and the rest still run."""
+        warmup = Warmup(states=("CA", "TX"), points=((34.05, -118.24),))
+        data = responses()
+
+        async def fetch(url, priority=Priority.INTERACTIVE):
+            if url.endswith("/TX"):
+                raise NWSHTTPError(503)
+            return data[url]
+
+        with (
+            patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch),
+            patch("weather_mcp.warmup.fetch_nws_json", side_effect=fetch),
+        ):
+            stats = await warmup.run()
+
+        assert stats.ready and stats.complete
+        assert (stats.fetched, stats.failed) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_malformed_response_does_not_block_readiness(self):
+        """Test that an unexpected error is counted like an upstream failure."""
+        warmup = Warmup(states=("CA",), points=((34.05, -118.24),))
+        data = responses()
+        data["https://api.weather.gov/points/34.05,-118.24"] = {"properties": {}}
+
+        async def fetch(url, priority=Priority.INTERACTIVE):
+            return data[url]
+
+        with (
+            patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch),
+            patch("weather_mcp.warmup.fetch_nws_json", side_effect=fetch),
+        ):
+            stats = await warmup.run()
+
+        assert stats.ready and stats.complete
+        assert (stats.fetched, stats.failed) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_timeout_reports_ready_but_incomplete(self):
+        """Test that a stalled upstream cannot hold readiness back forever."""
+        warmup = Warmup(states=("CA",), timeout=0.05)
+
+        async def fetch(url, priority=Priority.INTERACTIVE):
+            await asyncio.sleep(5)
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch):
+            stats = await warmup.run()
+
+        assert stats.ready
+        assert not stats.complete
+
+    @pytest.mark.asyncio
+    async def test_snapshot_serves_states(self):
+        """Test that with snapshot mode the states come from the national feed."""
+        warmup = Warmup(states=("CA", "TX"))
+        alert_snapshot.enabled = True
+        with (
+            patch(
+                "weather_mcp.alerts.fetch_nws_json", new_callable=AsyncMock
+            ) as national,
+            patch("weather_mcp.tools.fetch_nws_json", new_callable=AsyncMock) as state,
+        ):
+            national.return_value = {"features": []}
+
+            stats = await warmup.run()
+
+        national.assert_called_once()
+        state.assert_not_called()
+        assert stats.fetched == 3
+
+    @pytest.mark.asyncio
+    async def test_running_starts_once(self):
+        """Test that the warm-up runs in the background once per process."""
+        warmup = Warmup()
+
+        async with warmup.running():
+            async with warmup.running():
+                await asyncio.sleep(0.01)
+                assert warmup.ready
+            first = warmup.stats()
+
+        async with warmup.running():
+            assert warmup._task is None
+        assert warmup.stats() == first
+
+    @pytest.mark.asyncio
+    async def test_unfinished_warmup_is_cancelled(self):
+        """Test that leaving before the warm-up finishes stops it."""
+        warmup = Warmup(states=("CA",))
+
+        async def fetch(url, priority=Priority.INTERACTIVE):
+            await asyncio.sleep(5)
+
+        with patch("weather_mcp.tools.fetch_nws_json", side_effect=fetch):
+            async with warmup.running():
+                await asyncio.sleep(0.01)
+
+        assert warmup._task is None
+        assert not warmup.ready
+
+    def test_from_env(self, monkeypatch):
+        """Test reading hot states and coordinates from the environment."""
+        monkeypatch.setenv("WEATHER_MCP_WARMUP_STATES", "ca, tx,")
+        monkeypatch.setenv("WEATHER_MCP_WARMUP_POINTS", "34.05,-118.24; 40.71,-74.01")
+        monkeypatch.setenv("WEATHER_MCP_WARMUP_TIMEOUT", "30")
+
+        warmup = Warmup.from_env()
+
+        assert warmup.states == ("CA", "TX")
+        assert warmup.points == ((34.05, -118.24), (40.71, -74.01))
+        assert warmup.timeout == 30
+
+    def test_parse_points_rejects_garbage(self):
+        """Test that malformed coordinates fail loudly at startup."""
+        assert parse_points("") == []
+        with pytest.raises(ValueError):
+            parse_points("34.05")
@@ -0,0 +1,169 @@
+"""
+Change log of active alerts for cursor-based incremental polling.
+"""
+
+import base64
+import os
+import secrets
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from weather_mcp.records import AlertRecord
+
+ADDED = "added"
+UPDATED = "updated"
+EXPIRED = "expired"
+
+
+@dataclass(frozen=True)
+class AlertChange:
+    """One alert that appeared, changed or went away within a scope."""
+
+    seq: int
+    scope: str
+    kind: str
+    alert_id: str
+    alert: AlertRecord
+    recorded_at: float
+
+
+@dataclass
+class ChangeSet:
+    """Changes returned for one cursor, and the cursor to use next."""
+
+    cursor: str
+    changes: list[AlertChange] = field(default_factory=list)
+    reset: bool = False
+
+
+class AlertChangeLog:
+    """Bounded log of alert additions, updates and expirations per scope.
+
+    Each call to :meth:`record` diffs the active alerts for a scope (such as
+    a state code) against the previous call. An alert is *updated* when its
+    id reappears with a different ``sent``/``expires``/``messageType`` or
+    when a new alert ``references`` it; otherwise a disappearing id has
+    *expired*. Cursors encode a per-process epoch and their scope, so cursors
+    issued before a restart, for another scope, or older than the retained
+    history trigger a full reset.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_age: float = 6 * 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.clock = clock
+        self.epoch = secrets.token_hex(4)
+        self._seq = 0
+        self._entries: deque[AlertChange] = deque()
+        self._active: dict[str, dict[str, AlertRecord]] = {}
+        self._dropped_through = 0
+
+    @classmethod
+    def from_env(cls) -> "AlertChangeLog":
+        """Build from ``WEATHER_MCP_CHANGE_LOG_*`` environment variables."""
+        env = os.environ
+        return cls(
+            max_entries=int(env.get("WEATHER_MCP_CHANGE_LOG_MAX_ENTRIES", "10000")),
+            max_age=float(env.get("WEATHER_MCP_CHANGE_LOG_MAX_AGE", str(6 * 3600.0))),
+        )
+
+    def clear(self) -> None:
+        """Forget all scopes and changes and invalidate issued cursors."""
+        self.epoch = secrets.token_hex(4)
+        self._seq = 0
+        self._entries.clear()
+        self._active.clear()
+        self._dropped_through = 0
+
+    def cursor(self, scope: str) -> str:
+        """Cursor for ``scope`` pointing after the latest recorded change."""
+        raw = f"{self.epoch}:{self._seq}:{scope}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def _decode(self, cursor: str, scope: str) -> int | None:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            epoch, seq, issued_for = (
+                base64.urlsafe_b64decode(padded).decode().split(":", 2)
+            )
+            position = int(seq)
+        except ValueError:
+            return None
+        if epoch != self.epoch or issued_for != scope or position > self._seq:
+            return None
+        return position
+
+    def active(self, scope: str) -> list[AlertRecord]:
+        """Alerts last recorded as active for ``scope``."""
+        return list(self._active.get(scope, {}).values())
+
+    def record(self, scope: str, alerts: list[AlertRecord]) -> None:
+        """Diff ``alerts`` against the previous state of ``scope``."""
+        now = self.clock()
+        previous = self._active.get(scope)
+        current = {alert.id: alert for alert in alerts}
+        self._active[scope] = current
+        if previous is None:
+            # First sighting of a scope is a baseline, not a change.
+            return
+
+        superseded: set[str] = set()
+        for identifier, alert in current.items():
+            referenced = previous.keys() & set(alert.references)
+            if identifier in previous:
+                if previous[identifier].version != alert.version:
+                    self._append(scope, UPDATED, alert, now)
+            elif referenced:
+                superseded |= referenced
+                self._append(scope, UPDATED, alert, now)
+            else:
+                self._append(scope, ADDED, alert, now)
+        for identifier, alert in previous.items():
+            if identifier not in current and identifier not in superseded:
+                self._append(scope, EXPIRED, alert, now)
+        self._trim(now)
+
+    def _append(self, scope: str, kind: str, alert: AlertRecord, now: float) -> None:
+        self._seq += 1
+        self._entries.append(AlertChange(self._seq, scope, kind, alert.id, alert, now))
+
+    def _trim(self, now: float) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or now - self._entries[0].recorded_at > self.max_age
+        ):
+            self._dropped_through = self._entries.popleft().seq
+
+    def changes_since(self, scope: str, cursor: str | None) -> ChangeSet:
+        """Return changes to ``scope`` after ``cursor``.
+
+        Without a usable cursor, including one issued for another scope,
+        every active alert is returned as added and ``reset`` is set, so the
+        caller can rebuild its view from scratch.
+        """
+        position = self._decode(cursor, scope) if cursor else None
+        if position is None or position < self._dropped_through:
+            now = self.clock()
+            return ChangeSet(
+                cursor=self.cursor(scope),
+                changes=[
+                    AlertChange(0, scope, ADDED, alert.id, alert, now)
+                    for alert in self.active(scope)
+                ],
+                reset=True,
+            )
+        changes = [
+            change
+            for change in self._entries
+            if change.seq > position and change.scope == scope
+        ]
+        return ChangeSet(cursor=self.cursor(scope), changes=changes)
+
+
+alert_change_log = AlertChangeLog.from_env()
@@ -0,0 +1,414 @@
+"""
+National active-alert snapshot indexed for per-state and attribute queries.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields
+from typing import Any
+from weather_mcp.config import env_flag
+import numpy as np
+from weather_mcp.nws_api import NWS_API_BASE, NWSError, fetch_nws_json
+from weather_mcp.ratelimit import Priority
+from weather_mcp.records import AlertRecord, alert_records
+from weather_mcp.spatial import (
+    Polygon,
+    SpatialIndex,
+    polygon_bounds,
+    polygons_from_geometry,
+)
+
+logger = logging.getLogger(__name__)
+
+NATIONAL_ALERTS_URL = f"{NWS_API_BASE}/alerts/active"
+
+# Degrees added around the known extent of an area when deciding which
+# points an alert with a missing zone shape might cover.
+UNRESOLVED_MARGIN = 1.0
+
+
+def _zone_area(url: str) -> str:
+    """Area prefix of a zone URL such as ``.../zones/forecast/CAZ041``."""
+    return url.rstrip("/").rsplit("/", 1)[-1][:2].upper()
+
+
+def _split(value: str | None, normalize: Callable[[str], str]) -> tuple[str, ...]:
+    if not value:
+        return ()
+    items = (normalize(item.strip()) for item in value.split(","))
+    return tuple(sorted(set(filter(None, items))))
+
+
+@dataclass(frozen=True)
+class AlertFilters:
+    """Alert attribute filters, mirroring the ``/alerts/active`` query parameters.
+
+    Each field holds the accepted values; an empty tuple accepts anything.
+    Values are normalized to NWS spelling and sorted, so equal filters give
+    equal query strings and therefore share a cache entry.
+    """
+
+    severity: tuple[str, ...] = ()
+    urgency: tuple[str, ...] = ()
+    certainty: tuple[str, ...] = ()
+    event: tuple[str, ...] = ()
+    status: tuple[str, ...] = ()
+    message_type: tuple[str, ...] = ()
+
+    @classmethod
+    def parse(
+        cls,
+        severity: str | None = None,
+        urgency: str | None = None,
+        certainty: str | None = None,
+        event: str | None = None,
+        status: str | None = None,
+        message_type: str | None = None,
+    ) -> "AlertFilters":
+        """Build filters from comma-separated values such as ``"Severe,Extreme"``."""
+        return cls(
+            severity=_split(severity, str.title),
+            urgency=_split(urgency, str.title),
+            certainty=_split(certainty, str.title),
+            event=_split(event, str.title),
+            status=_split(status, str.lower),
+            message_type=_split(message_type, str.lower),
+        )
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, f.name) for f in fields(self))
+
+    def query_params(self) -> list[tuple[str, str]]:
+        """``/alerts/active`` query parameters for the active filters."""
+        return [
+            (f.name, ",".join(getattr(self, f.name)))
+            for f in fields(self)
+            if getattr(self, f.name)
+        ]
+
+    def matches(self, alert: AlertRecord) -> bool:
+        """Whether an alert satisfies every active filter."""
+        for f in fields(self):
+            accepted = getattr(self, f.name)
+            if not accepted:
+                continue
+            if str(getattr(alert, f.name) or "").lower() not in {
+                value.lower() for value in accepted
+            }:
+                return False
+        return True
+
+    def apply(self, index: "AlertIndex", area: str) -> list[AlertRecord]:
+        """Query ``index`` for ``area``, using its postings where possible."""
+
+        def single(values: tuple[str, ...]) -> str | None:
+            return values[0] if len(values) == 1 else None
+
+        alerts = index.query(
+            area=area,
+            severity=single(self.severity),
+            urgency=single(self.urgency),
+            event=single(self.event),
+        )
+        return [alert for alert in alerts if self.matches(alert)]
+
+
+class AlertIndex:
+    """In-memory index over one national ``/alerts/active`` response.
+
+    Alerts are indexed by area (the two-letter state or marine prefix of
+    their UGC codes, as used by ``/alerts/active/area/{area}``), UGC code,
+    severity, urgency and event type. Features are kept as compact
+    :class:`AlertRecord` objects rather than the parsed JSON.
+    """
+
+    def __init__(self, features: list[dict[str, Any]], fetched_at: float) -> None:
+        self.alerts = alert_records(features)
+        self.fetched_at = fetched_at
+        self.by_area: dict[str, list[int]] = defaultdict(list)
+        self.by_zone: dict[str, list[int]] = defaultdict(list)
+        self.by_severity: dict[str, list[int]] = defaultdict(list)
+        self.by_urgency: dict[str, list[int]] = defaultdict(list)
+        self.by_event: dict[str, list[int]] = defaultdict(list)
+        self._sets: dict[tuple[int, str], frozenset[int]] = {}
+        self.spatial: SpatialIndex | None = None
+        self.spatial_complete = False
+        self._spatial_positions: list[int] = []
+        # Boxes (min_lon, min_lat, max_lon, max_lat) that may hold an alert
+        # whose zone shape is missing; ``_unresolved_anywhere`` when such an
+        # alert is in an area with no known geometry at all.
+        self._unresolved_bounds = np.empty((0, 4), dtype=np.float64)
+        self._unresolved_anywhere = False
+
+        for position, alert in enumerate(self.alerts):
+            for area in dict.fromkeys(zone[:2] for zone in alert.zones):
+                self.by_area[area].append(position)
+            for zone in alert.zones:
+                self.by_zone[zone].append(position)
+            self.by_severity[alert.severity or "Unknown"].append(position)
+            self.by_urgency[alert.urgency or "Unknown"].append(position)
+            self.by_event[alert.event or "Unknown"].append(position)
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def query(
+        self,
+        area: str | None = None,
+        zone: str | None = None,
+        severity: str | None = None,
+        urgency: str | None = None,
+        event: str | None = None,
+    ) -> list[AlertRecord]:
+        """Return alerts matching every given criterion, in feed order."""
+        criteria = [
+            (self.by_area, area),
+            (self.by_zone, zone),
+            (self.by_severity, severity),
+            (self.by_urgency, urgency),
+            (self.by_event, event),
+        ]
+        postings = [
+            (index.get(value, []), index, value) for index, value in criteria if value
+        ]
+        if not postings:
+            return list(self.alerts)
+        postings.sort(key=lambda posting: len(posting[0]))
+
+        # Narrow the shortest posting list with set lookups on the others.
+        matches = postings[0][0]
+        for _, index, value in postings[1:]:
+            positions = self._posting_set(index, value)
+            matches = [i for i in matches if i in positions]
+        return [self.alerts[i] for i in matches]
+
+    def zone_urls(self) -> set[str]:
+        """Zone URLs of alerts that carry no polygon of their own."""
+        return {
+            url
+            for alert in self.alerts
+            if not alert.polygons
+            for url in alert.affected_zones
+        }
+
+    def build_spatial(self, zone_shapes: dict[str, list[Polygon]]) -> None:
+        """Index alert polygons, using zone shapes for alerts without one.
+
+        An alert whose zone shapes are not all in ``zone_shapes`` is
+        unresolved: the known extent of its missing zones' areas, from other
+        zone shapes and alert polygons, is kept so :meth:`covers` can send
+        only points near it upstream. ``spatial_complete`` is True when no
+        alert is unresolved.
+        """
+        extents: dict[str, list[float]] = {}
+
+        def extend(area: str, box: tuple[float, float, float, float]) -> None:
+            extent = extents.setdefault(area, list(box))
+            extent[:2] = min(extent[0], box[0]), min(extent[1], box[1])
+            extent[2:] = max(extent[2], box[2]), max(extent[3], box[3])
+
+        for url, polygons in zone_shapes.items():
+            if polygons:
+                extend(_zone_area(url), polygon_bounds(polygons))
+
+        shapes: list[list[Polygon]] = []
+        positions: list[int] = []
+        unresolved: list[set[str]] = []
+        for position, alert in enumerate(self.alerts):
+            polygons = list(alert.polygons)
+            if polygons:
+                box = polygon_bounds(polygons)
+                for area in {zone[:2] for zone in alert.zones}:
+                    extend(area, box)
+            else:
+                missing = set()
+                for url in alert.affected_zones:
+                    if url in zone_shapes:
+                        polygons.extend(zone_shapes[url])
+                    else:
+                        missing.add(_zone_area(url))
+                if missing:
+                    unresolved.append(missing)
+            if polygons:
+                shapes.append(polygons)
+                positions.append(position)
+
+        areas: set[str] = set().union(*unresolved)
+        margin = np.array([-1.0, -1.0, 1.0, 1.0]) * UNRESOLVED_MARGIN
+        self.spatial = SpatialIndex(shapes)
+        self._spatial_positions = positions
+        self._unresolved_anywhere = not areas <= extents.keys()
+        self._unresolved_bounds = (
+            np.array([extents[area] for area in sorted(areas & extents.keys())])
+            .reshape(-1, 4)
+            .astype(np.float64)
+            + margin
+        )
+        self.spatial_complete = not unresolved
+
+    def covers(self, latitude: float, longitude: float) -> bool:
+        """Whether :meth:`query_point` is complete for this point.
+
+        False when an alert whose zone shape is missing may contain it.
+        """
+        if self.spatial is None or self._unresolved_anywhere:
+            return False
+        bounds = self._unresolved_bounds
+        near = (
+            (bounds[:, 0] <= longitude)
+            & (longitude <= bounds[:, 2])
+            & (bounds[:, 1] <= latitude)
+            & (latitude <= bounds[:, 3])
+        )
+        return not near.any()
+
+    def query_point(self, latitude: float, longitude: float) -> list[AlertRecord]:
+        """Alerts whose area contains the point, in feed order."""
+        if self.spatial is None:
+            return []
+        return [
+            self.alerts[self._spatial_positions[shape]]
+            for shape in self.spatial.query(longitude, latitude)
+        ]
+
+    def _posting_set(self, index: dict[str, list[int]], value: str) -> frozenset[int]:
+        key = (id(index), value)
+        positions = self._sets.get(key)
+        if positions is None:
+            positions = self._sets[key] = frozenset(index.get(value, ()))
+        return positions
+
+
+class AlertSnapshot:
+    """Periodically refreshed national alert index.
+
+    While :meth:`running` is held a background task pulls the national feed
+    every ``interval`` seconds. :meth:`current` returns the index only while
+    it is younger than ``max_age`` so callers can fall back to per-state
+    requests when polling falls behind. A zone shape that fails to load is
+    retried after ``zone_retry`` seconds, doubling per failure up to
+    ``zone_retry_max``, rather than on every refresh.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        interval: float = 60.0,
+        max_age: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.enabled = enabled
+        self.interval = interval
+        self.max_age = max_age if max_age is not None else 2 * interval
+        self.clock = clock
+        self.index: AlertIndex | None = None
+        self.zone_shapes: dict[str, list[Polygon]] = {}
+        self.zone_concurrency = 4
+        self.zone_retry = 300.0
+        self.zone_retry_max = 6 * 3600.0
+        # Zone URL -> (consecutive failures, time of the next attempt).
+        self.zone_failures: dict[str, tuple[int, float]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._users = 0
+
+    @classmethod
+    def from_env(cls) -> "AlertSnapshot":
+        """Build from ``WEATHER_MCP_ALERT_SNAPSHOT*`` environment variables."""
+        env = os.environ
+        return cls(
+            enabled=env_flag("WEATHER_MCP_ALERT_SNAPSHOT"),
+            interval=float(env.get("WEATHER_MCP_ALERT_SNAPSHOT_INTERVAL", "60.0")),
+        )
+
+    def current(self) -> AlertIndex | None:
+        """Return the index if snapshot mode is on and the index is recent."""
+        if not self.enabled or self.index is None:
+            return None
+        if self.clock() - self.index.fetched_at > self.max_age:
+            return None
+        return self.index
+
+    async def refresh(self) -> AlertIndex:
+        """Fetch the national feed and rebuild the index.
+
+        The new index is published before zone shapes it still needs are
+        fetched, then its spatial index is rebuilt with them.
+        """
+        data = await fetch_nws_json(NATIONAL_ALERTS_URL, Priority.BACKGROUND)
+        index = AlertIndex(data.get("features") or [], self.clock())
+        index.build_spatial(self.zone_shapes)
+        self.index = index
+        now = self.clock()
+        missing = {
+            url
+            for url in index.zone_urls() - self.zone_shapes.keys()
+            if self.zone_failures.get(url, (0, now))[1] <= now
+        }
+        if missing:
+            await self._load_zones(missing)
+            index.build_spatial(self.zone_shapes)
+        return index
+
+    async def _load_zones(self, urls: set[str]) -> None:
+        semaphore = asyncio.Semaphore(self.zone_concurrency)
+
+        async def load(url: str) -> None:
+            async with semaphore:
+                try:
+                    zone = await fetch_nws_json(url, Priority.BACKGROUND)
+                except NWSError as exc:
+                    failures = self.zone_failures.get(url, (0, 0.0))[0] + 1
+                    delay = min(
+                        self.zone_retry * 2 ** (failures - 1), self.zone_retry_max
+                    )
+                    self.zone_failures[url] = (failures, self.clock() + delay)
+                    logger.warning(
+                        "Zone geometry %s unavailable, retrying in %.0fs: %s",
+                        url,
+                        delay,
+                        exc,
+                    )
+                    return
+            self.zone_failures.pop(url, None)
+            self.zone_shapes[url] = polygons_from_geometry(zone.get("geometry"))
+
+        await asyncio.gather(*(load(url) for url in urls))
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except NWSError as exc:
+                logger.warning("National alert snapshot refresh failed: %s", exc)
+            except Exception:
+                logger.exception("National alert snapshot refresh failed")
+            await asyncio.sleep(self.interval)
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["AlertSnapshot"]:
+        """Keep the poller running while any holder is inside the block."""
+        if not self.enabled:
+            yield self
+            return
+        self._users += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll())
+        try:
+            yield self
+        finally:
+            self._users -= 1
+            if self._users == 0 and self._task is not None:
+                task, self._task = self._task, None
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+
+alert_snapshot = AlertSnapshot.from_env()
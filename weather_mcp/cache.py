@@ -0,0 +1,339 @@
+"""
+In-process response cache for NWS API requests.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Protocol
+
+
+@dataclass
+class CacheEntry:
+    """A cached JSON response, its freshness deadline and its validators."""
+
+    data: dict[str, Any]
+    size: int
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers that let the server answer ``304 Not Modified``."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for a response cache."""
+
+    hits: int
+    stale_hits: int
+    misses: int
+    revalidations: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class CacheBackend(Protocol):
+    """Persistent store consulted when the in-process cache misses.
+
+    Implementations must be safe to call from worker threads.
+    """
+
+    def get(self, key: str) -> CacheEntry | None: ...
+
+    def expires_at(self, key: str) -> float | None: ...
+
+    def put(self, key: str, entry: CacheEntry) -> None: ...
+
+    def discard(self, key: str) -> None: ...
+
+    def claim(self, key: str, duration: float) -> bool: ...
+
+    def leased(self, key: str) -> bool: ...
+
+    def release(self, key: str) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+    def close(self) -> None: ...
+
+
+def _parse_http_date(value: str) -> float | None:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: float) -> float:
+    """Return how many seconds a response may be served from cache.
+
+    Follows ``Cache-Control`` (``no-store``, ``no-cache``, ``max-age``) and
+    falls back to ``Expires``; responses without either are stale at once.
+    """
+    cache_control = headers.get("cache-control", "")
+    directives: dict[str, str] = {}
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+
+    if "max-age" in directives:
+        try:
+            max_age = float(directives["max-age"])
+        except ValueError:
+            return 0.0
+        try:
+            age = float(headers.get("age", 0))
+        except ValueError:
+            age = 0.0
+        return max(0.0, max_age - age)
+
+    expires = headers.get("expires")
+    if expires:
+        expires_at = _parse_http_date(expires)
+        if expires_at is None:
+            return 0.0
+        date = headers.get("date")
+        origin_now = (_parse_http_date(date) if date else None) or now
+        return max(0.0, expires_at - origin_now)
+
+    return 0.0
+
+
+class ResponseCache:
+    """LRU cache of JSON responses bounded by entry count and total bytes."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Build a cache sized by ``WEATHER_MCP_CACHE_*`` environment variables."""
+        env = os.environ
+        return cls(
+            max_entries=int(env.get("WEATHER_MCP_CACHE_MAX_ENTRIES", "1024")),
+            max_bytes=int(
+                env.get("WEATHER_MCP_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, max_stale: float = 0.0) -> CacheEntry | None:
+        """Return the entry for ``key`` if usable, counting a hit or a miss.
+
+        Args:
+            key: Cache key
+            max_stale: Also return entries expired for at most this many
+                seconds; callers can tell them apart with ``is_fresh``
+        """
+        entry = self._entries.get(key)
+        now = self.clock()
+        if entry is None or now >= entry.expires_at + max_stale:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry.is_fresh(now):
+            self._hits += 1
+        else:
+            self._stale_hits += 1
+        return entry
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """Return the entry for ``key`` even if stale, without counting it."""
+        return self._entries.get(key)
+
+    def refresh(
+        self,
+        key: str,
+        expires_at: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry | None:
+        """Extend a stale entry after the server confirmed it is unchanged."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.expires_at = expires_at
+        entry.etag = etag or entry.etag
+        entry.last_modified = last_modified or entry.last_modified
+        self._entries.move_to_end(key)
+        self._revalidations += 1
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store ``entry``, evicting least recently used entries to fit."""
+        self.discard(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Remove ``key`` from the cache if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._hits = self._stale_hits = self._misses = 0
+        self._revalidations = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            stale_hits=self._stale_hits,
+            misses=self._misses,
+            revalidations=self._revalidations,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            bytes=self._bytes,
+        )
+
+
+@dataclass(frozen=True)
+class RenderCacheStats:
+    """Point-in-time counters for the rendered-output cache."""
+
+    hits: int
+    misses: int
+    invalidations: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class RenderCache:
+    """LRU cache of formatted output for versioned records.
+
+    Entries are keyed by record kind, record id and output mode, and remember
+    the version (e.g. an alert's ``sent``/``expires``) they were rendered
+    from. A lookup with a newer version re-renders and replaces the entry,
+    so an updated alert never serves its old text. The cache is process-wide,
+    so a rendering made for one session, state or batch is reused by all.
+    """
+
+    def __init__(
+        self, max_entries: int = 8192, max_bytes: int = 16 * 1024 * 1024
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str, str], tuple[Any, str, int]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "RenderCache":
+        """Build a cache sized by ``WEATHER_MCP_RENDER_CACHE_*`` variables."""
+        env = os.environ
+        return cls(
+            max_entries=int(env.get("WEATHER_MCP_RENDER_CACHE_MAX_ENTRIES", "8192")),
+            max_bytes=int(
+                env.get("WEATHER_MCP_RENDER_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(
+        self,
+        kind: str,
+        record_id: str,
+        version: Any,
+        mode: str,
+        renderer: Callable[[], str],
+    ) -> str:
+        """Return the cached rendering, calling ``renderer`` on a miss.
+
+        Args:
+            kind: Record type, e.g. ``"alert"`` or ``"forecast"``
+            record_id: Stable identity of the record
+            version: Changes whenever the record's content does
+            mode: Output mode, e.g. ``"text"`` or ``"json"``
+            renderer: Produces the output for this version
+        """
+        key = (kind, record_id, mode)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == version:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._invalidations += 1
+            self.discard(key)
+        self._misses += 1
+        text = renderer()
+        size = len(text.encode())
+        if size <= self.max_bytes:
+            self._entries[key] = (version, text, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+        return text
+
+    def discard(self, key: tuple[str, str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._hits = self._misses = self._invalidations = self._evictions = 0
+
+    def stats(self) -> RenderCacheStats:
+        return RenderCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            invalidations=self._invalidations,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            bytes=self._bytes,
+        )
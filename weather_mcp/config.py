@@ -0,0 +1,15 @@
+"""
+Helpers for reading settings from the environment.
+"""
+
+import os
+
+TRUE_VALUES = ("1", "true", "yes")
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean flag, ``default`` when the variable is unset."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in TRUE_VALUES
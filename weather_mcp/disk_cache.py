@@ -0,0 +1,262 @@
+"""
+SQLite-backed persistent cache for NWS responses.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+from weather_mcp.cache import CacheEntry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at);
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    owner INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SQLiteCache:
+    """Response cache stored in a local SQLite file.
+
+    Bodies are stored as zlib-compressed JSON. The database runs in WAL mode
+    so several worker processes on one host can read and write it at once;
+    each process opens its own connection on first use. Entries are kept for
+    ``stale_retention`` seconds past expiry so they can still be revalidated,
+    and the least recently used rows are dropped once ``max_bytes`` of
+    compressed bodies is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        stale_retention: float = 24 * 3600.0,
+        compact_every: int = 64,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.stale_retention = stale_retention
+        self.compact_every = compact_every
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid = 0
+
+    @classmethod
+    def from_env(cls) -> "SQLiteCache | None":
+        """Build a cache from ``WEATHER_MCP_DISK_CACHE*`` environment variables.
+
+        Returns ``None`` unless ``WEATHER_MCP_DISK_CACHE`` names a file.
+        """
+        env = os.environ
+        path = env.get("WEATHER_MCP_DISK_CACHE")
+        if not path:
+            return None
+        return cls(
+            path,
+            max_bytes=int(
+                env.get("WEATHER_MCP_DISK_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+            ),
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection inherited across fork() must not be reused.
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the stored entry for ``key``, fresh or not."""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT body, size, expires_at, etag, last_modified "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (self.clock(), key),
+            )
+        self.hits += 1
+        body, size, expires_at, etag, last_modified = row
+        data = json.loads(zlib.decompress(body))
+        return CacheEntry(data, size, expires_at, etag, last_modified)
+
+    def expires_at(self, key: str) -> float | None:
+        """Return when the stored entry for ``key`` expires, without loading it.
+
+        Unlike :meth:`get` this neither counts as a hit nor refreshes the
+        entry's LRU position, so it is cheap enough to poll.
+        """
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT expires_at FROM responses WHERE key = ?", (key,))
+                .fetchone()
+            )
+        return None if row is None else float(row[0])
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        body = zlib.compress(json.dumps(entry.data, separators=(",", ":")).encode())
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    body,
+                    entry.size,
+                    len(body),
+                    entry.expires_at,
+                    entry.etag,
+                    entry.last_modified,
+                    self.clock(),
+                ),
+            )
+            self._writes += 1
+            if self._writes % self.compact_every == 0:
+                self._compact(conn)
+
+    def claim(self, key: str, duration: float) -> bool:
+        """Take the lease to fetch ``key`` upstream for ``duration`` seconds.
+
+        Returns False while another process holds an unexpired lease, so
+        workers sharing the file make one upstream request per key.
+        """
+        now = self.clock()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT owner, expires_at FROM leases WHERE key = ?", (key,)
+                ).fetchone()
+                claimed = row is None or row[0] == self._pid or row[1] <= now
+                if claimed:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO leases VALUES (?, ?, ?)",
+                        (key, self._pid, now + duration),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return claimed
+
+    def leased(self, key: str) -> bool:
+        """Whether another process holds an unexpired lease on ``key``."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT 1 FROM leases WHERE key = ? AND owner != ? "
+                    "AND expires_at > ?",
+                    (key, self._pid, self.clock()),
+                )
+                .fetchone()
+            )
+        return row is not None
+
+    def release(self, key: str) -> None:
+        """Give up this process's lease on ``key``, if it holds one."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._pid)
+            )
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def compact(self) -> None:
+        """Drop long-expired rows, enforce ``max_bytes`` and reclaim space."""
+        with self._lock:
+            self._compact(self._connection())
+
+    def _compact(self, conn: sqlite3.Connection) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM responses WHERE expires_at < ?",
+                (self.clock() - self.stale_retention,),
+            )
+            conn.execute("DELETE FROM leases WHERE expires_at < ?", (self.clock(),))
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(stored_size), 0) FROM responses"
+            ).fetchone()
+            if total > self.max_bytes:
+                # Trim to 90% so compaction does not run on every write.
+                excess = total - int(self.max_bytes * 0.9)
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM ("
+                    "  SELECT key, stored_size, SUM(stored_size) OVER ("
+                    "   ORDER BY accessed_at, key ROWS UNBOUNDED PRECEDING"
+                    "  ) AS running FROM responses"
+                    " ) WHERE running - stored_size < ?"
+                    ")",
+                    (excess,),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA incremental_vacuum")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries, stored = (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*), COALESCE(SUM(stored_size), 0) FROM responses"
+                )
+                .fetchone()
+            )
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": stored,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,260 @@
+"""
+Long-lived cache of NWS point-to-gridpoint resolutions.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRIDPOINT_TTL = 30 * 24 * 3600.0
+
+
+def normalize_coordinates(latitude: float, longitude: float) -> tuple[float, float]:
+    """Round coordinates to the 4-decimal precision the NWS API accepts."""
+    return round(latitude, 4), round(longitude, 4)
+
+
+def format_coordinate(value: float) -> str:
+    """Format a coordinate the way NWS writes it in canonical URLs."""
+    return f"{round(value, 4):.4f}".rstrip("0").rstrip(".")
+
+
+@dataclass(frozen=True)
+class GridPoint:
+    """The forecast office and grid cell that serve a location."""
+
+    office: str | None
+    grid_x: int | None
+    grid_y: int | None
+    forecast_url: str
+    forecast_hourly_url: str | None = None
+    grid_data_url: str | None = None
+    stations_url: str | None = None
+
+    @classmethod
+    def from_points(cls, points_data: dict[str, Any]) -> "GridPoint":
+        """Build from a ``/points/{lat},{lon}`` response."""
+        props = points_data["properties"]
+        return cls(
+            office=props.get("gridId"),
+            grid_x=props.get("gridX"),
+            grid_y=props.get("gridY"),
+            forecast_url=props["forecast"],
+            forecast_hourly_url=props.get("forecastHourly"),
+            grid_data_url=props.get("forecastGridData"),
+            stations_url=props.get("observationStations"),
+        )
+
+    @property
+    def grid_key(self) -> tuple[str | None, int | None, int | None]:
+        """Identifies the 2.5 km grid cell shared by nearby coordinates."""
+        return self.office, self.grid_x, self.grid_y
+
+
+class GridpointIndex:
+    """Maps normalized coordinates to their gridpoint for a long TTL.
+
+    Each grid cell's :class:`GridPoint` is stored once, keyed by its forecast
+    URL, and coordinates point at it, so nearby locations share one entry.
+    At most ``max_entries`` coordinates are kept, dropping the least
+    recently used.
+
+    When ``path`` is given the index is loaded from a JSON file and changes
+    are written back to it. Inside a running event loop writes are batched:
+    the file is rewritten in a worker thread at most once per ``save_delay``
+    seconds, and any pending change is flushed when :meth:`running` exits.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_GRIDPOINT_TTL,
+        path: str | Path | None = None,
+        max_entries: int = 10_000,
+        save_delay: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        self.clock = clock
+        # Coordinate key -> (forecast URL of its cell, expiry), oldest first.
+        self._points: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._cells: dict[str, GridPoint] = {}
+        self._refs: Counter[str] = Counter()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._save_handle: asyncio.TimerHandle | None = None
+        self._save_task: asyncio.Task[None] | None = None
+        self._users = 0
+        if self.path is not None:
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> "GridpointIndex":
+        """Build an index from ``WEATHER_MCP_GRIDPOINT_*`` environment variables."""
+        env = os.environ
+        return cls(
+            ttl=float(env.get("WEATHER_MCP_GRIDPOINT_TTL", str(DEFAULT_GRIDPOINT_TTL))),
+            path=env.get("WEATHER_MCP_GRIDPOINT_CACHE") or None,
+            max_entries=int(env.get("WEATHER_MCP_GRIDPOINT_MAX_ENTRIES", "10000")),
+        )
+
+    @staticmethod
+    def _key(latitude: float, longitude: float) -> str:
+        return f"{format_coordinate(latitude)},{format_coordinate(longitude)}"
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    @property
+    def cells(self) -> int:
+        """Number of distinct grid cells referenced by the index."""
+        return len(self._cells)
+
+    def get(self, latitude: float, longitude: float) -> GridPoint | None:
+        """Return the cached gridpoint for a location if it has not expired."""
+        key = self._key(latitude, longitude)
+        entry = self._points.get(key)
+        if entry is None or entry[1] <= self.clock():
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+        self._points.move_to_end(key)
+        self.hits += 1
+        return self._cells[entry[0]]
+
+    def put(self, latitude: float, longitude: float, grid: GridPoint) -> None:
+        self._store(self._key(latitude, longitude), grid, self.clock() + self.ttl)
+        if self.path is not None:
+            self._dirty = True
+            self._schedule_save()
+
+    def _store(self, key: str, grid: GridPoint, expires_at: float) -> None:
+        if key in self._points:
+            self._discard(key)
+        cell = grid.forecast_url
+        self._cells[cell] = grid
+        self._refs[cell] += 1
+        self._points[key] = (cell, expires_at)
+        while len(self._points) > self.max_entries:
+            self._discard(next(iter(self._points)))
+
+    def _discard(self, key: str) -> None:
+        cell, _ = self._points.pop(key)
+        self._refs[cell] -= 1
+        if self._refs[cell] <= 0:
+            del self._refs[cell]
+            del self._cells[cell]
+
+    def clear(self) -> None:
+        self._points.clear()
+        self._cells.clear()
+        self._refs.clear()
+        self.hits = self.misses = 0
+        self._dirty = False
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+
+    def _load(self) -> None:
+        assert self.path is not None
+        try:
+            raw = json.loads(self.path.read_text())
+            cells = {cell: GridPoint(**grid) for cell, grid in raw["cells"].items()}
+            points = raw["points"]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable gridpoint cache %s", self.path)
+            return
+        now = self.clock()
+        for key, (cell, expires_at) in points.items():
+            if expires_at > now and cell in cells:
+                self._store(key, cells[cell], expires_at)
+
+    def _snapshot(self) -> dict[str, Any]:
+        return {
+            "cells": {cell: asdict(grid) for cell, grid in self._cells.items()},
+            "points": dict(self._points),
+        }
+
+    def _write(self, raw: dict[str, Any]) -> None:
+        assert self.path is not None
+        # A temp file of our own, so worker processes sharing ``path`` never
+        # rename each other's half-written output into place.
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.path.parent, prefix=self.path.name, delete=False
+        ) as tmp:
+            tmp.write(json.dumps(raw, separators=(",", ":")))
+        try:
+            os.replace(tmp.name, self.path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+
+    def flush(self) -> None:
+        """Write pending changes to ``path`` now, in the calling thread."""
+        if self.path is not None and self._dirty:
+            self._dirty = False
+            self._write(self._snapshot())
+
+    def _schedule_save(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to block: write through.
+            self.flush()
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.save_delay, self._start_save)
+
+    def _start_save(self) -> None:
+        self._save_handle = None
+        if self._save_task is not None and not self._save_task.done():
+            # One write at a time; pick up these changes after it.
+            self._schedule_save()
+            return
+        self._save_task = asyncio.get_running_loop().create_task(self._save())
+
+    async def _save(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write, self._snapshot())
+        except OSError as exc:
+            logger.warning("Could not write gridpoint cache %s: %s", self.path, exc)
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["GridpointIndex"]:
+        """Flush batched writes when the last holder leaves the block."""
+        self._users += 1
+        try:
+            yield self
+        finally:
+            self._users -= 1
+            if self._users == 0:
+                if self._save_handle is not None:
+                    self._save_handle.cancel()
+                    self._save_handle = None
+                if self._save_task is not None:
+                    await self._save_task
+                    self._save_task = None
+                await self._save()
+
+
+gridpoint_index = GridpointIndex.from_env()
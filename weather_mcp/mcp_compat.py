@@ -0,0 +1,37 @@
+"""
+Workarounds that rely on MCP SDK internals.
+
+Checked against mcp 1.30. The lowlevel server has no public hook for either
+feature; tests/test_mcp_compat.py fails if the internals used here change.
+"""
+
+from collections.abc import Callable
+from typing import Any
+from mcp.server.lowlevel import Server
+from mcp.server.session import ServerSession
+from mcp.types import ServerCapabilities
+
+
+def advertise_resource_subscribe(server: Server, enabled: Callable[[], bool]) -> None:
+    """Report ``resources.subscribe`` as ``enabled()`` in ``server``'s capabilities.
+
+    The lowlevel server always reports ``subscribe=False``, even with a
+    subscribe handler registered.
+    """
+    get_capabilities = server.get_capabilities
+
+    def with_subscribe(*args: Any, **kwargs: Any) -> ServerCapabilities:
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = enabled()
+        return capabilities
+
+    setattr(server, "get_capabilities", with_subscribe)
+
+
+def on_session_close(session: ServerSession, callback: Callable[[], object]) -> None:
+    """Call ``callback`` once ``session`` has ended.
+
+    Uses the exit stack the session closes in ``__aexit__``.
+    """
+    session._exit_stack.callback(callback)
@@ -2,20 +2,451 @@
 National Weather Service API client.
 """
 
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
 from typing import Any
 import httpx
+from weather_mcp.cache import (
+    CacheBackend,
+    CacheEntry,
+    ResponseCache,
+    freshness_lifetime,
+)
+from weather_mcp.config import env_flag
+from weather_mcp.disk_cache import SQLiteCache
+from weather_mcp.ratelimit import Priority, RateLimiter
+from weather_mcp.resilience import CircuitBreaker, RetryPolicy, parse_retry_after
 
 NWS_API_BASE = "https://api.weather.gov"
 USER_AGENT = "weather-app/1.0"
 
+logger = logging.getLogger(__name__)
 
-async def make_nws_request(url: str) -> dict[str, Any] | None:
-    """Make a request to the NWS API with proper error handling."""
+
+class NWSError(Exception):
+    """Raised when the NWS API cannot provide a usable response."""
+
+
+class NWSUnavailableError(NWSError):
+    """Raised without contacting the NWS while its circuit breaker is open."""
+
+
+class NWSConnectionError(NWSError):
+    """Raised when a request times out or the connection fails."""
+
+
+class NWSHTTPError(NWSError):
+    """Raised when the NWS answers with an error status."""
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"NWS API returned HTTP {status_code}")
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class HTTPClientConfig:
+    """Connection pool settings for the shared NWS HTTP client."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "HTTPClientConfig":
+        """Build a config from ``WEATHER_MCP_HTTP_*`` environment variables."""
+        env = os.environ
+        return cls(
+            max_connections=int(env.get("WEATHER_MCP_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(
+                env.get("WEATHER_MCP_HTTP_MAX_KEEPALIVE", "20")
+            ),
+            keepalive_expiry=float(
+                env.get("WEATHER_MCP_HTTP_KEEPALIVE_EXPIRY", "30.0")
+            ),
+            http2=env_flag("WEATHER_MCP_HTTP2"),
+            timeout=float(env.get("WEATHER_MCP_HTTP_TIMEOUT", "30.0")),
+        )
+
+
+@dataclass
+class RequestStats:
+    """Counters for calls to ``make_nws_request``."""
+
+    requests: int = 0
+    upstream: int = 0
+    coalesced: int = 0
+    background_refreshes: int = 0
+    shared: int = 0
+
+    def reset(self) -> None:
+        self.requests = self.upstream = self.coalesced = 0
+        self.background_refreshes = self.shared = 0
+
+
+response_cache = ResponseCache.from_env()
+persistent_cache: CacheBackend | None = SQLiteCache.from_env()
+request_stats = RequestStats()
+retry_policy = RetryPolicy.from_env()
+rate_limiter = RateLimiter.from_env()
+# Seconds past expiry an entry may be served while it is refreshed in the
+# background; 0 disables stale-while-revalidate.
+max_stale = float(os.environ.get("WEATHER_MCP_STALE_WHILE_REVALIDATE", "0"))
+# Seconds one worker process may hold the shared cache's lease on a URL while
+# it fetches it; the other workers wait for its response instead of fetching.
+fetch_lease = float(os.environ.get("WEATHER_MCP_FETCH_LEASE", "10.0"))
+lease_poll_interval = 0.05
+
+_inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Return the circuit breaker guarding requests to ``host``."""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        env = os.environ
+        breaker = CircuitBreaker(
+            failure_threshold=int(env.get("WEATHER_MCP_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(env.get("WEATHER_MCP_BREAKER_RESET", "30.0")),
+        )
+        _breakers[host] = breaker
+    return breaker
+
+
+_client: httpx.AsyncClient | None = None
+_client_config = HTTPClientConfig()
+_client_users = 0
+
+
+def configure_http_client(config: HTTPClientConfig) -> None:
+    """Set the pool settings used the next time the shared client is opened."""
+    global _client_config
+    _client_config = config
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide NWS client, opening it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        config = _client_config
+        http2 = config.http2
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=http2,
+            timeout=config.timeout,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and drop its pooled connections."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+@asynccontextmanager
+async def http_client_lifespan(
+    config: HTTPClientConfig | None = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Hold the shared client open for the duration of the block.
+
+    Nested and concurrent holders share one client; it is closed when the
+    last holder exits.
+    """
+    global _client_users
+    if config is not None and _client_users == 0:
+        configure_http_client(config)
+    _client_users += 1
+    try:
+        yield get_http_client()
+    finally:
+        _client_users -= 1
+        if _client_users == 0:
+            await close_http_client()
+
+
+def get_metrics() -> dict[str, Any]:
+    """Snapshot of request, cache, rate limiter and breaker counters."""
+    return {
+        "requests": asdict(request_stats),
+        "cache": asdict(response_cache.stats()),
+        "persistent_cache": persistent_cache.stats() if persistent_cache else None,
+        "rate_limiter": {
+            lane: asdict(stats) for lane, stats in rate_limiter.stats().items()
+        },
+        "circuit_breakers": {
+            host: {"state": breaker.state, "failures": breaker.failures}
+            for host, breaker in _breakers.items()
+        },
+    }
+
+
+async def make_nws_request(
+    url: str, priority: Priority = Priority.INTERACTIVE
+) -> dict[str, Any] | None:
+    """Make a request to the NWS API, returning ``None`` on any failure."""
+    try:
+        return await fetch_nws_json(url, priority)
+    except NWSError:
+        return None
+
+
+async def fetch_nws_json(
+    url: str, priority: Priority = Priority.INTERACTIVE
+) -> dict[str, Any]:
+    """Fetch a JSON document from the NWS API.
+
+    Responses are served from ``response_cache`` while the freshness declared
+    by their ``Cache-Control``/``Expires`` headers lasts, falling back to
+    ``persistent_cache`` (when configured) on a miss. Once stale, they are
+    revalidated with ``If-None-Match``/``If-Modified-Since`` so an unchanged
+    payload costs a ``304`` instead of a full download and parse.
+
+    With ``max_stale`` set, an entry that expired less than ``max_stale``
+    seconds ago is returned immediately while a background task refreshes it;
+    older entries make the caller wait for the refresh.
+
+    Concurrent calls for the same URL share a single upstream fetch. A caller
+    that is cancelled stops waiting but leaves the fetch running for the rest.
+    Worker processes sharing ``persistent_cache`` coordinate the same way: the
+    one holding the URL's lease fetches it and the others read its response.
+    Upstream requests pass through ``rate_limiter``; background fetches queue
+    behind interactive ones and are promoted when an interactive caller joins.
+
+    Args:
+        url: Full NWS API URL
+        priority: Rate limiter lane for the upstream request
+
+    Raises:
+        NWSError: The request failed; the message says why.
+    """
+    request_stats.requests += 1
+    cached = response_cache.get(url, max_stale)
+    if cached is not None:
+        if not cached.is_fresh(response_cache.clock()) and url not in _inflight:
+            request_stats.background_refreshes += 1
+            _start_fetch(url, Priority.BACKGROUND)
+        return cached.data
+
+    task = _inflight.get(url)
+    if task is None:
+        task = _start_fetch(url, priority)
+    else:
+        request_stats.coalesced += 1
+        if priority == Priority.INTERACTIVE:
+            rate_limiter.promote(url)
+    return await asyncio.shield(task)
+
+
+def _start_fetch(url: str, priority: Priority) -> asyncio.Task[dict[str, Any]]:
+    request_stats.upstream += 1
+    task = asyncio.create_task(_fetch(url, priority))
+    _inflight[url] = task
+    task.add_done_callback(lambda done: _finish_inflight(url, done))
+    return task
+
+
+def _finish_inflight(url: str, task: asyncio.Task[dict[str, Any]]) -> None:
+    if _inflight.get(url) is task:
+        del _inflight[url]
+    if not task.cancelled():
+        # Mark the outcome as retrieved even if every waiter was cancelled.
+        task.exception()
+
+
+async def _fetch(url: str, priority: Priority) -> dict[str, Any]:
+    """Fetch ``url`` with retries, guarded by the host's circuit breaker."""
+    stale = response_cache.peek(url)
+    stored = await _read_persistent(url)
+    if stored is not None and (stale is None or stored.expires_at > stale.expires_at):
+        # Written by an earlier run or another worker process.
+        response_cache.put(url, stored)
+        if stored.is_fresh(response_cache.clock()):
+            return stored.data
+        stale = stored
+
+    if not await _claim_persistent(url):
+        shared = await _wait_for_lease(url)
+        if shared is not None:
+            request_stats.shared += 1
+            response_cache.put(url, shared)
+            return shared.data
+    try:
+        return await _fetch_upstream(url, priority, stale)
+    finally:
+        await _release_persistent(url)
+
+
+async def _fetch_upstream(
+    url: str, priority: Priority, stale: CacheEntry | None
+) -> dict[str, Any]:
     headers = {"User-Agent": USER_AGENT, "Accept": "application/geo+json"}
-    async with httpx.AsyncClient() as client:
+    if stale is not None:
+        headers.update(stale.conditional_headers())
+
+    host = httpx.URL(url).host
+    breaker = get_circuit_breaker(host)
+    client = get_http_client()
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise NWSUnavailableError(
+                f"{host} is temporarily unavailable ({breaker.last_error}); "
+                f"retrying in {breaker.retry_in():.0f}s"
+            )
+        attempt += 1
+        retry_after = None
+        error: NWSError
+        await rate_limiter.acquire(priority, key=url)
+        try:
+            response = await client.get(
+                url, headers=headers, timeout=_client_config.timeout
+            )
+        except httpx.TimeoutException:
+            error = NWSConnectionError("NWS API request timed out")
+        except Exception as exc:
+            error = NWSConnectionError(f"NWS API request failed: {exc}")
+        else:
+            if response.status_code not in retry_policy.retry_statuses:
+                breaker.record_success()
+                data, entry = _store_response(url, response, stale)
+                if entry is not None:
+                    await _write_persistent(url, entry)
+                return data
+            error = NWSHTTPError(response.status_code)
+            retry_after = parse_retry_after(
+                response.headers.get("retry-after"), time.time()
+            )
+
+        breaker.record_failure(str(error))
+        delay = retry_policy.delay(attempt, retry_after)
+        if delay is None:
+            raise error
+        logger.info("Retrying %s in %.2fs after: %s", url, delay, error)
+        await asyncio.sleep(delay)
+
+
+async def _read_persistent(url: str) -> CacheEntry | None:
+    if persistent_cache is None:
+        return None
+    try:
+        return await asyncio.to_thread(persistent_cache.get, url)
+    except Exception:
+        logger.warning("Persistent cache read failed for %s", url, exc_info=True)
+        return None
+
+
+async def _claim_persistent(url: str) -> bool:
+    if persistent_cache is None:
+        return True
+    try:
+        return await asyncio.to_thread(persistent_cache.claim, url, fetch_lease)
+    except Exception:
+        logger.warning("Persistent cache lease failed for %s", url, exc_info=True)
+        return True
+
+
+async def _release_persistent(url: str) -> None:
+    if persistent_cache is None:
+        return
+    try:
+        await asyncio.to_thread(persistent_cache.release, url)
+    except Exception:
+        logger.warning("Persistent cache release failed for %s", url, exc_info=True)
+
+
+async def _wait_for_lease(url: str) -> CacheEntry | None:
+    """Wait while another worker process fetches ``url``.
+
+    Returns the fresh entry it stored, or None once this process may fetch
+    the URL itself: the lease was released without a response, or expired.
+    Each poll only reads the entry's expiry and the lease row; the body is
+    loaded once it is fresh.
+    """
+    assert persistent_cache is not None
+    deadline = time.monotonic() + fetch_lease
+    while time.monotonic() < deadline:
+        await asyncio.sleep(lease_poll_interval)
         try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
+            expires_at, leased = await asyncio.to_thread(_poll_lease, url)
         except Exception:
+            logger.warning("Persistent cache poll failed for %s", url, exc_info=True)
+            return None
+        if expires_at is not None and expires_at > response_cache.clock():
+            stored = await _read_persistent(url)
+            if stored is not None and stored.is_fresh(response_cache.clock()):
+                return stored
+        if not leased and await _claim_persistent(url):
             return None
+    return None
+
+
+def _poll_lease(url: str) -> tuple[float | None, bool]:
+    assert persistent_cache is not None
+    return persistent_cache.expires_at(url), persistent_cache.leased(url)
+
+
+async def _write_persistent(url: str, entry: CacheEntry) -> None:
+    if persistent_cache is None:
+        return
+    try:
+        await asyncio.to_thread(persistent_cache.put, url, entry)
+    except Exception:
+        logger.warning("Persistent cache write failed for %s", url, exc_info=True)
+
+
+def _store_response(
+    url: str, response: httpx.Response, stale: CacheEntry | None
+) -> tuple[dict[str, Any], CacheEntry | None]:
+    """Cache a response and return its payload and the entry to persist."""
+    now = response_cache.clock()
+    ttl = freshness_lifetime(response.headers, now)
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+
+    if response.status_code == 304 and stale is not None:
+        stale.expires_at = now + ttl
+        stale.etag = etag or stale.etag
+        stale.last_modified = last_modified or stale.last_modified
+        if response_cache.refresh(url, stale.expires_at) is None:
+            response_cache.put(url, stale)
+        return stale.data, stale
+
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        raise NWSHTTPError(exc.response.status_code) from exc
+    try:
+        data: dict[str, Any] = response.json()
+    except ValueError as exc:
+        raise NWSError("NWS API returned an invalid JSON body") from exc
+
+    if not (ttl > 0 or etag or last_modified):
+        return data, None
+    entry = CacheEntry(data, len(response.content), now + ttl, etag, last_modified)
+    response_cache.put(url, entry)
+    return data, entry
@@ -0,0 +1,91 @@
+"""
+Formatting of NWS station observations.
+"""
+
+import math
+from typing import Any
+
+_COMPASS = (
+    "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+    "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW",
+)  # fmt: skip
+
+# (scale, offset, label) applied as value * scale + offset.
+_US_UNITS: dict[str, tuple[float, float, str]] = {
+    "wmoUnit:degC": (1.8, 32.0, "°F"),
+    "wmoUnit:km_h-1": (0.621371, 0.0, "mph"),
+    "wmoUnit:m": (1 / 1609.344, 0.0, "mi"),
+    "wmoUnit:Pa": (1 / 3386.389, 0.0, "inHg"),
+    "wmoUnit:percent": (1.0, 0.0, "%"),
+}
+
+
+def compass_point(degrees: float) -> str:
+    """Sixteen-point compass name for a wind direction in degrees."""
+    return _COMPASS[round(degrees % 360 / 22.5) % 16]
+
+
+def measurement(quantity: dict[str, Any] | None) -> tuple[float, str] | None:
+    """Convert an NWS ``{value, unitCode}`` quantity to US units.
+
+    Returns None when the station did not report the quantity.
+    """
+    if not quantity or quantity.get("value") is None:
+        return None
+    value = float(quantity["value"])
+    if math.isnan(value):
+        return None
+    unit = quantity.get("unitCode") or ""
+    scale, offset, label = _US_UNITS.get(
+        unit, (1.0, 0.0, unit.removeprefix("wmoUnit:"))
+    )
+    return value * scale + offset, label
+
+
+def _describe(quantity: dict[str, Any] | None, decimals: int = 0) -> str | None:
+    converted = measurement(quantity)
+    if converted is None:
+        return None
+    value, label = converted
+    separator = "" if label in ("°F", "%") else " "
+    return f"{value:.{decimals}f}{separator}{label}"
+
+
+def format_observation(observation: dict[str, Any], station: str | None = None) -> str:
+    """Format a ``/stations/{id}/observations/latest`` response.
+
+    Args:
+        observation: The observation response
+        station: Station label such as ``"KLAX (Los Angeles Airport)"``
+    """
+    props = observation.get("properties") or {}
+    lines = []
+    if props.get("textDescription"):
+        lines.append(f"Conditions: {props['textDescription']}")
+
+    temperature = _describe(props.get("temperature"))
+    if temperature:
+        lines.append(f"Temperature: {temperature}")
+    wind = _describe(props.get("windSpeed"))
+    if wind:
+        direction = measurement(props.get("windDirection"))
+        if direction is not None:
+            wind += f" from {compass_point(direction[0])}"
+        lines.append(f"Wind: {wind}")
+    for label, key, decimals in (
+        ("Humidity", "relativeHumidity", 0),
+        ("Dewpoint", "dewpoint", 0),
+        ("Visibility", "visibility", 1),
+        ("Pressure", "barometricPressure", 2),
+    ):
+        text = _describe(props.get(key), decimals)
+        if text:
+            lines.append(f"{label}: {text}")
+
+    if not lines:
+        return "No recent observation available."
+    if props.get("timestamp"):
+        lines.insert(0, f"Observed: {props['timestamp']}")
+    if station:
+        lines.insert(0, f"Station: {station}")
+    return "\n".join(lines)
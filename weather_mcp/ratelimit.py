@@ -0,0 +1,163 @@
+"""
+Client-side rate limiting for NWS API traffic.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """Request lanes, served lowest value first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass(frozen=True)
+class LaneStats:
+    """Counters for one priority lane of a rate limiter."""
+
+    queued: int
+    granted: int
+    total_wait: float
+    max_wait: float
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future[None]
+    key: str | None
+    enqueued_at: float
+
+
+class RateLimiter:
+    """Token bucket shared by all NWS requests.
+
+    A request that finds a token and nobody of equal or higher priority
+    queued goes straight through, so interactive calls add no latency while
+    the bucket has capacity. Otherwise it waits in its lane; interactive
+    waiters are always granted before background ones.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lanes: dict[Priority, deque[_Waiter]] = {p: deque() for p in Priority}
+        self._granted = {p: 0 for p in Priority}
+        self._total_wait = {p: 0.0 for p in Priority}
+        self._max_wait = {p: 0.0 for p in Priority}
+        self._timer: asyncio.TimerHandle | None = None
+
+    @classmethod
+    def from_env(cls, shares: int = 1) -> "RateLimiter":
+        """Build a limiter from ``WEATHER_MCP_RATE_*`` environment variables.
+
+        A rate of ``0`` disables limiting. With ``shares`` processes calling
+        NWS, each gets an equal part of the configured rate and burst.
+        """
+        env = os.environ
+        return cls(
+            rate=float(env.get("WEATHER_MCP_RATE_LIMIT", "10.0")) / shares,
+            burst=max(1, int(env.get("WEATHER_MCP_RATE_BURST", "10")) // shares),
+        )
+
+    def _refill(self) -> None:
+        now = self.clock()
+        elapsed = now - self._updated
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _queued_at_or_above(self, priority: Priority) -> bool:
+        for lane_priority, lane in self._lanes.items():
+            if lane_priority > priority:
+                continue
+            while lane and lane[0].future.done():
+                lane.popleft()
+            if lane:
+                return True
+        return False
+
+    def _record(self, priority: Priority, waited: float) -> None:
+        self._granted[priority] += 1
+        self._total_wait[priority] += waited
+        self._max_wait[priority] = max(self._max_wait[priority], waited)
+
+    async def acquire(
+        self, priority: Priority = Priority.INTERACTIVE, key: str | None = None
+    ) -> None:
+        """Wait for a token in ``priority``'s lane.
+
+        Args:
+            priority: Lane to queue in
+            key: Identifies the waiter so :meth:`promote` can find it
+        """
+        if self.rate <= 0:
+            self._record(priority, 0.0)
+            return
+        self._refill()
+        if self._tokens >= 1 and not self._queued_at_or_above(priority):
+            self._tokens -= 1
+            self._record(priority, 0.0)
+            return
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), key, self.clock())
+        self._lanes[priority].append(waiter)
+        self._schedule()
+        await waiter.future
+
+    def promote(self, key: str) -> None:
+        """Move a queued background waiter into the interactive lane."""
+        for priority, lane in self._lanes.items():
+            if priority == Priority.INTERACTIVE:
+                continue
+            for waiter in lane:
+                if waiter.key == key:
+                    lane.remove(waiter)
+                    self._lanes[Priority.INTERACTIVE].append(waiter)
+                    return
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not any(self._lanes.values()):
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._grant)
+
+    def _grant(self) -> None:
+        self._timer = None
+        self._refill()
+        now = self.clock()
+        for priority in Priority:
+            lane = self._lanes[priority]
+            while lane and self._tokens >= 1:
+                waiter = lane.popleft()
+                if waiter.future.done():
+                    continue
+                self._tokens -= 1
+                waiter.future.set_result(None)
+                self._record(priority, now - waiter.enqueued_at)
+        self._schedule()
+
+    def stats(self) -> dict[str, LaneStats]:
+        """Queue depth and wait-time counters keyed by lane name."""
+        return {
+            priority.name.lower(): LaneStats(
+                queued=sum(not w.future.done() for w in self._lanes[priority]),
+                granted=self._granted[priority],
+                total_wait=self._total_wait[priority],
+                max_wait=self._max_wait[priority],
+            )
+            for priority in Priority
+        }
@@ -0,0 +1,199 @@
+"""
+Compact records for alerts and forecast periods parsed from NWS GeoJSON.
+"""
+
+import sys
+from typing import Any
+from weather_mcp.spatial import Polygon, polygons_from_geometry
+
+
+def _intern(value: Any) -> str | None:
+    """Share one copy of a repeated string value, such as a severity."""
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+def _text(value: Any) -> str | None:
+    return value if isinstance(value, str) else None
+
+
+class AlertRecord:
+    """The fields of one NWS alert feature that this server uses.
+
+    Records use ``__slots__`` instead of the nested dicts ``response.json()``
+    produces. Enumerated values (severity, urgency, certainty, status,
+    message type), event names, area descriptions and UGC codes are interned,
+    so the thousands of alerts in a national snapshot share one copy of each.
+    Polygons are kept as NumPy vertex arrays ready for the spatial index.
+    """
+
+    __slots__ = (
+        "id",
+        "event",
+        "area",
+        "severity",
+        "urgency",
+        "certainty",
+        "status",
+        "message_type",
+        "sent",
+        "onset",
+        "expires",
+        "ends",
+        "headline",
+        "description",
+        "instruction",
+        "zones",
+        "affected_zones",
+        "references",
+        "polygons",
+    )
+
+    def __init__(
+        self,
+        id: str = "",
+        event: str | None = None,
+        area: str | None = None,
+        severity: str | None = None,
+        urgency: str | None = None,
+        certainty: str | None = None,
+        status: str | None = None,
+        message_type: str | None = None,
+        sent: str | None = None,
+        onset: str | None = None,
+        expires: str | None = None,
+        ends: str | None = None,
+        headline: str | None = None,
+        description: str | None = None,
+        instruction: str | None = None,
+        zones: tuple[str, ...] = (),
+        affected_zones: tuple[str, ...] = (),
+        references: tuple[str, ...] = (),
+        polygons: list[Polygon] | None = None,
+    ) -> None:
+        self.id = id
+        self.event = event
+        self.area = area
+        self.severity = severity
+        self.urgency = urgency
+        self.certainty = certainty
+        self.status = status
+        self.message_type = message_type
+        self.sent = sent
+        self.onset = onset
+        self.expires = expires
+        self.ends = ends
+        self.headline = headline
+        self.description = description
+        self.instruction = instruction
+        self.zones = zones
+        self.affected_zones = affected_zones
+        self.references = references
+        self.polygons = polygons or []
+
+    @classmethod
+    def from_feature(cls, feature: dict[str, Any]) -> "AlertRecord":
+        """Build a record from one GeoJSON feature of an ``/alerts`` response."""
+        props = feature.get("properties") or {}
+        geocode = props.get("geocode") or {}
+        references: list[str] = []
+        for ref in props.get("references") or []:
+            references.extend(filter(None, (ref.get("@id"), ref.get("identifier"))))
+        return cls(
+            id=str(feature.get("id") or props.get("id") or ""),
+            event=_intern(props.get("event")),
+            area=_intern(props.get("areaDesc")),
+            severity=_intern(props.get("severity")),
+            urgency=_intern(props.get("urgency")),
+            certainty=_intern(props.get("certainty")),
+            status=_intern(props.get("status")),
+            message_type=_intern(props.get("messageType")),
+            sent=_text(props.get("sent")),
+            onset=_text(props.get("onset")),
+            expires=_text(props.get("expires")),
+            ends=_text(props.get("ends")),
+            headline=_text(props.get("headline")),
+            description=_text(props.get("description")),
+            instruction=_text(props.get("instruction")),
+            zones=tuple(sys.intern(zone) for zone in geocode.get("UGC") or ()),
+            affected_zones=tuple(
+                sys.intern(url) for url in props.get("affectedZones") or ()
+            ),
+            references=tuple(references),
+            polygons=polygons_from_geometry(feature.get("geometry")),
+        )
+
+    @property
+    def version(self) -> tuple[str | None, str | None, str | None]:
+        """Fields NWS changes whenever it reissues an alert under the same id."""
+        return self.sent, self.expires, self.message_type
+
+    def __repr__(self) -> str:
+        return f"AlertRecord(id={self.id!r}, event={self.event!r})"
+
+
+def alert_records(features: list[dict[str, Any]]) -> list[AlertRecord]:
+    """Records for every feature of an ``/alerts`` response."""
+    return [AlertRecord.from_feature(feature) for feature in features]
+
+
+class ForecastPeriod:
+    """One period of a ``/gridpoints/.../forecast`` response."""
+
+    __slots__ = (
+        "name",
+        "start",
+        "temperature",
+        "temperature_unit",
+        "wind_speed",
+        "wind_direction",
+        "precipitation",
+        "short_forecast",
+        "detailed_forecast",
+    )
+
+    def __init__(
+        self,
+        name: str | None = None,
+        start: str | None = None,
+        temperature: float | None = None,
+        temperature_unit: str | None = None,
+        wind_speed: str | None = None,
+        wind_direction: str | None = None,
+        precipitation: float | None = None,
+        short_forecast: str | None = None,
+        detailed_forecast: str | None = None,
+    ) -> None:
+        self.name = name
+        self.start = start
+        self.temperature = temperature
+        self.temperature_unit = temperature_unit
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        self.precipitation = precipitation
+        self.short_forecast = short_forecast
+        self.detailed_forecast = detailed_forecast
+
+    @classmethod
+    def from_dict(cls, period: dict[str, Any]) -> "ForecastPeriod":
+        """Build a record from one entry of ``properties.periods``."""
+        precipitation = period.get("probabilityOfPrecipitation") or {}
+        return cls(
+            name=_intern(period.get("name")),
+            start=_text(period.get("startTime")),
+            temperature=period.get("temperature"),
+            temperature_unit=_intern(period.get("temperatureUnit")),
+            wind_speed=_intern(period.get("windSpeed")),
+            wind_direction=_intern(period.get("windDirection")),
+            precipitation=precipitation.get("value"),
+            short_forecast=_intern(period.get("shortForecast")),
+            detailed_forecast=_text(period.get("detailedForecast")),
+        )
+
+    def __repr__(self) -> str:
+        return f"ForecastPeriod(name={self.name!r})"
+
+
+def forecast_periods(forecast_data: dict[str, Any]) -> list[ForecastPeriod]:
+    """Records for every period of a forecast response."""
+    periods = (forecast_data.get("properties") or {}).get("periods") or []
+    return [ForecastPeriod.from_dict(period) for period in periods]
@@ -0,0 +1,120 @@
+"""
+Retry and circuit breaker policies for NWS API requests.
+"""
+
+import os
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient NWS failures."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    retry_statuses: frozenset[int] = field(default=RETRYABLE_STATUSES)
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from ``WEATHER_MCP_RETRY_*`` environment variables."""
+        env = os.environ
+        return cls(
+            max_attempts=int(env.get("WEATHER_MCP_RETRY_ATTEMPTS", "3")),
+            base_delay=float(env.get("WEATHER_MCP_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(env.get("WEATHER_MCP_RETRY_MAX_DELAY", "10.0")),
+        )
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Seconds to wait before retry number ``attempt`` (1-based).
+
+        Returns ``None`` when no further attempt should be made, including
+        when the server's ``Retry-After`` asks for longer than ``max_delay``.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: str | None, now: float) -> float | None:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Fail fast while a host keeps failing, probing again after a cool-off.
+
+    The breaker opens after ``failure_threshold`` consecutive failures. Once
+    ``reset_timeout`` has passed a single probe request is let through; its
+    success closes the breaker and its failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.last_error: str | None = None
+        self._opened_at = 0.0
+        self._probing = False
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - self.clock())
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state == self.OPEN:
+            if self.retry_in() > 0:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self.last_error = None
+        self._probing = False
+
+    def record_failure(self, reason: str) -> None:
+        self.failures += 1
+        self.last_error = reason
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = self.clock()
@@ -2,34 +2,444 @@
 Weather MCP server implementation.
 """
 
-from mcp.server.fastmcp import FastMCP
-from weather_mcp.tools import get_alerts as get_alerts_tool, get_forecast
+import argparse
+import os
+import sys
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import AnyUrl
+from starlette.applications import Starlette
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from weather_mcp import nws_api
+from weather_mcp.alerts import alert_snapshot
+from weather_mcp.config import env_flag
+from weather_mcp.gridpoints import gridpoint_index
+from weather_mcp.mcp_compat import advertise_resource_subscribe, on_session_close
+from weather_mcp.nws_api import HTTPClientConfig, get_metrics, http_client_lifespan
+from weather_mcp.ratelimit import RateLimiter
+from weather_mcp.stations import station_catalog
+from weather_mcp.subscriptions import alert_subscriptions
+from weather_mcp.tools import (
+    ForecastBatchItem,
+    format_point_forecast,
+    get_alert_changes,
+    get_alerts as get_alerts_tool,
+    get_alerts_batch,
+    get_alerts_for_point,
+    get_conditions,
+    get_current_observations,
+    get_forecast,
+    get_forecast_batch,
+    get_gridpoint_timeseries,
+    render_cache,
+)
+from weather_mcp.warmup import warmup
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Keep the pooled NWS client and background pollers up while sessions run."""
+    async with (
+        http_client_lifespan(HTTPClientConfig.from_env()),
+        gridpoint_index.running(),
+        alert_subscriptions.running(),
+        alert_snapshot.running(),
+        station_catalog.running(),
+        warmup.running(),
+    ):
+        yield
+
 
 mcp = FastMCP(
     name="weather",
-    host="0.0.0.0",
-    port=8000,
+    host=os.environ.get("WEATHER_MCP_HOST", "0.0.0.0"),
+    port=int(os.environ.get("WEATHER_MCP_PORT", "8000")),
+    lifespan=server_lifespan,
 )
 
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_route(request: Request) -> JSONResponse:
+    """Expose NWS client counters for monitoring."""
+    metrics = get_metrics()
+    metrics["subscriptions"] = asdict(alert_subscriptions.stats())
+    metrics["render_cache"] = asdict(render_cache.stats())
+    return JSONResponse(metrics)
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready_route(request: Request) -> JSONResponse:
+    """Report readiness: 503 until the startup warm-up has finished."""
+    stats = warmup.stats()
+    return JSONResponse(asdict(stats), status_code=200 if stats.ready else 503)
+
+
 @mcp.tool(name="get_alerts")
-async def _mcp_get_alerts_tool_impl(state: str) -> str:
+async def _mcp_get_alerts_tool_impl(
+    state: str,
+    severity: str | None = None,
+    urgency: str | None = None,
+    event: str | None = None,
+    status: str | None = None,
+    message_type: str | None = None,
+    certainty: str | None = None,
+    output: str = "text",
+    max_bytes: int | None = None,
+    cursor: str | None = None,
+) -> str:
+    """Get active weather alerts for a US state.
+
+    Optional filters take comma-separated values, e.g. severity="Severe,Extreme"
+    or message_type="alert". Filtering happens before the text is formatted.
+    output="json" returns compact JSON ranked by severity, limited to
+    max_bytes per page; pass the returned "next" value as cursor for more.
+    """
+    filters = {
+        "severity": severity,
+        "urgency": urgency,
+        "event": event,
+        "status": status,
+        "message_type": message_type,
+        "certainty": certainty,
+    }
+    options: dict[str, Any] = {name: value for name, value in filters.items() if value}
+    if output != "text":
+        options.update(output=output, max_bytes=max_bytes, cursor=cursor)
+    return await get_alerts_tool(state, **options)
+
+
+@mcp.tool(name="get_alerts_batch")
+async def get_alerts_batch_tool(states: list[str]) -> str:
+    """Get active weather alerts for several US states at once.
+
+    Alerts spanning several of the states are listed once with every state
+    they cover; states that fail are reported separately.
+    """
+    return await get_alerts_batch(states)
+
+
+@mcp.tool(name="get_alerts_for_point")
+async def get_alerts_for_point_tool(latitude: float, longitude: float) -> str:
+    """Get active weather alerts whose area contains the given coordinates."""
+    return await get_alerts_for_point(latitude, longitude)
+
+
+@mcp.tool(name="get_alert_changes")
+async def get_alert_changes_tool(state: str, cursor: str | None = None) -> str:
+    """Get only the alerts added, updated or expired since the last call.
+
+    Pass the returned ``Cursor:`` value back on the next call.
+    """
+    return await get_alert_changes(state, cursor)
+
+
+@mcp.resource("alerts://{state}", mime_type="text/plain")
+async def alerts_resource(state: str) -> str:
+    """Active weather alerts for a US state; subscribe to get change notifications."""
     return await get_alerts_tool(state)
 
 
+def _state_from_uri(uri: AnyUrl) -> str:
+    if uri.scheme != "alerts" or not uri.host:
+        raise ValueError(f"Unknown resource: {uri}")
+    return uri.host.upper()
+
+
+@mcp._mcp_server.subscribe_resource()
+async def subscribe_alerts(uri: AnyUrl) -> None:
+    """Push ``notifications/resources/updated`` when a state's alerts change."""
+    if mcp.settings.stateless_http:
+        raise ValueError("Resource subscriptions need a stateful session")
+    state = _state_from_uri(uri)
+    session = mcp.get_context().session
+    if session not in alert_subscriptions:
+        # Drop the session's subscriptions once its connection ends.
+        on_session_close(session, lambda: alert_subscriptions.remove(session))
+
+    async def send(updated: str) -> None:
+        await session.send_resource_updated(AnyUrl(updated))
+
+    alert_subscriptions.subscribe(session, state, send, str(uri))
+
+
+@mcp._mcp_server.unsubscribe_resource()
+async def unsubscribe_alerts(uri: AnyUrl) -> None:
+    alert_subscriptions.unsubscribe(mcp.get_context().session, _state_from_uri(uri))
+
+
+# Stateless servers have no session to notify.
+advertise_resource_subscribe(mcp._mcp_server, lambda: not mcp.settings.stateless_http)
+
+
 @mcp.tool(name="get_forecast")
-async def get_forecast_tool(latitude: float, longitude: float) -> str:
-    """Get weather forecast for given coordinates."""
+async def get_forecast_tool(
+    latitude: float,
+    longitude: float,
+    output: str = "text",
+    max_bytes: int | None = None,
+    cursor: str | None = None,
+) -> str:
+    """Get weather forecast for given coordinates.
+
+    output="json" returns every forecast period as compact JSON, limited to
+    max_bytes per page; pass the returned "next" value as cursor for more.
+    """
+    if output != "text":
+        return await get_forecast(latitude, longitude, output, max_bytes, cursor)
     return await get_forecast(latitude, longitude)
 
 
-if __name__ == "__main__":  # pragma: no cover
-    TRANSPORT = "sse"
-    if TRANSPORT == "stdio":
-        print("Running server with stdio transport")
+@mcp.tool(name="get_current_observations")
+async def get_current_observations_tool(latitude: float, longitude: float) -> str:
+    """Get the latest observation from the station nearest to coordinates."""
+    return await get_current_observations(latitude, longitude)
+
+
+@mcp.tool(name="get_conditions")
+async def get_conditions_tool(latitude: float, longitude: float) -> str:
+    """Get the forecast, active alerts and latest observation for coordinates.
+
+    The three parts are fetched concurrently; one that is too slow is reported
+    as timed out instead of delaying the others.
+    """
+    return await get_conditions(latitude, longitude)
+
+
+@mcp.tool(name="get_forecast_batch")
+async def get_forecast_batch_tool(
+    points: list[tuple[float, float]], ctx: Context
+) -> str:
+    """Get weather forecasts for many (latitude, longitude) points at once.
+
+    Points in the same NWS grid cell share one forecast request. Each grid
+    cell's forecast is streamed as a progress notification when it arrives.
+    """
+    done = 0
+
+    async def report(item: ForecastBatchItem) -> None:
+        nonlocal done
+        done += len(item.indices)
+        message = "\n===\n".join(
+            format_point_forecast(points[position], item.text)
+            for position in item.indices
+        )
+        await ctx.report_progress(done, len(points), message)
+
+    return await get_forecast_batch(points, on_result=report)
+
+
+@mcp.tool(name="get_gridpoint_timeseries")
+async def get_gridpoint_timeseries_tool(
+    points: list[tuple[float, float]],
+    hours: int = 24,
+    step: int = 1,
+    units: str = "us",
+    layers: list[str] | None = None,
+) -> str:
+    """Get hourly temperature, precipitation, wind and QPF for many points.
+
+    Returns one CSV table per (latitude, longitude) point, starting at the
+    current hour. ``step`` groups hours into coarser rows, ``units`` is "us"
+    or "si", and ``layers`` picks NWS gridData layers by name.
+    """
+    return await get_gridpoint_timeseries(points, hours, step, units, layers)
+
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+
+def default_json_response(compress_min_bytes: int) -> bool:
+    """Whether streamable HTTP answers with JSON unless told otherwise.
+
+    ``WEATHER_MCP_JSON_RESPONSE`` decides when set. Otherwise JSON is used
+    while compression is on, since event streams are never compressed.
+    """
+    return env_flag("WEATHER_MCP_JSON_RESPONSE", compress_min_bytes > 0)
+
+
+def add_compression(app: Starlette, minimum_size: int) -> str:
+    """Compress responses of at least ``minimum_size`` bytes.
+
+    Uses gzip, or Brotli with gzip fallback when ``brotli-asgi`` is
+    installed and the streamable HTTP transport answers with plain JSON.
+    Event streams are never compressed, so SSE messages are not held back.
+    Returns the preferred encoding.
+    """
+    if mcp.settings.json_response:
+        try:
+            from brotli_asgi import BrotliMiddleware
+        except ImportError:
+            pass
+        else:
+            app.add_middleware(
+                BrotliMiddleware, minimum_size=minimum_size, gzip_fallback=True
+            )
+            return "br"
+    app.add_middleware(GZipMiddleware, minimum_size=minimum_size)
+    return "gzip"
+
+
+def http_app(transport: str, compress_min_bytes: int = 1024) -> Starlette:
+    """The Starlette app serving ``transport`` over HTTP.
+
+    The app's lifespan holds the pooled NWS client and background pollers
+    for as long as the process serves requests, so they outlive individual
+    sessions (and, in stateless mode, individual requests). Responses of at
+    least ``compress_min_bytes`` are compressed; 0 disables compression.
+    """
+    app = mcp.sse_app() if transport == "sse" else mcp.streamable_http_app()
+    transport_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with server_lifespan(mcp), transport_lifespan(app):
+            yield
+
+    app.router.lifespan_context = lifespan
+    if compress_min_bytes > 0:
+        add_compression(app, compress_min_bytes)
+    return app
+
+
+def worker_app() -> Starlette:
+    """App factory each worker process runs in multi-worker mode.
+
+    Workers share one listening socket, so consecutive requests of a client
+    can land on different processes; the streamable HTTP transport is
+    therefore run stateless, and each worker gets an equal share of the
+    upstream rate limit.
+    """
+    env = os.environ
+    # Split the upstream rate limit so N workers together stay within it.
+    nws_api.rate_limiter = RateLimiter.from_env(
+        shares=int(env.get("WEATHER_MCP_WORKERS", "1"))
+    )
+    mcp.settings.stateless_http = True
+    compress_min_bytes = int(env.get("WEATHER_MCP_COMPRESS_MIN_BYTES", "1024"))
+    mcp.settings.json_response = default_json_response(compress_min_bytes)
+    return http_app(
+        env.get("WEATHER_MCP_TRANSPORT", "streamable-http"), compress_min_bytes
+    )
+
+
+def shared_cache_path(port: int) -> str:
+    """Default SQLite response cache shared by the workers on ``port``."""
+    return str(Path(tempfile.gettempdir()) / f"weather-mcp-{port}.sqlite")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line options, defaulting to ``WEATHER_MCP_*`` variables."""
+    env = os.environ
+    parser = argparse.ArgumentParser(
+        prog="python -m weather_mcp.server", description="Run the weather MCP server."
+    )
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=env.get("WEATHER_MCP_TRANSPORT", "sse"),
+    )
+    parser.add_argument("--host", default=mcp.settings.host)
+    parser.add_argument("--port", type=int, default=mcp.settings.port)
+    parser.add_argument(
+        "--workers", type=int, default=int(env.get("WEATHER_MCP_WORKERS", "1"))
+    )
+    parser.add_argument(
+        "--stateless",
+        action=argparse.BooleanOptionalAction,
+        default=env_flag("WEATHER_MCP_STATELESS_HTTP"),
+        help="serve streamable HTTP without sessions (always on with --workers > 1)",
+    )
+    parser.add_argument(
+        "--json-response",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="answer streamable HTTP requests with JSON instead of an event "
+        "stream (default: on while compression is on, as event streams are "
+        "sent uncompressed)",
+    )
+    parser.add_argument(
+        "--compress-min-bytes",
+        type=int,
+        default=int(env.get("WEATHER_MCP_COMPRESS_MIN_BYTES", "1024")),
+        help="compress HTTP responses of at least this size (0 disables)",
+    )
+    args = parser.parse_args(argv)
+    if args.transport not in TRANSPORTS:
+        parser.error(f"unknown transport: {args.transport}")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.transport != "streamable-http":
+        parser.error(
+            "--workers above 1 needs --transport streamable-http; "
+            "stdio and SSE sessions are tied to one process"
+        )
+    if args.workers > 1:
+        args.stateless = True
+    if args.json_response is None:
+        args.json_response = default_json_response(args.compress_min_bytes)
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the server with the transport and worker count from ``argv``."""
+    args = parse_args(argv)
+    if args.transport == "stdio":
+        # stdout carries the protocol itself.
+        print("Running server with stdio transport", file=sys.stderr)
         mcp.run(transport="stdio")
-    elif TRANSPORT == "sse":
-        print("Running server with SSE transport")
-        mcp.run(transport="sse")
-    else:
-        raise ValueError(f"Unknown transport: {TRANSPORT}")
+        return
+
+    import uvicorn
+
+    mode = " (stateless)" if args.stateless and args.transport != "sse" else ""
+    print(
+        f"Running server with {args.transport} transport{mode} on "
+        f"{args.host}:{args.port} ({args.workers} worker(s))"
+    )
+    if (
+        args.transport == "streamable-http"
+        and args.compress_min_bytes > 0
+        and not args.json_response
+    ):
+        print(
+            "Warning: without --json-response, streamable HTTP replies are event "
+            "streams and are not compressed",
+            file=sys.stderr,
+        )
+    log_level = mcp.settings.log_level.lower()
+    if args.workers == 1:
+        mcp.settings.stateless_http = args.stateless and args.transport != "sse"
+        mcp.settings.json_response = args.json_response
+        uvicorn.run(
+            http_app(args.transport, args.compress_min_bytes),
+            host=args.host,
+            port=args.port,
+            log_level=log_level,
+        )
+        return
+
+    # Worker processes read their configuration from the environment.
+    os.environ["WEATHER_MCP_TRANSPORT"] = args.transport
+    os.environ["WEATHER_MCP_WORKERS"] = str(args.workers)
+    os.environ["WEATHER_MCP_JSON_RESPONSE"] = "1" if args.json_response else "0"
+    os.environ["WEATHER_MCP_COMPRESS_MIN_BYTES"] = str(args.compress_min_bytes)
+    os.environ.setdefault("WEATHER_MCP_DISK_CACHE", shared_cache_path(args.port))
+    uvicorn.run(
+        "weather_mcp.server:worker_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=log_level,
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,136 @@
+"""
+Bounding-box index and vectorized point-in-polygon tests for GeoJSON shapes.
+"""
+
+import math
+from collections import defaultdict
+from typing import Any
+import numpy as np
+
+# One polygon: its outer ring followed by any holes, each an (n, 2) array of
+# longitude/latitude vertices.
+Polygon = list[np.ndarray]
+
+
+def polygons_from_geometry(geometry: dict[str, Any] | None) -> list[Polygon]:
+    """Convert a GeoJSON Polygon, MultiPolygon or collection into polygons."""
+    if not geometry:
+        return []
+    kind = geometry.get("type")
+    if kind == "Polygon":
+        rings = [geometry.get("coordinates") or []]
+    elif kind == "MultiPolygon":
+        rings = geometry.get("coordinates") or []
+    elif kind == "GeometryCollection":
+        return [
+            polygon
+            for part in geometry.get("geometries") or []
+            for polygon in polygons_from_geometry(part)
+        ]
+    else:
+        return []
+    return [
+        [_closed_ring(ring) for ring in polygon]
+        for polygon in rings
+        if polygon and len(polygon[0]) >= 3
+    ]
+
+
+def _closed_ring(coordinates: list[list[float]]) -> np.ndarray:
+    ring = np.asarray(coordinates, dtype=np.float64)[:, :2]
+    if not np.array_equal(ring[0], ring[-1]):
+        ring = np.vstack([ring, ring[:1]])
+    return ring
+
+
+def polygon_bounds(polygons: list[Polygon]) -> tuple[float, float, float, float]:
+    """``(min_lon, min_lat, max_lon, max_lat)`` of the polygons' outer rings."""
+    vertices = np.concatenate([polygon[0] for polygon in polygons])
+    min_lon, min_lat = vertices.min(axis=0)
+    max_lon, max_lat = vertices.max(axis=0)
+    return float(min_lon), float(min_lat), float(max_lon), float(max_lat)
+
+
+def points_in_ring(ring: np.ndarray, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+    """Even-odd test of many points against one ring, vectorized over edges.
+
+    Args:
+        ring: (n, 2) longitude/latitude vertices, first repeated as last
+        lons: Point longitudes, shape (m,)
+        lats: Point latitudes, shape (m,)
+    """
+    x1 = ring[:-1, 0, None]
+    y1 = ring[:-1, 1, None]
+    x2 = ring[1:, 0, None]
+    y2 = ring[1:, 1, None]
+    straddles = (y1 > lats) != (y2 > lats)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing_x = x1 + (lats - y1) * (x2 - x1) / (y2 - y1)
+    crossings = straddles & (lons < crossing_x)
+    inside: np.ndarray = np.count_nonzero(crossings, axis=0) % 2 == 1
+    return inside
+
+
+def points_in_polygons(
+    polygons: list[Polygon], lons: np.ndarray, lats: np.ndarray
+) -> np.ndarray:
+    """Whether each point lies inside any of ``polygons`` (honoring holes)."""
+    inside = np.zeros(lons.shape, dtype=bool)
+    for outer, *holes in polygons:
+        hit = points_in_ring(outer, lons, lats)
+        for hole in holes:
+            hit &= ~points_in_ring(hole, lons, lats)
+        inside |= hit
+    return inside
+
+
+class SpatialIndex:
+    """Grid-bucketed bounding-box index over shapes made of polygons.
+
+    Each shape is registered in every ``cell_size``-degree cell its bounding
+    box touches. A query looks up its cell, filters those candidates by
+    bounding box with one array comparison, and runs the exact
+    point-in-polygon test only on the survivors.
+    """
+
+    def __init__(self, shapes: list[list[Polygon]], cell_size: float = 1.0) -> None:
+        self.shapes = shapes
+        self.cell_size = cell_size
+        self.bounds = np.empty((len(shapes), 4), dtype=np.float64)
+        cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for position, polygons in enumerate(shapes):
+            min_lon, min_lat, max_lon, max_lat = polygon_bounds(polygons)
+            self.bounds[position] = (min_lon, min_lat, max_lon, max_lat)
+            for cx in range(self._cell(min_lon), self._cell(max_lon) + 1):
+                for cy in range(self._cell(min_lat), self._cell(max_lat) + 1):
+                    cells[cx, cy].append(position)
+        self._cells = {
+            cell: np.asarray(positions, dtype=np.intp)
+            for cell, positions in cells.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.shapes)
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_size)
+
+    def query(self, longitude: float, latitude: float) -> list[int]:
+        """Positions of the shapes containing the point, in ascending order."""
+        candidates = self._cells.get((self._cell(longitude), self._cell(latitude)))
+        if candidates is None:
+            return []
+        bounds = self.bounds[candidates]
+        candidates = candidates[
+            (bounds[:, 0] <= longitude)
+            & (longitude <= bounds[:, 2])
+            & (bounds[:, 1] <= latitude)
+            & (latitude <= bounds[:, 3])
+        ]
+        lons = np.array([longitude])
+        lats = np.array([latitude])
+        return [
+            int(position)
+            for position in candidates
+            if points_in_polygons(self.shapes[position], lons, lats)[0]
+        ]
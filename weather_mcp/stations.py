@@ -0,0 +1,327 @@
+"""
+NWS observation station catalog with a nearest-station KD-tree.
+"""
+
+import asyncio
+import logging
+import math
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+import numpy as np
+from weather_mcp.config import env_flag
+from weather_mcp.nws_api import NWS_API_BASE, NWSError, fetch_nws_json
+from weather_mcp.ratelimit import Priority
+
+logger = logging.getLogger(__name__)
+
+STATIONS_URL = f"{NWS_API_BASE}/stations?limit=500"
+EARTH_RADIUS_KM = 6371.0
+
+
+def unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere; chord length orders them like great-circle."""
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    vectors: np.ndarray = np.column_stack(
+        (np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat))
+    )
+    return vectors
+
+
+class KDTree:
+    """Static KD-tree over 3-D points, stored in flat arrays.
+
+    Inner nodes split at the median of the axis with the widest spread. Leaves
+    hold up to ``leaf_size`` points as a contiguous slice of the reordered
+    point array, so each leaf visited costs one vectorized distance check.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 16) -> None:
+        self.leaf_size = leaf_size
+        # Per node: split axis (-1 for a leaf), split value, and either the
+        # child nodes or the leaf's slice of ``points``.
+        self._axis: list[int] = []
+        self._split: list[float] = []
+        self._first: list[int] = []
+        self._second: list[int] = []
+        self._filled = 0
+        order: list[np.ndarray] = []
+        if len(points):
+            self._build(points, np.arange(len(points)), order)
+        self.order = np.concatenate(order) if order else np.empty(0, dtype=np.intp)
+        self.points = points[self.order]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _build(
+        self, points: np.ndarray, positions: np.ndarray, order: list[np.ndarray]
+    ) -> int:
+        node = len(self._axis)
+        self._axis.append(-1)
+        self._split.append(0.0)
+        self._first.append(0)
+        self._second.append(0)
+        if len(positions) <= self.leaf_size:
+            start = self._filled
+            self._filled += len(positions)
+            order.append(positions)
+            self._first[node] = start
+            self._second[node] = start + len(positions)
+            return node
+
+        subset = points[positions]
+        axis = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+        middle = len(positions) // 2
+        sorted_positions = positions[np.argpartition(subset[:, axis], middle)]
+        self._axis[node] = axis
+        self._split[node] = float(points[sorted_positions[middle], axis])
+        self._first[node] = self._build(points, sorted_positions[:middle], order)
+        self._second[node] = self._build(points, sorted_positions[middle:], order)
+        return node
+
+    def nearest(self, target: np.ndarray) -> tuple[int, float]:
+        """Position and squared distance of the point closest to ``target``.
+
+        Returns ``(-1, inf)`` for an empty tree.
+        """
+        best, best_distance = -1, math.inf
+        if not self._axis:
+            return best, best_distance
+        coordinates = target.tolist()
+        stack: list[tuple[int, float]] = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_distance:
+                continue
+            axis = self._axis[node]
+            if axis < 0:
+                start, end = self._first[node], self._second[node]
+                distances = ((self.points[start:end] - target) ** 2).sum(axis=1)
+                local = int(np.argmin(distances))
+                if distances[local] < best_distance:
+                    best_distance = float(distances[local])
+                    best = int(self.order[start + local])
+                continue
+            gap = coordinates[axis] - self._split[node]
+            near, far = (
+                (self._first[node], self._second[node])
+                if gap < 0
+                else (self._second[node], self._first[node])
+            )
+            stack.append((far, gap * gap))
+            stack.append((near, 0.0))
+        return best, best_distance
+
+
+@dataclass(frozen=True)
+class Station:
+    """An observation station and its distance from a query point."""
+
+    identifier: str
+    name: str | None
+    latitude: float
+    longitude: float
+    distance_km: float
+
+    @property
+    def label(self) -> str:
+        miles = self.distance_km / 1.609344
+        name = f" ({self.name})" if self.name else ""
+        return f"{self.identifier}{name}, {miles:.0f} mi away"
+
+
+class StationIndex:
+    """Array-backed station table answering nearest-station queries."""
+
+    def __init__(
+        self,
+        identifiers: list[str],
+        names: list[str | None],
+        coordinates: np.ndarray,
+    ) -> None:
+        self.identifiers = identifiers
+        self.names = names
+        self.coordinates = coordinates
+        self.tree = KDTree(unit_vectors(coordinates[:, 0], coordinates[:, 1]))
+
+    def __len__(self) -> int:
+        return len(self.identifiers)
+
+    def nearest(self, latitude: float, longitude: float) -> Station | None:
+        """The station closest to the point, or None if the index is empty."""
+        target = unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+        position, chord_squared = self.tree.nearest(target)
+        if position < 0:
+            return None
+        chord = math.sqrt(chord_squared)
+        angle = 2 * math.asin(min(1.0, chord / 2))
+        return Station(
+            identifier=self.identifiers[position],
+            name=self.names[position],
+            latitude=float(self.coordinates[position, 0]),
+            longitude=float(self.coordinates[position, 1]),
+            distance_km=EARTH_RADIUS_KM * angle,
+        )
+
+
+def _station_entry(feature: dict[str, Any]) -> tuple[str, str | None, float, float]:
+    props = feature.get("properties") or {}
+    longitude, latitude = (feature.get("geometry") or {})["coordinates"][:2]
+    return props["stationIdentifier"], props.get("name"), latitude, longitude
+
+
+class StationCatalog:
+    """Periodically refreshed catalog of NWS observation stations.
+
+    The catalog is built from the paginated ``/stations`` listing. A refresh
+    walks the pages and upserts stations into the existing table, so pages
+    that come back unchanged (usually ``304 Not Modified`` from the response
+    cache) cost nothing. Stations missing from a complete sweep are removed.
+    The KD-tree is rebuilt only when the table changed: after every changed
+    page until the first sweep completes, so lookups work during the initial
+    load, and once per sweep after that.
+    """
+
+    def __init__(
+        self, enabled: bool = False, interval: float = 24 * 3600.0, max_pages: int = 200
+    ) -> None:
+        self.enabled = enabled
+        self.interval = interval
+        self.max_pages = max_pages
+        self.index: StationIndex | None = None
+        self.complete = False
+        self._table: dict[str, tuple[str | None, float, float]] = {}
+        # Whether the table changed since the index was last rebuilt.
+        self._changed = False
+        self._task: asyncio.Task[None] | None = None
+        self._users = 0
+
+    @classmethod
+    def from_env(cls) -> "StationCatalog":
+        """Build from ``WEATHER_MCP_STATION_CATALOG*`` environment variables."""
+        env = os.environ
+        return cls(
+            enabled=env_flag("WEATHER_MCP_STATION_CATALOG"),
+            interval=float(env.get("WEATHER_MCP_STATION_CATALOG_INTERVAL", "86400.0")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def clear(self) -> None:
+        self._table.clear()
+        self.index = None
+        self.complete = False
+        self._changed = False
+
+    def current(self) -> StationIndex | None:
+        """Return the index if catalog mode is on and it has stations."""
+        if not self.enabled or self.index is None or not len(self.index):
+            return None
+        return self.index
+
+    def upsert(self, features: list[dict[str, Any]]) -> int:
+        """Add or update stations from ``/stations`` features.
+
+        Returns how many stations were added or changed.
+        """
+        changed = 0
+        for feature in features:
+            try:
+                identifier, name, latitude, longitude = _station_entry(feature)
+            except (KeyError, TypeError, ValueError):
+                continue
+            entry = (name, float(latitude), float(longitude))
+            if self._table.get(identifier) != entry:
+                self._table[identifier] = entry
+                changed += 1
+        self._changed |= changed > 0
+        return changed
+
+    def rebuild(self) -> StationIndex:
+        identifiers = list(self._table)
+        names = [self._table[identifier][0] for identifier in identifiers]
+        coordinates = np.array(
+            [self._table[identifier][1:] for identifier in identifiers],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        self.index = StationIndex(identifiers, names, coordinates)
+        self._changed = False
+        return self.index
+
+    async def refresh(self) -> None:
+        """Sweep every page of the station listing into the catalog.
+
+        The index is rebuilt on the way out even when a page fails, so
+        stations upserted before the error are served rather than waiting
+        for the next sweep.
+        """
+        seen: set[str] = set()
+        url: str | None = STATIONS_URL
+        pages = 0
+        try:
+            while url and pages < self.max_pages:
+                data = await fetch_nws_json(url, Priority.BACKGROUND)
+                features = data.get("features") or []
+                if not features:
+                    # Cursor pagination ends on an empty page.
+                    url = None
+                    break
+                seen.update(
+                    (feature.get("properties") or {}).get("stationIdentifier", "")
+                    for feature in features
+                )
+                self.upsert(features)
+                if self._changed and not self.complete:
+                    self.rebuild()
+                pages += 1
+                next_url = (data.get("pagination") or {}).get("next")
+                url = next_url if next_url != url else None
+
+            if url is None:
+                removed = self._table.keys() - seen
+                for identifier in removed:
+                    del self._table[identifier]
+                self._changed |= bool(removed)
+                self.complete = True
+        finally:
+            if self._changed or self.index is None:
+                self.rebuild()
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except NWSError as exc:
+                logger.warning("Station catalog refresh failed: %s", exc)
+            except Exception:
+                logger.exception("Station catalog refresh failed")
+            await asyncio.sleep(self.interval)
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["StationCatalog"]:
+        """Keep the refresher running while any holder is inside the block."""
+        if not self.enabled:
+            yield self
+            return
+        self._users += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll())
+        try:
+            yield self
+        finally:
+            self._users -= 1
+            if self._users == 0 and self._task is not None:
+                task, self._task = self._task, None
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+
+station_catalog = StationCatalog.from_env()
@@ -0,0 +1,169 @@
+"""
+Compact JSON output with a byte budget and continuation tokens.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any
+from weather_mcp.records import AlertRecord, ForecastPeriod
+
+SEVERITY_RANK = {"Extreme": 0, "Severe": 1, "Moderate": 2, "Minor": 3}
+URGENCY_RANK = {"Immediate": 0, "Expected": 1, "Future": 2, "Past": 3}
+
+DEFAULT_MAX_BYTES = 8000
+SUMMARY_CHARS = 280
+
+
+def dumps(value: Any) -> str:
+    """Serialize without the whitespace the text formats carry."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def truncate(text: str | None, limit: int) -> str | None:
+    """Collapse whitespace and cut ``text`` to ``limit`` characters."""
+    if not text:
+        return None
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1].rstrip() + "…"
+
+
+def _compact(record: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in record.items() if value is not None}
+
+
+def alert_record(
+    alert: AlertRecord, summary_chars: int = SUMMARY_CHARS
+) -> dict[str, Any]:
+    """Compact JSON-ready form of an alert."""
+    return _compact(
+        {
+            "id": alert.id or None,
+            "event": alert.event,
+            "severity": alert.severity,
+            "urgency": alert.urgency,
+            "certainty": alert.certainty,
+            "area": alert.area,
+            "onset": alert.onset,
+            "ends": alert.ends or alert.expires,
+            "headline": alert.headline,
+            "description": truncate(alert.description, summary_chars),
+            "instruction": truncate(alert.instruction, summary_chars),
+        }
+    )
+
+
+def rank_alerts(alerts: list[AlertRecord]) -> list[AlertRecord]:
+    """Most severe and most urgent first; feed order breaks ties."""
+
+    def rank(alert: AlertRecord) -> tuple[int, int]:
+        return (
+            SEVERITY_RANK.get(alert.severity or "", len(SEVERITY_RANK)),
+            URGENCY_RANK.get(alert.urgency or "", len(URGENCY_RANK)),
+        )
+
+    return sorted(alerts, key=rank)
+
+
+def period_record(
+    period: ForecastPeriod, summary_chars: int = SUMMARY_CHARS
+) -> dict[str, Any]:
+    """Compact JSON-ready form of a forecast period."""
+    return _compact(
+        {
+            "name": period.name,
+            "start": period.start,
+            "temperature": period.temperature,
+            "unit": period.temperature_unit,
+            "wind": " ".join(filter(None, (period.wind_speed, period.wind_direction)))
+            or None,
+            "precipitation": period.precipitation,
+            "summary": period.short_forecast,
+            "detail": truncate(period.detailed_forecast, summary_chars),
+        }
+    )
+
+
+def _digest(keys: list[str]) -> str:
+    return hashlib.sha1("\n".join(keys).encode()).hexdigest()[:12]
+
+
+def encode_cursor(offset: int, keys: list[str]) -> str:
+    raw = dumps({"o": offset, "d": _digest(keys)}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None, keys: list[str]) -> int | None:
+    """Offset stored in ``cursor``, or None if it is unreadable or stale.
+
+    A cursor is stale when the ordered item keys it was issued for have
+    changed, since offsets would then point at different items.
+    """
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+        offset = int(state["o"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    if state.get("d") != _digest(keys) or not 0 <= offset <= len(keys):
+        return None
+    return offset
+
+
+def paginate(
+    envelope: dict[str, Any],
+    field: str,
+    items: list[str],
+    keys: list[str],
+    max_bytes: int | None = None,
+    cursor: str | None = None,
+) -> str:
+    """Serialize ``envelope`` with as many ``items`` as fit in ``max_bytes``.
+
+    Items are taken in order starting at the cursor's offset. At least one
+    item is always returned; if it alone is over budget its long text fields
+    are dropped. When items remain, ``next`` holds the cursor for the next
+    page. A stale cursor restarts from the first item with
+    ``"restarted": true``.
+
+    Args:
+        envelope: Top-level fields of the response
+        field: Name of the list field the items go into
+        items: Records already serialized with ``dumps``, in output order
+        keys: Stable identity of each item, used to detect stale cursors
+        max_bytes: UTF-8 size budget for the whole response
+        cursor: ``next`` value from a previous page
+    """
+    budget = max_bytes or DEFAULT_MAX_BYTES
+    offset = decode_cursor(cursor, keys)
+    response = dict(envelope, total=len(items))
+    if offset is None:
+        offset = 0
+        response["restarted"] = True
+
+    # Items are spliced in pre-serialized, so they are only encoded once.
+    head = dumps(response)[:-1] + f',"{field}":['
+    # Reserve room for the largest possible "next" value up front.
+    tail = '],"next":' + dumps(encode_cursor(len(items), keys)) + "}"
+    size = len(head.encode()) + len(tail.encode())
+    page: list[str] = []
+    for item in items[offset:]:
+        item_size = len(item.encode()) + (1 if page else 0)
+        if size + item_size > budget:
+            if page:
+                break
+            record = json.loads(item)
+            for key in ("description", "instruction", "detail"):
+                record.pop(key, None)
+            item = dumps(record)
+            item_size = len(item.encode())
+        page.append(item)
+        size += item_size
+
+    end = offset + len(page)
+    next_cursor = encode_cursor(end, keys) if end < len(items) else None
+    return head + ",".join(page) + '],"next":' + dumps(next_cursor) + "}"
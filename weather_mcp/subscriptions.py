@@ -0,0 +1,235 @@
+"""
+Alert subscriptions served by one shared poller per state.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from weather_mcp.alert_changes import alert_change_log
+from weather_mcp.nws_api import NWSError
+from weather_mcp.ratelimit import Priority
+from weather_mcp.tools import fetch_state_alerts
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[str], Awaitable[None]]
+
+
+def alerts_uri(state: str) -> str:
+    """Resource URI that subscribers use for a state's alerts."""
+    return f"alerts://{state.upper()}"
+
+
+@dataclass(frozen=True)
+class SubscriptionStats:
+    """Counters for alert subscriptions."""
+
+    subscribers: int
+    pollers: int
+    notified: int
+    dropped: int
+
+
+class Subscriber:
+    """One session's outgoing notification queue.
+
+    Notifications carry only a URI, so a URI already waiting in the queue is
+    not queued twice. When ``max_pending`` distinct URIs are waiting, the
+    oldest is dropped so a slow consumer never holds up the poller or other
+    subscribers.
+    """
+
+    def __init__(self, send: Send, max_pending: int = 16) -> None:
+        self.send = send
+        self.max_pending = max_pending
+        self.uris: dict[str, str] = {}
+        self.notified = 0
+        self.dropped = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._pending: set[str] = set()
+        self._task: asyncio.Task[None] | None = None
+
+    def offer(self, state: str) -> None:
+        """Queue a notification for ``state`` without waiting."""
+        if state in self._pending:
+            return
+        if self._queue.qsize() >= self.max_pending:
+            self._pending.discard(self._queue.get_nowait())
+            self.dropped += 1
+        self._pending.add(state)
+        self._queue.put_nowait(state)
+
+    def start(self, on_error: Callable[[], None]) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._deliver(on_error))
+
+    async def _deliver(self, on_error: Callable[[], None]) -> None:
+        while True:
+            state = await self._queue.get()
+            self._pending.discard(state)
+            uri = self.uris.get(state)
+            if uri is None:
+                continue
+            try:
+                await self.send(uri)
+            except Exception as exc:
+                logger.info("Dropping alert subscriber after failed send: %s", exc)
+                on_error()
+                return
+            self.notified += 1
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class AlertSubscriptions:
+    """Fans alert changes for a state out to every subscribed session.
+
+    The first subscriber to a state starts a background poller for it and
+    the last one to leave stops it, so any number of subscribers to "CA"
+    cost one upstream poll per ``interval``. Polls go through the
+    background rate-limit lane and are diffed with the shared
+    ``alert_change_log``.
+    """
+
+    def __init__(self, interval: float = 60.0, max_pending: int = 16) -> None:
+        self.interval = interval
+        self.max_pending = max_pending
+        self._subscribers: dict[Hashable, Subscriber] = {}
+        self._states: dict[str, set[Hashable]] = {}
+        self._pollers: dict[str, asyncio.Task[None]] = {}
+        self._notified = 0
+        self._dropped = 0
+        self._users = 0
+
+    @classmethod
+    def from_env(cls) -> "AlertSubscriptions":
+        """Build from ``WEATHER_MCP_SUBSCRIPTION_*`` environment variables."""
+        env = os.environ
+        return cls(
+            interval=float(env.get("WEATHER_MCP_SUBSCRIPTION_INTERVAL", "60.0")),
+            max_pending=int(env.get("WEATHER_MCP_SUBSCRIPTION_QUEUE", "16")),
+        )
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._subscribers
+
+    def subscribe(
+        self, key: Hashable, state: str, send: Send, uri: str | None = None
+    ) -> None:
+        """Subscribe ``key`` (typically a session) to a state's alerts.
+
+        Args:
+            key: Identifies the subscriber across calls
+            state: Two-letter state or area code
+            send: Coroutine function called with the URI on each change
+            uri: URI to notify with; defaults to ``alerts://{STATE}``
+        """
+        state = state.upper()
+        subscriber = self._subscribers.get(key)
+        if subscriber is None:
+            subscriber = self._subscribers[key] = Subscriber(send, self.max_pending)
+            subscriber.start(lambda: self.remove(key))
+        subscriber.uris[state] = uri or alerts_uri(state)
+        self._states.setdefault(state, set()).add(key)
+        if state not in self._pollers:
+            self._pollers[state] = asyncio.create_task(self._poll(state))
+
+    def unsubscribe(self, key: Hashable, state: str) -> None:
+        """Remove one subscription, stopping idle pollers and senders."""
+        state = state.upper()
+        subscriber = self._subscribers.get(key)
+        if subscriber is not None:
+            subscriber.uris.pop(state, None)
+            if not subscriber.uris:
+                self._forget(key)
+        keys = self._states.get(state)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._states[state]
+                self._pollers.pop(state).cancel()
+
+    def remove(self, key: Hashable) -> None:
+        """Drop every subscription held by ``key``."""
+        subscriber = self._subscribers.get(key)
+        if subscriber is not None:
+            for state in list(subscriber.uris):
+                self.unsubscribe(key, state)
+
+    def _forget(self, key: Hashable) -> None:
+        subscriber = self._subscribers.pop(key)
+        self._notified += subscriber.notified
+        self._dropped += subscriber.dropped
+        subscriber.stop()
+
+    def publish(self, state: str) -> None:
+        """Queue a change notification for every subscriber of ``state``."""
+        for key in self._states.get(state.upper(), ()):
+            self._subscribers[key].offer(state.upper())
+
+    async def poll_once(self, state: str, cursor: str | None) -> str | None:
+        """Fetch a state's alerts, publish if changed, and return the new cursor."""
+        features = await fetch_state_alerts(state, Priority.BACKGROUND)
+        if features is None:
+            return cursor
+        alert_change_log.record(state, features)
+        change_set = alert_change_log.changes_since(state, cursor)
+        if cursor and (change_set.changes or change_set.reset):
+            self.publish(state)
+        return change_set.cursor
+
+    async def _poll(self, state: str) -> None:
+        cursor: str | None = None
+        while True:
+            try:
+                cursor = await self.poll_once(state, cursor)
+            except NWSError as exc:
+                logger.warning("Alert subscription poll for %s failed: %s", state, exc)
+            except Exception:
+                logger.exception("Alert subscription poll for %s failed", state)
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> SubscriptionStats:
+        subscribers = self._subscribers.values()
+        return SubscriptionStats(
+            subscribers=len(self._subscribers),
+            pollers=len(self._pollers),
+            notified=self._notified + sum(s.notified for s in subscribers),
+            dropped=self._dropped + sum(s.dropped for s in subscribers),
+        )
+
+    def close(self) -> None:
+        """Cancel every poller and sender."""
+        for key in list(self._subscribers):
+            self._forget(key)
+        for task in self._pollers.values():
+            task.cancel()
+        self._pollers.clear()
+        self._states.clear()
+        self._notified = self._dropped = 0
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["AlertSubscriptions"]:
+        """Close every subscription when the last holder leaves the block.
+
+        Pollers fetch through the pooled NWS client, so they must stop
+        before the lifespan that owns the client closes it.
+        """
+        self._users += 1
+        try:
+            yield self
+        finally:
+            self._users -= 1
+            if self._users == 0:
+                pollers = list(self._pollers.values())
+                self.close()
+                await asyncio.gather(*pollers, return_exceptions=True)
+
+
+alert_subscriptions = AlertSubscriptions.from_env()
@@ -0,0 +1,204 @@
+"""
+Hourly NumPy time series from raw NWS gridpoint data.
+"""
+
+import re
+import warnings
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+import numpy as np
+
+_DURATION = re.compile(
+    r"P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?)?$"
+)
+
+
+@dataclass(frozen=True)
+class Layer:
+    """How a gridData layer is expanded and resampled.
+
+    ``accumulated`` layers (such as QPF) hold totals over their interval,
+    which are spread evenly over its hours and summed when resampling;
+    other layers hold a value valid for each hour of the interval.
+    """
+
+    name: str
+    aggregate: str = "mean"
+    accumulated: bool = False
+
+
+LAYERS = {
+    layer.name: layer
+    for layer in (
+        Layer("temperature"),
+        Layer("dewpoint"),
+        Layer("apparentTemperature"),
+        Layer("relativeHumidity"),
+        Layer("skyCover"),
+        Layer("windSpeed"),
+        Layer("windGust", aggregate="max"),
+        Layer("probabilityOfPrecipitation", aggregate="max"),
+        Layer("quantitativePrecipitation", aggregate="sum", accumulated=True),
+        Layer("snowfallAmount", aggregate="sum", accumulated=True),
+    )
+}
+DEFAULT_LAYERS = (
+    "temperature",
+    "probabilityOfPrecipitation",
+    "windSpeed",
+    "quantitativePrecipitation",
+)
+
+# (scale, offset, label) applied as value * scale + offset, per unit system.
+_CONVERSIONS: dict[str, dict[str, tuple[float, float, str]]] = {
+    "wmoUnit:degC": {"si": (1.0, 0.0, "°C"), "us": (1.8, 32.0, "°F")},
+    "wmoUnit:km_h-1": {"si": (1.0, 0.0, "km/h"), "us": (0.621371, 0.0, "mph")},
+    "wmoUnit:mm": {"si": (1.0, 0.0, "mm"), "us": (1 / 25.4, 0.0, "in")},
+    "wmoUnit:percent": {"si": (1.0, 0.0, "%"), "us": (1.0, 0.0, "%")},
+}
+
+
+@lru_cache(maxsize=4096)
+def parse_valid_time(valid_time: str) -> tuple[float, int]:
+    """Split an ISO-8601 ``start/duration`` interval into epoch seconds and hours.
+
+    Interval strings repeat across layers and gridpoints issued together,
+    so parses are memoized.
+    """
+    start, _, duration = valid_time.partition("/")
+    match = _DURATION.match(duration)
+    if match is None:
+        raise ValueError(f"Unsupported validTime duration: {valid_time}")
+    parts = {key: int(value or 0) for key, value in match.groupdict().items()}
+    hours = parts["days"] * 24 + parts["hours"] + (parts["minutes"] > 0)
+    return datetime.fromisoformat(start).timestamp(), max(hours, 1)
+
+
+def expand_hourly(
+    series: list[list[dict[str, Any]]],
+    start: float,
+    hours: int,
+    accumulated: bool = False,
+) -> np.ndarray:
+    """Expand interval values for many gridpoints into one hourly array.
+
+    Args:
+        series: Per gridpoint, the layer's ``values`` list
+        start: Epoch seconds of the first hour (on the hour)
+        hours: Number of hourly columns
+        accumulated: Spread each value evenly over its interval's hours
+
+    Returns:
+        Array of shape ``(len(series), hours)``, NaN where no value applies.
+    """
+    out = np.full((len(series), hours), np.nan)
+    valid_times: list[str] = []
+    values: list[float] = []
+    per_row: list[int] = []
+    for entries in series:
+        before = len(values)
+        for entry in entries:
+            amount = entry.get("value")
+            if amount is not None:
+                valid_times.append(entry["validTime"])
+                values.append(amount)
+        per_row.append(len(values) - before)
+    if not values:
+        return out
+
+    # Parse each distinct interval once; gridpoints issued together share them.
+    codes: dict[str, int] = {}
+    indices = np.fromiter(
+        (codes.setdefault(text, len(codes)) for text in valid_times),
+        dtype=np.intp,
+        count=len(valid_times),
+    )
+    intervals = np.array([parse_valid_time(text) for text in codes])
+    counts = intervals[indices, 1].astype(np.intp)
+    first = ((intervals[indices, 0] - start) // 3600).astype(np.intp)
+    rows = np.repeat(np.arange(len(series)), per_row)
+    amounts = np.asarray(values, dtype=np.float64)
+    if accumulated:
+        amounts = amounts / counts
+
+    # One output cell per (interval, hour in interval), without Python loops.
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cell_hours = np.repeat(first, counts) + offsets
+    cell_rows = np.repeat(rows, counts)
+    cell_values = np.repeat(amounts, counts)
+    keep = (cell_hours >= 0) & (cell_hours < hours)
+    out[cell_rows[keep], cell_hours[keep]] = cell_values[keep]
+    return out
+
+
+def resample(array: np.ndarray, step: int, aggregate: str) -> np.ndarray:
+    """Aggregate hourly columns into ``step``-hour buckets.
+
+    Trailing hours that do not fill a bucket are dropped. Buckets with no
+    data stay NaN.
+    """
+    if step == 1:
+        return array
+    buckets = array.shape[1] // step
+    grouped = array[:, : buckets * step].reshape(array.shape[0], buckets, step)
+    empty = np.isnan(grouped).all(axis=2)
+    result: np.ndarray
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if aggregate == "sum":
+            result = np.nansum(grouped, axis=2)
+        elif aggregate == "max":
+            result = np.nanmax(grouped, axis=2)
+        else:
+            result = np.nanmean(grouped, axis=2)
+    result[empty] = np.nan
+    return result
+
+
+def convert(array: np.ndarray, uom: str | None, units: str) -> tuple[np.ndarray, str]:
+    """Convert from an NWS unit of measure to ``"us"`` or ``"si"`` units."""
+    conversion = _CONVERSIONS.get(uom or "", {}).get(units)
+    if conversion is None:
+        return array, (uom or "").removeprefix("wmoUnit:")
+    scale, offset, label = conversion
+    return array * scale + offset, label
+
+
+def gridpoint_series(
+    grid_data: list[dict[str, Any]],
+    layers: list[str],
+    start: float,
+    hours: int,
+    step: int = 1,
+    units: str = "us",
+) -> dict[str, tuple[np.ndarray, str]]:
+    """Hourly (or resampled) arrays for each layer across many gridpoints.
+
+    Args:
+        grid_data: ``/gridpoints/{office}/{x},{y}`` responses
+        layers: Layer names from ``LAYERS``
+        start: Epoch seconds of the first hour
+        hours: Hours to cover from ``start``
+        step: Hours per output column
+        units: ``"us"`` or ``"si"``
+
+    Returns:
+        Layer name to ``(array, unit label)``, arrays shaped
+        ``(len(grid_data), hours // step)``.
+    """
+    result = {}
+    for name in layers:
+        layer = LAYERS[name]
+        raw = [data.get("properties", {}).get(name) or {} for data in grid_data]
+        hourly = expand_hourly(
+            [layer_data.get("values") or [] for layer_data in raw],
+            start,
+            hours,
+            accumulated=layer.accumulated,
+        )
+        uom = next((d.get("uom") for d in raw if d.get("uom")), None)
+        converted, label = convert(hourly, uom, units)
+        result[name] = (resample(converted, step, layer.aggregate), label)
+    return result
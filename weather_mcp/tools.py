@@ -2,71 +2,760 @@
 Weather tools for processing alerts and forecasts.
 """
 
-from weather_mcp.nws_api import make_nws_request, NWS_API_BASE
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, cast
+from urllib.parse import urlencode
+import numpy as np
+from weather_mcp.alert_changes import EXPIRED, alert_change_log
+from weather_mcp.alerts import AlertFilters, alert_snapshot
+from weather_mcp.cache import RenderCache
+from weather_mcp.gridpoints import (
+    GridPoint,
+    format_coordinate,
+    gridpoint_index,
+    normalize_coordinates,
+)
+from weather_mcp.nws_api import NWSError, fetch_nws_json, NWS_API_BASE
+from weather_mcp.observations import format_observation
+from weather_mcp.ratelimit import Priority
+from weather_mcp.records import AlertRecord, alert_records, forecast_periods
+from weather_mcp.stations import station_catalog
+from weather_mcp.structured import (
+    alert_record,
+    dumps,
+    paginate,
+    period_record,
+    rank_alerts,
+)
+from weather_mcp.timeseries import DEFAULT_LAYERS, LAYERS, gridpoint_series
 
+# Upper bound on concurrent upstream requests made by one batch tool call.
+batch_concurrency = int(os.environ.get("WEATHER_MCP_BATCH_CONCURRENCY", "8"))
 
-def format_alert(feature: dict) -> str:
-    """Format an alert feature into a readable string."""
-    props = feature["properties"]
+# Seconds each part of get_conditions may take before it is reported missing.
+conditions_timeout = float(os.environ.get("WEATHER_MCP_CONDITIONS_TIMEOUT", "10.0"))
+
+# Formatted alerts and forecasts shared by every session and query.
+render_cache = RenderCache.from_env()
+
+
+OUTPUTS = ("text", "json")
+OUTPUT_ERROR = 'Output must be "text" or "json".'
+
+
+def output_error(output: str, message: str) -> str:
+    """An error message in the requested output format."""
+    return dumps({"error": message}) if output == "json" else message
+
+
+def format_alert(alert: AlertRecord | dict) -> str:
+    """Format an alert (record or raw GeoJSON feature) into a readable string."""
+    if isinstance(alert, dict):
+        alert = AlertRecord.from_feature(alert)
     return f"""
-    Event: {props.get('event', 'Unknown')}
-    Area: {props.get('areaDesc', 'Unknown')}
-    Severity: {props.get('severity', 'Unknown')}
-    Description: {props.get('description', 'No description available')}
-    Instructions: {props.get('instruction', 'No specific instructions provided')}
+    Event: {alert.event or 'Unknown'}
+    Area: {alert.area or 'Unknown'}
+    Severity: {alert.severity or 'Unknown'}
+    Description: {alert.description or 'No description available'}
+    Instructions: {alert.instruction or 'No specific instructions provided'}
+    """
+
+
+def render_alert(alert: AlertRecord, output: str = "text") -> str:
+    """Format an alert, reusing the rendering until NWS reissues it.
+
+    Alerts without an id or ``sent`` time cannot be versioned and are
+    formatted every time.
     """
 
+    def render() -> str:
+        if output == "json":
+            return dumps(alert_record(alert))
+        return format_alert(alert)
+
+    if not alert.id or alert.sent is None:
+        return render()
+    return render_cache.render("alert", alert.id, alert.version, output, render)
 
-async def get_alerts(state: str) -> str:
+
+async def get_alerts(
+    state: str,
+    severity: str | None = None,
+    urgency: str | None = None,
+    event: str | None = None,
+    status: str | None = None,
+    message_type: str | None = None,
+    certainty: str | None = None,
+    output: str = "text",
+    max_bytes: int | None = None,
+    cursor: str | None = None,
+) -> str:
     """Get weather alerts for a US state.
 
+    Filters take comma-separated values and are applied before formatting.
+    With ``output="json"`` the alerts are ranked by severity and urgency and
+    returned as compact JSON pages of at most ``max_bytes``.
+
     Args:
         state: Two-letter US state code (e.g. CA, NY)
+        severity: Extreme, Severe, Moderate, Minor or Unknown
+        urgency: Immediate, Expected, Future, Past or Unknown
+        event: Event name (e.g. Tornado Warning)
+        status: Actual, Exercise, System, Test or Draft
+        message_type: alert, update or cancel
+        certainty: Observed, Likely, Possible, Unlikely or Unknown
+        output: "text" or "json"
+        max_bytes: Size budget for a JSON page
+        cursor: ``next`` value from the previous JSON page
+    """
+    if output not in OUTPUTS:
+        return OUTPUT_ERROR
+    filters = AlertFilters.parse(
+        severity=severity,
+        urgency=urgency,
+        certainty=certainty,
+        event=event,
+        status=status,
+        message_type=message_type,
+    )
+    try:
+        alerts = await fetch_state_alerts(state, filters=filters)
+    except NWSError as exc:
+        return output_error(output, f"Unable to fetch alerts: {exc}")
+
+    if alerts is None:
+        return output_error(output, "Unable to fetch alerts or no alerts found.")
+
+    if output == "json":
+        ranked = rank_alerts(alerts)
+        records = [render_alert(alert, "json") for alert in ranked]
+        keys = [alert.id or record for alert, record in zip(ranked, records)]
+        return paginate(
+            {"state": state.upper()}, "alerts", records, keys, max_bytes, cursor
+        )
+
+    if not alerts:
+        if filters:
+            return "No active alerts for this state match the filters."
+        return "No active alerts for this state."
+
+    return "\n---\n".join(render_alert(alert) for alert in alerts)
+
+
+async def fetch_state_alerts(
+    state: str,
+    priority: Priority = Priority.INTERACTIVE,
+    filters: AlertFilters | None = None,
+) -> list[AlertRecord] | None:
+    """Active alerts for a state, or None for a malformed response.
+
+    Served from the national snapshot when it is current, otherwise from
+    ``/alerts/active/area/{state}``, or ``/alerts/active?area=...`` with the
+    filters as query parameters so NWS only sends matching alerts. Raises
+    ``NWSError`` if NWS fails.
     """
-    url = f"{NWS_API_BASE}/alerts/active/area/{state}"
-    data = await make_nws_request(url)
+    index = alert_snapshot.current()
+    if index is not None:
+        if filters:
+            return filters.apply(index, state.upper())
+        return index.query(area=state.upper())
 
+    if filters:
+        params = [("area", state.upper()), *filters.query_params()]
+        url = f"{NWS_API_BASE}/alerts/active?{urlencode(params)}"
+    else:
+        url = f"{NWS_API_BASE}/alerts/active/area/{state}"
+    data = await fetch_nws_json(url, priority)
     if not data or "features" not in data:
+        return None
+    return alert_records(data["features"])
+
+
+async def get_alerts_for_point(latitude: float, longitude: float) -> str:
+    """Get weather alerts in effect at a location.
+
+    Answered from the national snapshot's spatial index unless an alert
+    whose zone shape is still missing may cover the point, in which case
+    ``/alerts/active?point=`` is asked instead.
+
+    Args:
+        latitude: Latitude of the location
+        longitude: Longitude of the location
+    """
+    latitude, longitude = normalize_coordinates(latitude, longitude)
+    index = alert_snapshot.current()
+    if index is not None and index.covers(latitude, longitude):
+        alerts = index.query_point(latitude, longitude)
+    else:
+        url = (
+            f"{NWS_API_BASE}/alerts/active?point="
+            f"{format_coordinate(latitude)},{format_coordinate(longitude)}"
+        )
+        try:
+            data = await fetch_nws_json(url)
+        except NWSError as exc:
+            return f"Unable to fetch alerts: {exc}"
+        if not data or "features" not in data:
+            return "Unable to fetch alerts or no alerts found."
+        alerts = alert_records(data["features"])
+
+    if not alerts:
+        return "No active alerts for this location."
+    return "\n---\n".join(render_alert(alert) for alert in alerts)
+
+
+async def get_alerts_batch(states: list[str]) -> str:
+    """Get weather alerts for several US states in one call.
+
+    States are fetched concurrently, at most ``batch_concurrency`` at a time.
+    An alert covering several of the states is listed once, and a state that
+    cannot be fetched is reported without failing the others.
+
+    Args:
+        states: Two-letter US state codes (e.g. ["CA", "NV", "OR"])
+    """
+    codes = list(dict.fromkeys(s.strip().upper() for s in states if s.strip()))
+    if not codes:
+        return "No states given."
+
+    semaphore = asyncio.Semaphore(batch_concurrency)
+
+    async def fetch(state: str) -> list[AlertRecord] | None:
+        async with semaphore:
+            return await fetch_state_alerts(state)
+
+    results = await asyncio.gather(
+        *(fetch(state) for state in codes), return_exceptions=True
+    )
+
+    alerts: dict[str, tuple[AlertRecord, list[str]]] = {}
+    quiet: list[str] = []
+    failed: list[str] = []
+    for state, result in zip(codes, results):
+        if isinstance(result, NWSError):
+            failed.append(f"{state} ({result})")
+        elif isinstance(result, BaseException):
+            raise result
+        elif result is None:
+            failed.append(f"{state} (malformed response)")
+        elif not result:
+            quiet.append(state)
+        else:
+            for position, alert in enumerate(result):
+                key = alert.id or f"{state}#{position}"
+                alerts.setdefault(key, (alert, []))[1].append(state)
+
+    blocks = [
+        f"{render_alert(alert).rstrip()}\n    States: {', '.join(covered)}\n    "
+        for alert, covered in alerts.values()
+    ]
+    if quiet:
+        blocks.append(f"No active alerts: {', '.join(quiet)}")
+    if failed:
+        blocks.append(f"Unable to fetch alerts: {', '.join(failed)}")
+    return "\n---\n".join(blocks)
+
+
+def format_expired_alert(alert: AlertRecord) -> str:
+    """One-line summary of an alert that is no longer active."""
+    return f"Expired: {alert.event or 'Unknown'} ({alert.area or 'Unknown'})"
+
+
+async def get_alert_changes(state: str, cursor: str | None = None) -> str:
+    """Get alerts for a US state added, updated or expired since a cursor.
+
+    Args:
+        state: Two-letter US state code (e.g. CA, NY)
+        cursor: Value of ``Cursor:`` from the previous call; omit to start
+    """
+    scope = state.upper()
+    try:
+        alerts = await fetch_state_alerts(state)
+    except NWSError as exc:
+        return f"Unable to fetch alerts: {exc}"
+
+    if alerts is None:
         return "Unable to fetch alerts or no alerts found."
 
-    if not data["features"]:
-        return "No active alerts for this state."
+    alert_change_log.record(scope, alerts)
+    change_set = alert_change_log.changes_since(scope, cursor)
+
+    lines = [f"Cursor: {change_set.cursor}"]
+    if change_set.reset:
+        lines.append(f"Full refresh: {len(change_set.changes)} active alerts.")
+    elif not change_set.changes:
+        lines.append("No alert changes since cursor.")
+    blocks = [
+        (
+            format_expired_alert(change.alert)
+            if change.kind == EXPIRED
+            else f"{change.kind.capitalize()}:{render_alert(change.alert)}"
+        )
+        for change in change_set.changes
+    ]
+    return "\n---\n".join(["\n".join(lines), *blocks])
 
-    alerts = [format_alert(feature) for feature in data["features"]]
-    return "\n---\n".join(alerts)
 
+async def resolve_gridpoint(
+    latitude: float, longitude: float, priority: Priority = Priority.INTERACTIVE
+) -> GridPoint | None:
+    """Resolve a location to its forecast gridpoint.
 
-async def get_forecast(latitude: float, longitude: float) -> str:
+    Coordinates are normalized to 4 decimals and looked up in
+    ``gridpoint_index`` before calling ``/points`` at ``priority``.
+    """
+    latitude, longitude = normalize_coordinates(latitude, longitude)
+    grid = gridpoint_index.get(latitude, longitude)
+    if grid is not None:
+        return grid
+
+    points_url = (
+        f"{NWS_API_BASE}/points/"
+        f"{format_coordinate(latitude)},{format_coordinate(longitude)}"
+    )
+    points_data = await fetch_nws_json(points_url, priority)
+    if not points_data:
+        return None
+    grid = GridPoint.from_points(points_data)
+    gridpoint_index.put(latitude, longitude, grid)
+    return grid
+
+
+async def get_forecast(
+    latitude: float,
+    longitude: float,
+    output: str = "text",
+    max_bytes: int | None = None,
+    cursor: str | None = None,
+) -> str:
     """Get weather forecast for a location.
 
+    The text output covers the next 5 periods. With ``output="json"`` every
+    period is returned as compact JSON pages of at most ``max_bytes``.
+
     Args:
         latitude: Latitude of the location
         longitude: Longitude of the location
+        output: "text" or "json"
+        max_bytes: Size budget for a JSON page
+        cursor: ``next`` value from the previous JSON page
     """
-    # First get the forecast grid endpoint
-    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    points_data = await make_nws_request(points_url)
+    if output not in OUTPUTS:
+        return OUTPUT_ERROR
+    # First resolve the forecast grid, reusing a cached resolution if any
+    try:
+        grid = await resolve_gridpoint(latitude, longitude)
+    except NWSError as exc:
+        return output_error(
+            output, f"Unable to fetch forecast data for this location: {exc}"
+        )
 
-    if not points_data:
-        return "Unable to fetch forecast data for this location."
+    if grid is None:
+        return output_error(output, "Unable to fetch forecast data for this location.")
+
+    # Nearby coordinates in the same grid cell share this forecast URL
+    if output == "json":
+        return await forecast_json(grid, max_bytes, cursor)
+    return await forecast_for_grid(grid)
 
-    # Get the forecast URL from the points response
-    forecast_url = points_data["properties"]["forecast"]
-    forecast_data = await make_nws_request(forecast_url)
+
+async def forecast_for_grid(grid: GridPoint) -> str:
+    """Fetch and format the forecast for one gridpoint."""
+    try:
+        forecast_data = await fetch_nws_json(grid.forecast_url)
+    except NWSError as exc:
+        return f"Unable to fetch detailed forecast: {exc}"
 
     if not forecast_data:
         return "Unable to fetch detailed forecast."
 
-    # Format the periods into a readable forecast
-    periods = forecast_data["properties"]["periods"]
+    updated = forecast_data.get("properties", {}).get("updateTime")
+    if updated is None:
+        return format_forecast(forecast_data)
+    return render_cache.render(
+        "forecast",
+        grid.forecast_url,
+        updated,
+        "text",
+        lambda: format_forecast(forecast_data),
+    )
+
+
+async def forecast_json(
+    grid: GridPoint, max_bytes: int | None = None, cursor: str | None = None
+) -> str:
+    """Fetch one gridpoint's forecast as a page of compact JSON periods."""
+    try:
+        forecast_data = await fetch_nws_json(grid.forecast_url)
+    except NWSError as exc:
+        return output_error("json", f"Unable to fetch detailed forecast: {exc}")
+
+    if not forecast_data:
+        return output_error("json", "Unable to fetch detailed forecast.")
+
+    properties = forecast_data["properties"]
+    periods = forecast_periods(forecast_data)
+    records = [dumps(period_record(period)) for period in periods]
+    keys = [str(period.start or period.name) for period in periods]
+    envelope = {"updated": properties.get("updateTime") or properties.get("updated")}
+    if grid.office:
+        envelope["grid"] = f"{grid.office} {grid.grid_x},{grid.grid_y}"
+    return paginate(
+        {key: value for key, value in envelope.items() if value is not None},
+        "periods",
+        records,
+        keys,
+        max_bytes,
+        cursor,
+    )
+
+
+def format_forecast(forecast_data: dict) -> str:
+    """Format the next forecast periods into a readable string."""
+    periods = forecast_periods(forecast_data)
     forecasts = []
     for period in periods[:5]:  # Only show next 5 periods
         forecast = f"""
-                {period['name']}:
-                Temperature: {period['temperature']}°{period['temperatureUnit']}
-                Wind: {period['windSpeed']} {period['windDirection']}
-                Forecast: {period['detailedForecast']}
+                {period.name}:
+                Temperature: {period.temperature}°{period.temperature_unit}
+                Wind: {period.wind_speed} {period.wind_direction}
+                Forecast: {period.detailed_forecast}
                 """
         forecasts.append(forecast)
 
     return "\n---\n".join(forecasts)
+
+
+def stations_url(grid: GridPoint) -> str | None:
+    """URL listing the observation stations near a gridpoint, nearest first."""
+    if grid.stations_url:
+        return grid.stations_url
+    if not grid.office:
+        return None
+    return (
+        f"{NWS_API_BASE}/gridpoints/{grid.office}/{grid.grid_x},{grid.grid_y}/stations"
+    )
+
+
+async def latest_observation(identifier: str, label: str) -> str:
+    """Fetch and format the latest observation from one station."""
+    try:
+        observation = await fetch_nws_json(
+            f"{NWS_API_BASE}/stations/{identifier}/observations/latest"
+        )
+    except NWSError as exc:
+        return f"Unable to fetch observations: {exc}"
+
+    if not observation:
+        return "Unable to fetch observations."
+    return format_observation(observation, label)
+
+
+async def observation_for_grid(grid: GridPoint) -> str:
+    """Fetch and format the latest observation from the nearest station."""
+    url = stations_url(grid)
+    if url is None:
+        return "No observation stations for this location."
+    try:
+        stations = await fetch_nws_json(url)
+    except NWSError as exc:
+        return f"Unable to fetch observations: {exc}"
+
+    features = (stations or {}).get("features") or []
+    station = (features[0].get("properties") or {}) if features else {}
+    identifier: str | None = station.get("stationIdentifier")
+    if not identifier:
+        return "No observation stations for this location."
+    label = f"{identifier} ({station['name']})" if station.get("name") else identifier
+    return await latest_observation(identifier, label)
+
+
+async def observation_for_point(
+    latitude: float, longitude: float, grid: GridPoint | None = None
+) -> str:
+    """Latest observation from the station nearest to a location.
+
+    Uses the station catalog when it is loaded, so the only upstream request
+    is the observation itself. Otherwise falls back to the gridpoint's
+    station list, resolving the gridpoint first if ``grid`` is not given.
+    """
+    index = station_catalog.current()
+    if index is not None:
+        station = index.nearest(latitude, longitude)
+        if station is not None:
+            return await latest_observation(station.identifier, station.label)
+
+    if grid is None:
+        try:
+            grid = await resolve_gridpoint(latitude, longitude)
+        except NWSError as exc:
+            return f"Unable to fetch observations: {exc}"
+        if grid is None:
+            return "No observation stations for this location."
+    return await observation_for_grid(grid)
+
+
+async def get_current_observations(latitude: float, longitude: float) -> str:
+    """Get the latest observation from the station nearest to a location.
+
+    Args:
+        latitude: Latitude of the location
+        longitude: Longitude of the location
+    """
+    return await observation_for_point(latitude, longitude)
+
+
+async def _within(part: Awaitable[str], timeout: float) -> str:
+    try:
+        return await asyncio.wait_for(part, timeout)
+    except TimeoutError:
+        return f"Timed out after {timeout:g}s."
+
+
+async def get_conditions(latitude: float, longitude: float) -> str:
+    """Get the forecast, active alerts and latest observation for a location.
+
+    The location is resolved once, then the three parts are fetched
+    concurrently. A part that takes longer than ``conditions_timeout``
+    seconds is reported as timed out while the others are still returned.
+
+    Args:
+        latitude: Latitude of the location
+        longitude: Longitude of the location
+    """
+    try:
+        grid = await resolve_gridpoint(latitude, longitude)
+    except NWSError as exc:
+        return f"Unable to fetch forecast data for this location: {exc}"
+
+    if grid is None:
+        return "Unable to fetch forecast data for this location."
+
+    parts = {
+        "Alerts": get_alerts_for_point(latitude, longitude),
+        "Current conditions": observation_for_point(latitude, longitude, grid),
+        "Forecast": forecast_for_grid(grid),
+    }
+    texts = await asyncio.gather(
+        *(_within(part, conditions_timeout) for part in parts.values())
+    )
+    return "\n===\n".join(
+        f"{name}:\n{text.strip()}" for name, text in zip(parts, texts)
+    )
+
+
+async def resolve_gridpoints(
+    points: list[tuple[float, float]], semaphore: asyncio.Semaphore
+) -> list[GridPoint | NWSError | None]:
+    """Resolve many locations concurrently, returning failures in place."""
+
+    async def resolve(latitude: float, longitude: float) -> GridPoint | None:
+        async with semaphore:
+            return await resolve_gridpoint(latitude, longitude)
+
+    resolved = await asyncio.gather(
+        *(resolve(latitude, longitude) for latitude, longitude in points),
+        return_exceptions=True,
+    )
+    results: list[GridPoint | NWSError | None] = []
+    for result in resolved:
+        if isinstance(result, BaseException) and not isinstance(result, NWSError):
+            raise result
+        results.append(result)
+    return results
+
+
+@dataclass(frozen=True)
+class ForecastBatchItem:
+    """Forecast text shared by the batch points at ``indices``."""
+
+    indices: tuple[int, ...]
+    text: str
+    grid: GridPoint | None = None
+
+
+async def iter_forecast_batch(
+    points: list[tuple[float, float]],
+) -> AsyncIterator[ForecastBatchItem]:
+    """Yield forecasts for ``points`` as each grid cell's forecast arrives.
+
+    All points are resolved concurrently, then grouped by grid cell so each
+    cell's forecast is fetched once, at most ``batch_concurrency`` requests
+    at a time.
+    """
+    semaphore = asyncio.Semaphore(batch_concurrency)
+    resolved = await resolve_gridpoints(points, semaphore)
+
+    groups: dict[Hashable, tuple[GridPoint, list[int]]] = {}
+    for position, result in enumerate(resolved):
+        if isinstance(result, NWSError):
+            yield ForecastBatchItem(
+                (position,),
+                f"Unable to fetch forecast data for this location: {result}",
+            )
+        elif result is None:
+            yield ForecastBatchItem(
+                (position,), "Unable to fetch forecast data for this location."
+            )
+        else:
+            key = result.grid_key if result.office else result.forecast_url
+            groups.setdefault(key, (result, []))[1].append(position)
+
+    async def forecast(grid: GridPoint, indices: list[int]) -> ForecastBatchItem:
+        async with semaphore:
+            text = await forecast_for_grid(grid)
+        return ForecastBatchItem(tuple(indices), text, grid)
+
+    for item in asyncio.as_completed(
+        [forecast(grid, indices) for grid, indices in groups.values()]
+    ):
+        yield await item
+
+
+def format_point_forecast(point: tuple[float, float], text: str) -> str:
+    """Label a forecast (or error) with the location it belongs to."""
+    latitude, longitude = point
+    separator = "" if text.startswith("\n") else " "
+    return (
+        f"Location {format_coordinate(latitude)},{format_coordinate(longitude)}:"
+        f"{separator}{text}"
+    )
+
+
+async def get_forecast_batch(
+    points: list[tuple[float, float]],
+    on_result: Callable[[ForecastBatchItem], Awaitable[None]] | None = None,
+) -> str:
+    """Get weather forecasts for many locations.
+
+    Args:
+        points: (latitude, longitude) pairs
+        on_result: Awaited with each grid cell's result as soon as it is ready
+    """
+    if not points:
+        return "No points given."
+
+    started = time.perf_counter()
+    texts = [""] * len(points)
+    grids = 0
+    async for item in iter_forecast_batch(points):
+        for position in item.indices:
+            texts[position] = item.text
+        grids += item.grid is not None
+        if on_result is not None:
+            await on_result(item)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+
+    blocks = [format_point_forecast(p, text) for p, text in zip(points, texts)]
+    blocks.append(
+        f"{len(points)} points from {grids} grid forecasts in {elapsed:.2f}s "
+        f"({len(points) / elapsed:.1f} points/s)"
+    )
+    return "\n===\n".join(blocks)
+
+
+def grid_data_url(grid: GridPoint) -> str:
+    """URL of the raw ``/gridpoints`` data for a gridpoint."""
+    if grid.grid_data_url:
+        return grid.grid_data_url
+    return f"{NWS_API_BASE}/gridpoints/{grid.office}/{grid.grid_x},{grid.grid_y}"
+
+
+def _format_value(value: float, label: str) -> str:
+    if np.isnan(value):
+        return ""
+    return f"{value:.2f}" if label == "in" else f"{value:.1f}"
+
+
+async def get_gridpoint_timeseries(
+    points: list[tuple[float, float]],
+    hours: int = 24,
+    step: int = 1,
+    units: str = "us",
+    layers: list[str] | None = None,
+) -> str:
+    """Get hourly forecast time series from raw gridpoint data.
+
+    Args:
+        points: (latitude, longitude) pairs
+        hours: Hours to cover from the current hour, up to 168
+        step: Hours per row; values are averaged, maxed or summed per layer
+        units: "us" or "si"
+        layers: gridData layers; defaults to temperature, precipitation
+            probability, wind speed and QPF
+    """
+    names = list(layers or DEFAULT_LAYERS)
+    unknown = [name for name in names if name not in LAYERS]
+    if unknown:
+        return (
+            f"Unknown layers: {', '.join(unknown)}. "
+            f"Supported layers: {', '.join(LAYERS)}."
+        )
+    if units not in ("us", "si"):
+        return 'Units must be "us" or "si".'
+    if not points:
+        return "No points given."
+    hours = min(max(hours, 1), 168)
+    step = min(max(step, 1), hours)
+
+    semaphore = asyncio.Semaphore(batch_concurrency)
+    resolved = await resolve_gridpoints(points, semaphore)
+    grids: dict[str, GridPoint] = {}
+    for result in resolved:
+        if isinstance(result, GridPoint):
+            grids.setdefault(grid_data_url(result), result)
+
+    async def fetch(url: str) -> dict[str, Any] | NWSError:
+        async with semaphore:
+            try:
+                return await fetch_nws_json(url)
+            except NWSError as exc:
+                return exc
+
+    urls = list(grids)
+    fetched = dict(zip(urls, await asyncio.gather(*(fetch(url) for url in urls))))
+    available = [url for url in urls if not isinstance(fetched[url], NWSError)]
+    row_of = {url: row for row, url in enumerate(available)}
+
+    start = float(int(time.time()) // 3600 * 3600)
+    series = gridpoint_series(
+        [cast(dict[str, Any], fetched[url]) for url in available],
+        names,
+        start,
+        hours,
+        step,
+        units,
+    )
+    header = "time," + ",".join(f"{name} ({series[name][1]})" for name in names)
+    times = [
+        datetime.fromtimestamp(start + column * step * 3600, timezone.utc).strftime(
+            "%Y-%m-%dT%H:%MZ"
+        )
+        for column in range(hours // step)
+    ]
+
+    blocks = []
+    for point, result in zip(points, resolved):
+        if isinstance(result, NWSError):
+            text = f"Unable to fetch forecast data for this location: {result}"
+        elif result is None:
+            text = "Unable to fetch forecast data for this location."
+        elif isinstance(fetched[grid_data_url(result)], NWSError):
+            text = f"Unable to fetch gridpoint data: {fetched[grid_data_url(result)]}"
+        else:
+            row = row_of[grid_data_url(result)]
+            lines = [f"{result.office} {result.grid_x},{result.grid_y}", header]
+            for column, moment in enumerate(times):
+                cells = [
+                    _format_value(array[row, column], label)
+                    for array, label in (series[name] for name in names)
+                ]
+                lines.append(",".join([moment, *cells]))
+            text = "\n" + "\n".join(lines)
+        blocks.append(format_point_forecast(point, text))
+    return "\n===\n".join(blocks)
@@ -0,0 +1,179 @@
+"""
+Startup cache warm-up and readiness tracking.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from weather_mcp.alerts import alert_snapshot
+from weather_mcp.nws_api import NWSError, fetch_nws_json
+from weather_mcp.ratelimit import Priority
+from weather_mcp.tools import fetch_state_alerts, resolve_gridpoint
+
+logger = logging.getLogger(__name__)
+
+
+def parse_points(value: str) -> list[tuple[float, float]]:
+    """Parse ``"lat,lon;lat,lon"`` into coordinate pairs."""
+    points = []
+    for item in value.split(";"):
+        if item.strip():
+            latitude, longitude = item.split(",")
+            points.append((float(latitude), float(longitude)))
+    return points
+
+
+@dataclass
+class WarmupStats:
+    """Progress of the startup warm-up."""
+
+    ready: bool = False
+    complete: bool = False
+    fetched: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+
+class Warmup:
+    """Prefetches hot data once per process before reporting ready.
+
+    In order: the national alert snapshot (when snapshot mode is on), the
+    configured states' alerts, then the ``/points`` resolution and forecast
+    of each hot coordinate. Requests go through the shared rate limiter, at
+    most ``concurrency`` at a time. Failures are counted and logged but do
+    not stop the warm-up; after ``timeout`` seconds the process is reported
+    ready anyway, marked incomplete, so an NWS outage cannot keep every
+    instance out of rotation.
+    """
+
+    def __init__(
+        self,
+        states: tuple[str, ...] = (),
+        points: tuple[tuple[float, float], ...] = (),
+        timeout: float = 60.0,
+        concurrency: int = 4,
+    ) -> None:
+        self.states = states
+        self.points = points
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self._stats = WarmupStats()
+        self._task: asyncio.Task[WarmupStats] | None = None
+        self._users = 0
+
+    @classmethod
+    def from_env(cls) -> "Warmup":
+        """Build from ``WEATHER_MCP_WARMUP_*`` environment variables."""
+        env = os.environ
+        states = env.get("WEATHER_MCP_WARMUP_STATES", "")
+        return cls(
+            states=tuple(s.strip().upper() for s in states.split(",") if s.strip()),
+            points=tuple(parse_points(env.get("WEATHER_MCP_WARMUP_POINTS", ""))),
+            timeout=float(env.get("WEATHER_MCP_WARMUP_TIMEOUT", "60.0")),
+            concurrency=int(env.get("WEATHER_MCP_WARMUP_CONCURRENCY", "4")),
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self._stats.ready
+
+    def stats(self) -> WarmupStats:
+        return WarmupStats(**vars(self._stats))
+
+    def reset(self) -> None:
+        self._stats = WarmupStats()
+
+    async def _prefetch(self, name: str, fetch: Awaitable[object]) -> None:
+        try:
+            await fetch
+        except NWSError as exc:
+            self._stats.failed += 1
+            logger.warning("Warm-up of %s failed: %s", name, exc)
+        except Exception:
+            # A malformed response must not keep the process out of rotation.
+            self._stats.failed += 1
+            logger.exception("Warm-up of %s failed", name)
+        else:
+            self._stats.fetched += 1
+
+    async def _forecast(self, latitude: float, longitude: float) -> None:
+        grid = await resolve_gridpoint(latitude, longitude, Priority.BACKGROUND)
+        if grid is None:
+            raise NWSError("no gridpoint for this location")
+        await fetch_nws_json(grid.forecast_url, Priority.BACKGROUND)
+
+    async def _prefetch_all(self) -> None:
+        if alert_snapshot.enabled:
+            await self._prefetch(
+                "the national alert snapshot", alert_snapshot.refresh()
+            )
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def limited(name: str, fetch: Awaitable[object]) -> None:
+            async with semaphore:
+                await self._prefetch(name, fetch)
+
+        await asyncio.gather(
+            *(
+                limited(
+                    f"{state} alerts", fetch_state_alerts(state, Priority.BACKGROUND)
+                )
+                for state in self.states
+            )
+        )
+        await asyncio.gather(
+            *(
+                limited(
+                    f"the forecast at {latitude},{longitude}",
+                    self._forecast(latitude, longitude),
+                )
+                for latitude, longitude in self.points
+            )
+        )
+
+    async def run(self) -> WarmupStats:
+        """Prefetch everything configured, then mark the process ready."""
+        self._stats = WarmupStats()
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._prefetch_all(), self.timeout)
+        except TimeoutError:
+            logger.warning("Warm-up timed out after %gs", self.timeout)
+        except Exception:
+            logger.exception("Warm-up failed")
+        else:
+            self._stats.complete = True
+        # Ready however the prefetch ended; only cancellation skips this.
+        self._stats.seconds = time.monotonic() - started
+        self._stats.ready = True
+        logger.info("Warm-up finished: %s", self._stats)
+        return self.stats()
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["Warmup"]:
+        """Run the warm-up in the background while any holder is inside.
+
+        It runs once per process; later holders find the process ready.
+        """
+        self._users += 1
+        if self._task is None and not self.ready:
+            self._task = asyncio.create_task(self.run())
+        try:
+            yield self
+        finally:
+            self._users -= 1
+            if self._users == 0 and self._task is not None:
+                task, self._task = self._task, None
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+
+warmup = Warmup.from_env()